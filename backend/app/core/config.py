@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -6,6 +8,9 @@ class Settings(BaseSettings):
     app_name: str = "Manobela API"
     environment: str = "development"
 
+    # Server (more than one worker = preforked workers sharing preloaded weights)
+    server_workers: int = 1
+
     # CORS
     cors_allow_origins: list[str] = ["*"]
 
@@ -15,8 +20,76 @@ class Settings(BaseSettings):
     metered_credentials_api_key: str = ""
     max_webrtc_connections: int = 25
 
+    # Admission control
+    admission_mode: Literal["connections", "capacity"] = "capacity"
+    admission_cores: float = 0  # 0 = all CPU cores
+    admission_target_utilization: float = 0.8
+    admission_initial_session_cost: float = 0.5  # CPU cores per session until measured
+    admission_max_queue: int = 50
+
     # Video processing
     target_fps: int = 15
+    preprocess_reuse_buffers: bool = True
+    motion_gate_enabled: bool = False
+    motion_gate_threshold: float = 2.0  # mean gray-level difference (0-255)
+    motion_gate_refresh_interval: int = 10  # max frames between model runs
+    frame_budget_enabled: bool = False
+    frame_budget_detect_fraction: float = 0.6  # skip detection past this budget share
+    frame_budget_flag_skips: bool = False  # set detection_skipped in the output
+    frame_rate_governor_enabled: bool = False  # lower session rates under load
+    frame_rate_governor_min_fps: float = 5.0
+    frame_scheduler_enabled: bool = False  # deadline-ordered dispatch of live frames
+    parallel_stages_enabled: bool = False  # landmarking and detection at once
+
+    # Face landmarking
+    face_landmarker_backend: Literal["mediapipe", "onnx"] = "mediapipe"
+    face_landmarker_pool_size: int = 8
+    landmarker_keyframe_interval: int = 1  # 1 = run the landmarker on every frame
+    landmark_flow_max_fb_error_px: float = 1.0
+    face_search_enabled: bool = False  # reduced-rate search while no face is visible
+    face_search_interval: int = 5  # landmarker runs every N frames while searching
+    face_search_max_width: int = 240
+
+    # Inference worker processes (0 = process frames on the in-process thread pool)
+    inference_worker_processes: int = 0
+    inference_worker_slots: int = 4
+
+    # Object detection
+    detector_precision: Literal["fp32", "int8"] = "fp32"
+    detector_input_shapes: list[str] = []  # e.g. ["480x288", "288x480", "480x480"]
+    detector_phone_head: bool = False  # pruned phone-only head with in-graph NMS
+    detector_concurrent: bool = False  # lock-free inference; unused with batching
+    detector_batching_enabled: bool = False
+    detector_max_batch_size: int = 8
+    detector_max_batch_wait_ms: float = 4.0
+    detector_roi_enabled: bool = False
+    detector_roi_input_size: int = 320
+    detector_roi_full_scan_interval: int = 15
+    detector_keyframe_interval: int = 1  # 1 = run the detector on every frame
+    detector_min_tracking_confidence: float = 0.5
+    phone_gate_enabled: bool = False  # needs assets/models/phone_gate.onnx
+    phone_gate_threshold: float = 0.2
+    phone_gate_safety_interval: int = 15  # max frames between full detections
+
+    # CPU budget (overrides the thread settings below when enabled)
+    cpu_budget_enabled: bool = False
+    cpu_budget_cores: int = 0  # 0 = all CPUs available to the process
+    cpu_budget_executor_workers: int = 0  # 0 = one per core, at most 4
+    cpu_budget_ort_global_thread_pool: bool = False
+    cpu_budget_pin_processes: bool = False  # CPU affinity per serving process
+
+    # ONNX Runtime
+    ort_providers: list[str] = ["CPUExecutionProvider"]  # in order of preference
+    ort_benchmark_providers: bool = False  # time providers at startup, use the fastest
+    ort_intra_op_threads: int = 0  # 0 = half the CPU cores
+    ort_inter_op_threads: int = 0  # 0 = ONNX Runtime default
+    ort_allow_spinning: bool = True
+    ort_enable_cpu_mem_arena: bool = True
+    ort_enable_mem_pattern: bool = True
+    ort_execution_mode: Literal["sequential", "parallel"] = "sequential"
+    ort_graph_optimization_level: Literal["disable", "basic", "extended", "all"] = "all"
+    ort_model_cache_dir: str = ""  # e.g. "assets/models/.ort_cache"; empty = disabled
+    ort_share_weights: bool = False  # always on with more than one server worker
 
     model_config = SettingsConfigDict(
         env_file=".env",
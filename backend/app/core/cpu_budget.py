@@ -0,0 +1,203 @@
+"""
+CPU budget planner.
+
+Splits a core budget explicitly between the processes serving frames, the
+frame-processing threads of each process, ONNX Runtime's intra-op and
+inter-op threads and OpenCV's thread pool, so they do not oversubscribe the
+cores under load.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import os
+from dataclasses import dataclass
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frame-processing threads per process when not set explicitly
+MAX_EXECUTOR_WORKERS = 4
+
+# Set once the global ONNX Runtime thread pool has been configured
+_global_thread_pool = False
+
+
+@dataclass(frozen=True)
+class CpuPlan:
+    """
+    Thread and core assignment of every process serving frames.
+
+    Attributes:
+        cpus: CPU ids in the budget.
+        processes: Processes sharing the budget (server workers, times
+                   inference worker processes if enabled).
+        executor_workers: Frames processed at once per process.
+        ort_intra_op_threads: ONNX Runtime intra-op threads per session, or
+                              of the process-wide pool if it is global.
+        ort_inter_op_threads: ONNX Runtime inter-op threads.
+        ort_global_thread_pool: Share one ONNX Runtime thread pool between all
+                                sessions of a process.
+        opencv_threads: OpenCV threads per process.
+        pin_processes: Restrict each process to its share of the CPUs.
+    """
+
+    cpus: tuple[int, ...]
+    processes: int
+    executor_workers: int
+    ort_intra_op_threads: int
+    ort_inter_op_threads: int
+    ort_global_thread_pool: bool
+    opencv_threads: int
+    pin_processes: bool
+
+    @property
+    def cpus_per_process(self) -> int:
+        return max(1, len(self.cpus) // self.processes)
+
+    def process_cpus(self, index: int) -> tuple[int, ...]:
+        """
+        CPUs assigned to the process with the given index.
+        """
+        share = self.cpus_per_process
+        start = (index % self.processes) * share
+        return self.cpus[start : start + share] or self.cpus
+
+    def describe(self) -> str:
+        return (
+            f"{len(self.cpus)} CPUs over {self.processes} process(es), "
+            f"{self.cpus_per_process} each: {self.executor_workers} frame thread(s), "
+            f"ORT intra-op {self.ort_intra_op_threads}"
+            f"{' (global pool)' if self.ort_global_thread_pool else ''}, "
+            f"inter-op {self.ort_inter_op_threads}, OpenCV {self.opencv_threads}"
+            f"{', pinned' if self.pin_processes else ''}"
+        )
+
+
+def _available_cpus() -> tuple[int, ...]:
+    try:
+        return tuple(sorted(os.sched_getaffinity(0)))
+    except AttributeError:
+        return tuple(range(os.cpu_count() or 1))
+
+
+def plan_cpu_budget(
+    cores: int = 0,
+    processes: int = 1,
+    executor_workers: int = 0,
+    ort_global_thread_pool: bool = False,
+    pin_processes: bool = False,
+) -> CpuPlan:
+    """
+    Partition a core budget between processes and their thread pools.
+
+    Frames are already processed in parallel, one per frame thread, so each
+    frame's ONNX Runtime calls get an equal share of the process's cores and
+    OpenCV runs single-threaded. With a global ONNX Runtime pool, the frame
+    threads share one pool the size of the process's cores instead.
+
+    Args:
+        cores: Cores in the budget (0 = all CPUs available to the process).
+        processes: Processes sharing the budget.
+        executor_workers: Frame threads per process (0 = one per core, at
+                          most MAX_EXECUTOR_WORKERS).
+        ort_global_thread_pool: Share one ONNX Runtime pool per process.
+        pin_processes: Restrict each process to its share of the CPUs.
+
+    Raises:
+        ValueError: If parameters are invalid.
+    """
+    if cores < 0 or executor_workers < 0:
+        raise ValueError("cores and executor_workers must not be negative.")
+    if processes < 1:
+        raise ValueError("processes must be at least 1.")
+
+    cpus = _available_cpus()
+    if cores:
+        cpus = cpus[:cores]
+
+    per_process = max(1, len(cpus) // processes)
+    workers = executor_workers or min(per_process, MAX_EXECUTOR_WORKERS)
+    intra_op = per_process if ort_global_thread_pool else max(1, per_process // workers)
+
+    return CpuPlan(
+        cpus=cpus,
+        processes=processes,
+        executor_workers=workers,
+        ort_intra_op_threads=intra_op,
+        ort_inter_op_threads=1,
+        ort_global_thread_pool=ort_global_thread_pool,
+        opencv_threads=1,
+        pin_processes=pin_processes,
+    )
+
+
+@functools.cache
+def get_cpu_plan() -> CpuPlan | None:
+    """
+    Return the CPU plan described by the settings, or None if disabled.
+    """
+    if not settings.cpu_budget_enabled:
+        return None
+
+    # Frames run in the inference worker processes if enabled
+    processes = max(1, settings.server_workers)
+    if settings.inference_worker_processes > 0:
+        processes *= settings.inference_worker_processes
+        executor_workers = 1
+    else:
+        executor_workers = settings.cpu_budget_executor_workers
+
+    return plan_cpu_budget(
+        cores=settings.cpu_budget_cores,
+        processes=processes,
+        executor_workers=executor_workers,
+        ort_global_thread_pool=settings.cpu_budget_ort_global_thread_pool,
+        pin_processes=settings.cpu_budget_pin_processes,
+    )
+
+
+def apply_cpu_plan(plan: CpuPlan, process_index: int | None = None) -> None:
+    """
+    Apply the process-wide parts of a plan: OpenCV threads, the global ONNX
+    Runtime pool and CPU affinity. Call before any inference session is
+    created.
+
+    Args:
+        plan: Plan to apply.
+        process_index: Index of this process among plan.processes, used to
+                       pick its CPUs when processes are pinned.
+    """
+    global _global_thread_pool
+
+    import cv2
+
+    cv2.setNumThreads(plan.opencv_threads)
+
+    if plan.ort_global_thread_pool and not _global_thread_pool:
+        from onnxruntime.capi import _pybind_state
+
+        set_pool_sizes = getattr(_pybind_state, "set_global_thread_pool_sizes", None)
+        if set_pool_sizes is None:
+            logger.warning("This ONNX Runtime build has no global thread pool")
+        else:
+            set_pool_sizes(plan.ort_intra_op_threads, plan.ort_inter_op_threads)
+            _global_thread_pool = True
+
+    if plan.pin_processes and process_index is not None:
+        cpus = plan.process_cpus(process_index)
+        try:
+            os.sched_setaffinity(0, cpus)
+        except (AttributeError, OSError) as e:
+            logger.warning("Cannot set CPU affinity: %s", e)
+        else:
+            logger.info("Process %d pinned to CPUs %s", os.getpid(), list(cpus))
+
+
+def uses_global_thread_pool() -> bool:
+    """
+    Whether ONNX Runtime sessions should use the global thread pool.
+    """
+    return _global_thread_pool
@@ -7,6 +7,7 @@ from fastapi import Depends, Request, WebSocket
 
 from app.services.connection_manager import ConnectionManager
 from app.services.face_landmarker import FaceLandmarker
+from app.services.face_landmarker_pool import FaceLandmarkerPool
 from app.services.object_detector import ObjectDetector
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,14 @@ def get_face_landmarker_ws(websocket: WebSocket) -> FaceLandmarker:
     return websocket.app.state.face_landmarker
 
 
+def get_face_landmarker_pool(request: Request) -> FaceLandmarkerPool:
+    return request.app.state.face_landmarker_pool
+
+
+def get_face_landmarker_pool_ws(websocket: WebSocket) -> FaceLandmarkerPool:
+    return websocket.app.state.face_landmarker_pool
+
+
 def get_object_detector(request: Request) -> ObjectDetector:
     return request.app.state.object_detector
 
@@ -42,5 +51,9 @@ ConnectionManagerWsDep = Annotated[
 ]
 FaceLandmarkerDep = Annotated[FaceLandmarker, Depends(get_face_landmarker)]
 FaceLandmarkerDepWs = Annotated[FaceLandmarker, Depends(get_face_landmarker_ws)]
+FaceLandmarkerPoolDep = Annotated[FaceLandmarkerPool, Depends(get_face_landmarker_pool)]
+FaceLandmarkerPoolDepWs = Annotated[
+    FaceLandmarkerPool, Depends(get_face_landmarker_pool_ws)
+]
 ObjectDetectorDep = Annotated[ObjectDetector, Depends(get_object_detector)]
 ObjectDetectorDepWs = Annotated[ObjectDetector, Depends(get_object_detector_ws)]
@@ -1,18 +1,46 @@
 import logging
+import os
+import time
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.core.config import settings
+from app.core.cpu_budget import apply_cpu_plan, get_cpu_plan
 from app.services.connection_manager import ConnectionManager
-from app.services.face_landmarker import (
-    MediapipeFaceLandmarker,
-    create_face_landmarker,
+from app.services.detector_factory import (
+    build_object_detector,
+    phone_presence_classifier,
 )
-from app.services.object_detector import YoloObjectDetector, create_object_detector
+from app.services.face_landmarker_factory import build_face_landmarkers
+from app.services.face_landmarker_pool import FaceLandmarkerPool
+from app.services.frame_rate_governor import start_frame_rate_governor
+from app.services.inference_workers import (
+    start_inference_worker_pool,
+    stop_inference_worker_pool,
+)
+from app.services.utils.memory_usage import process_memory
 
 logger = logging.getLogger(__name__)
 
 
+class _PhaseTimer:
+    """
+    Logs how long each startup phase takes.
+    """
+
+    def __init__(self):
+        self._start = self._last = time.perf_counter()
+
+    def done(self, phase: str) -> None:
+        now = time.perf_counter()
+        logger.info("Startup phase '%s' took %.0f ms", phase, (now - self._last) * 1000)
+        self._last = now
+
+    def total(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -20,17 +48,71 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting application...")
+    timer = _PhaseTimer()
+
+    # Split the CPU budget before any thread pool or inference session exists
+    cpu_plan = get_cpu_plan()
+    if cpu_plan:
+        logger.info("CPU plan: %s", cpu_plan.describe())
+        # With inference workers, frames are processed (and pinned) there
+        frames_here = settings.inference_worker_processes == 0
+        apply_cpu_plan(
+            cpu_plan,
+            int(os.environ.get("SERVER_WORKER_INDEX", 0)) if frames_here else None,
+        )
 
     # Create connection manager
     app.state.connection_manager = ConnectionManager()
 
     # Create face landmarker
-    app.state.face_landmarker = create_face_landmarker(MediapipeFaceLandmarker)
+    landmarker_factory, app.state.face_landmarker = build_face_landmarkers()
+
+    # Create per-session face landmarker pool, sharing the instance above when exhausted
+    app.state.face_landmarker_pool = FaceLandmarkerPool(
+        landmarker_factory,
+        size=settings.face_landmarker_pool_size,
+        fallback=app.state.face_landmarker,
+    )
+    timer.done("face landmarker")
 
     # Create object detector
-    app.state.object_detector = create_object_detector(YoloObjectDetector)
+    app.state.object_detector = build_object_detector(batching=True)
+    timer.done("object detector")
 
-    logger.info("Application started")
+    # Load the phone gate classifier shared by all sessions, if enabled
+    if settings.phone_gate_enabled:
+        phone_presence_classifier()
+        timer.done("phone gate")
+
+    # Start worker processes for live frame processing, if enabled
+    if settings.inference_worker_processes > 0:
+        start_inference_worker_pool(
+            settings.inference_worker_processes,
+            settings.inference_worker_slots,
+            settings.face_landmarker_pool_size,
+        )
+        timer.done("inference workers")
+
+    # Adapt live processing rates to the host's load, if enabled
+    if settings.frame_rate_governor_enabled:
+        from app.services.video_processor import EXECUTOR_WORKERS, TARGET_FPS
+
+        start_frame_rate_governor(
+            TARGET_FPS,
+            min(settings.frame_rate_governor_min_fps, TARGET_FPS),
+            workers=settings.inference_worker_processes or EXECUTOR_WORKERS,
+        )
+
+    logger.info("Application started in %.0f ms", timer.total())
+
+    memory = process_memory()
+    if memory:
+        logger.info(
+            "Worker %d memory: RSS %.0f MB, PSS %.0f MB",
+            memory["pid"],
+            memory.get("rss_mb", 0.0),
+            memory.get("pss_mb", 0.0),
+        )
 
     try:
         yield
@@ -47,6 +129,21 @@ async def lifespan(app: FastAPI):
             finally:
                 app.state.connection_manager = None
 
+        # Stop inference worker processes
+        try:
+            stop_inference_worker_pool()
+        except Exception as e:
+            logger.error("Error stopping inference workers: %s", e)
+
+        # Close face landmarker pool
+        if getattr(app.state, "face_landmarker_pool", None):
+            try:
+                app.state.face_landmarker_pool.close()
+            except Exception as e:
+                logger.error("Error closing FaceLandmarkerPool: %s", e)
+            finally:
+                app.state.face_landmarker_pool = None
+
         # Close face landmarker
         if getattr(app.state, "face_landmarker", None):
             try:
@@ -23,6 +23,10 @@ class InferenceData(BaseModel):
                         Coordinates are normalized (0-1 range).
         metrics: Optional dictionary of metrics calculated for the frame
                  (e.g., eye closure, head pose, etc.)
+        detection_skipped: True if the object detector was skipped to stay
+                           within the frame's latency budget and the previous
+                           detections were carried forward. Only set when
+                           FRAME_BUDGET_FLAG_SKIPS is enabled.
     """
 
     timestamp: str
@@ -30,3 +34,4 @@ class InferenceData(BaseModel):
     face_landmarks: Optional[list[float]] = None
     object_detections: Optional[list[ObjectDetection]] = None
     metrics: Optional[MetricsOutput] = None
+    detection_skipped: Optional[bool] = None
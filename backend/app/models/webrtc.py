@@ -14,6 +14,7 @@ class MessageType(str, Enum):
     ICE_CANDIDATE = "ice-candidate"
     WELCOME = "welcome"
     ERROR = "error"
+    QUEUE = "queue"
 
 
 class SDPMessage(BaseModel):
@@ -64,4 +65,16 @@ class ErrorMessage(BaseModel):
     message: str
 
 
-SignalingMessage = SDPMessage | ICECandidateMessage | WelcomeMessage | ErrorMessage
+class QueueMessage(BaseModel):
+    """
+    Waiting room update sent while the server is at capacity.
+    """
+
+    type: MessageType
+    position: int  # 1 = next to be admitted
+    eta_sec: int  # upper bound of the expected wait
+
+
+SignalingMessage = (
+    SDPMessage | ICECandidateMessage | WelcomeMessage | ErrorMessage | QueueMessage
+)
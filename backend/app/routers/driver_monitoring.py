@@ -22,13 +22,19 @@ from pydantic import BaseModel, Field
 from app.core.dependencies import (
     ConnectionManagerDep,
     ConnectionManagerWsDep,
-    FaceLandmarkerDep,
-    FaceLandmarkerDepWs,
+    FaceLandmarkerPoolDep,
+    FaceLandmarkerPoolDepWs,
     ObjectDetectorDep,
     ObjectDetectorDepWs,
 )
 from app.models.video_upload import VideoProcessingResponse
 from app.models.webrtc import MessageType
+from app.services.detector_factory import batching_stats
+from app.services.frame_rate_governor import get_frame_rate_governor
+from app.services.inference_workers import get_inference_worker_pool
+from app.services.utils.frame_arena import arena_stats
+from app.services.utils.memory_usage import process_memory
+from app.services.video_processor import scheduler
 from app.services.video_upload_processor import process_uploaded_video
 from app.services.webrtc_handler import (
     handle_answer,
@@ -80,11 +86,105 @@ async def connections(
     }
 
 
+class CapacityResponse(BaseModel):
+    cores: float = Field(..., description="CPU cores available to the server")
+    target_utilization: float = Field(
+        ..., description="Share of the cores filled with sessions"
+    )
+    session_cost_cpu: float = Field(
+        ..., description="Measured CPU-seconds per session-second"
+    )
+    session_cost_measured: int = Field(
+        ..., description="1 once the session cost has been measured, 0 while assumed"
+    )
+    capacity: int = Field(..., description="Sessions the measured cost allows")
+    session_limit: int = Field(
+        ..., description="Admitted sessions, capped by MAX_WEBRTC_CONNECTIONS"
+    )
+    active_sessions: int = Field(..., description="Currently admitted sessions")
+    available_slots: int = Field(..., description="Sessions that can still be admitted")
+    queue_length: int = Field(..., description="Clients in the waiting room")
+
+
+@router.get(
+    "/capacity",
+    summary="Get session capacity",
+    description="Returns the measured session capacity and waiting room length.",
+    response_model=CapacityResponse,
+)
+async def capacity(
+    connection_manager: ConnectionManagerDep,
+):
+    """
+    Returns the admission state, e.g. for autoscaling.
+    """
+
+    return connection_manager.admission_stats()
+
+
+class PipelineStatsResponse(BaseModel):
+    face_landmarker_pool: dict[str, float] = Field(
+        ..., description="Face landmarker pool usage and exhaustion counters"
+    )
+    detector_batching: dict[str, dict[str, float]] | None = Field(
+        None,
+        description="Batched detector statistics per model, if batching is enabled",
+    )
+    inference_workers: dict[str, float] | None = Field(
+        None, description="Worker process statistics, if worker processes are enabled"
+    )
+    sessions: dict[str, dict[str, float]] = Field(
+        ..., description="Per-session pipeline statistics, keyed by client ID"
+    )
+    frame_rate_governor: dict[str, float] | None = Field(
+        None, description="Load-aware frame rate governor state, if enabled"
+    )
+    frame_scheduler: dict[str, float] | None = Field(
+        None, description="Frame scheduler dispatch state, if enabled"
+    )
+    preprocessing_buffers: dict[str, dict[str, float]] = Field(
+        ..., description="Preprocessing buffer allocations per component"
+    )
+    memory: dict[str, float] = Field(
+        ..., description="RSS and PSS of the server worker that answered, in MB"
+    )
+
+
+@router.get(
+    "/pipeline-stats",
+    summary="Get inference pipeline statistics",
+    description="Returns runtime statistics of the shared inference components.",
+    response_model=PipelineStatsResponse,
+)
+async def pipeline_stats(
+    connection_manager: ConnectionManagerDep,
+    face_landmarker_pool: FaceLandmarkerPoolDep,
+    object_detector: ObjectDetectorDep,
+):
+    """
+    Returns statistics used to verify inference throughput.
+    """
+
+    worker_pool = get_inference_worker_pool()
+    governor = get_frame_rate_governor()
+
+    return {
+        "face_landmarker_pool": face_landmarker_pool.stats(),
+        "inference_workers": worker_pool.stats() if worker_pool else None,
+        "sessions": connection_manager.session_stats,
+        "frame_rate_governor": governor.stats() if governor else None,
+        "frame_scheduler": scheduler.stats() if scheduler else None,
+        "detector_batching": batching_stats(object_detector),
+        "preprocessing_buffers": arena_stats(),
+        "memory": process_memory(),
+    }
+
+
 @router.websocket("/ws/driver-monitoring")
 async def driver_monitoring(
     websocket: WebSocket,
     connection_manager: ConnectionManagerWsDep,
-    face_landmarker: FaceLandmarkerDepWs,
+    face_landmarker_pool: FaceLandmarkerPoolDepWs,
     object_detector: ObjectDetectorDepWs,
 ):
     """
@@ -110,9 +210,15 @@ async def driver_monitoring(
             },
         )
 
+        # Replay messages sent while the client was in the waiting room
+        buffered = connection_manager.take_buffered_messages(client_id)
+
         while True:
             # Receive a message from the client
-            raw = await websocket.receive_text()
+            if buffered:
+                raw = buffered.pop(0)
+            else:
+                raw = await websocket.receive_text()
             try:
                 message = json.loads(raw)
             except json.JSONDecodeError:
@@ -128,7 +234,7 @@ async def driver_monitoring(
                     client_id,
                     message,
                     connection_manager,
-                    face_landmarker,
+                    face_landmarker_pool,
                     object_detector,
                 )
 
@@ -172,7 +278,7 @@ async def driver_monitoring(
 )
 async def process_video_upload(
     request: Request,
-    face_landmarker: FaceLandmarkerDep,
+    face_landmarker_pool: FaceLandmarkerPoolDep,
     object_detector: ObjectDetectorDep,
     video: UploadFile = File(...),
     target_fps: int = Query(15, ge=1, le=30),
@@ -215,19 +321,21 @@ async def process_video_upload(
                     )
                 temp_file.write(chunk)
 
+        def _process():
+            # Each upload gets its own landmarker so tracking state is not shared
+            with face_landmarker_pool.lease() as face_landmarker:
+                return process_uploaded_video(
+                    tmp_path,
+                    target_fps=target_fps,
+                    max_duration_sec=MAX_DURATION_SEC,
+                    face_landmarker=face_landmarker,
+                    object_detector=object_detector,
+                )
+
         loop = asyncio.get_running_loop()
         try:
             result = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    lambda: process_uploaded_video(
-                        tmp_path,
-                        target_fps=target_fps,
-                        max_duration_sec=MAX_DURATION_SEC,
-                        face_landmarker=face_landmarker,
-                        object_detector=object_detector,
-                    ),
-                ),
+                loop.run_in_executor(None, _process),
                 timeout=PROCESSING_TIMEOUT_SEC,
             )
         except asyncio.TimeoutError as exc:
@@ -0,0 +1,141 @@
+"""
+Capacity estimate used to admit live sessions.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+
+from app.core.config import settings
+from app.core.cpu_budget import get_cpu_plan
+from app.services.utils.cpu_usage import cpu_seconds
+
+logger = logging.getLogger(__name__)
+
+
+def process_cores() -> float:
+    """
+    Cores available to the sessions of this server process.
+
+    ADMISSION_CORES, or the CPUs of the CPU budget plan or of the host, is
+    split equally between the SERVER_WORKERS processes, since each worker
+    admits its own sessions and measures only its own CPU time.
+    """
+    cores = settings.admission_cores
+    if not cores:
+        plan = get_cpu_plan()
+        cores = len(plan.cpus) if plan else os.cpu_count() or 1
+    return cores / max(1, settings.server_workers)
+
+
+class CapacityEstimator:
+    """
+    Estimates how many live sessions the host can serve.
+
+    The cost of a session is measured in CPU-seconds per session-second: the
+    CPU time used by the server (including inference worker processes) over
+    a sampling window, divided by the session-seconds served in it. The
+    session count is reported on every change (set_sessions), so sessions
+    that join or leave mid-window count for the time they were present.
+    The capacity is the number of sessions whose combined cost fits in the
+    available cores at the target utilization.
+    """
+
+    def __init__(
+        self,
+        cores: float | None = None,
+        target_utilization: float = 0.8,
+        initial_session_cost: float = 0.5,
+        smoothing: float = 0.3,
+        min_sample_sec: float = 2.0,
+    ):
+        """
+        Args:
+            cores: CPU cores available to this process (default: all).
+            target_utilization: Share of the cores to fill with sessions (0-1].
+            initial_session_cost: Session cost assumed before any measurement.
+            smoothing: Weight of each new measurement (0-1].
+            min_sample_sec: Minimum sampling window, and minimum session-seconds
+                            for a window to be measured.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        cores = cores or os.cpu_count() or 1
+        if cores <= 0:
+            raise ValueError("cores must be positive.")
+        if not (0.0 < target_utilization <= 1.0):
+            raise ValueError("target_utilization must be in the range (0, 1].")
+        if initial_session_cost <= 0:
+            raise ValueError("initial_session_cost must be positive.")
+        if not (0.0 < smoothing <= 1.0):
+            raise ValueError("smoothing must be in the range (0, 1].")
+
+        self.cores = cores
+        self.target_utilization = target_utilization
+        self.smoothing = smoothing
+        self.min_sample_sec = min_sample_sec
+
+        self.session_cost = initial_session_cost
+        self.measured = False
+        self._last_wall = time.monotonic()
+        self._last_cpu = cpu_seconds()
+        self._sessions = 0
+        self._session_seconds = 0.0
+        self._sessions_changed_at = self._last_wall
+
+    def set_sessions(self, count: int) -> None:
+        """
+        Record a change in the number of live sessions.
+
+        Args:
+            count: Sessions served from now on.
+        """
+        now = time.monotonic()
+        self._session_seconds += self._sessions * (now - self._sessions_changed_at)
+        self._sessions, self._sessions_changed_at = count, now
+
+    def sample(self) -> None:
+        """
+        Update the session cost from the CPU time used since the last sample.
+        """
+        wall = time.monotonic()
+        if wall - self._last_wall < self.min_sample_sec:
+            return
+
+        self.set_sessions(self._sessions)
+        session_seconds, self._session_seconds = self._session_seconds, 0.0
+        cpu = cpu_seconds()
+        used = cpu - self._last_cpu
+        self._last_wall, self._last_cpu = wall, cpu
+
+        # A worker process exiting makes the total go down; skip that window.
+        # Windows with only a moment of session time would charge the idle
+        # server's CPU to it, so skip those too.
+        if session_seconds < self.min_sample_sec or used < 0:
+            return
+
+        cost = used / session_seconds
+        if self.measured:
+            self.session_cost += self.smoothing * (cost - self.session_cost)
+        else:
+            self.session_cost, self.measured = cost, True
+
+    def capacity(self) -> int:
+        """
+        Number of sessions the host can serve at the target utilization.
+        """
+        budget = self.cores * self.target_utilization
+        return max(1, math.floor(budget / max(self.session_cost, 1e-3)))
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "cores": self.cores,
+            "target_utilization": self.target_utilization,
+            "session_cost_cpu": round(self.session_cost, 3),
+            "session_cost_measured": int(self.measured),
+            "capacity": self.capacity(),
+        }
@@ -8,10 +8,15 @@ from aiortc import RTCDataChannel, RTCPeerConnection
 from fastapi import WebSocket
 
 from app.core.config import settings
+from app.models.webrtc import MessageType
+from app.services.admission import CapacityEstimator, process_cores
 
 logger = logging.getLogger(__name__)
 
 SESSION_TTL_SEC = 5 * 60
+WAITING_ROOM_UPDATE_SEC = 5.0
+# Signaling messages kept per waiting client, replayed once it is admitted
+MAX_BUFFERED_MESSAGES = 200
 
 
 class ConnectionManager:
@@ -29,23 +34,198 @@ class ConnectionManager:
         self.session_started_at: dict[str, float] = {}
         self.session_expiry_tasks: dict[str, asyncio.Task] = {}
         self.head_pose_recalibrate_requests: set[str] = set()
+        self.session_stats: dict[str, dict[str, float]] = {}
+        self.capacity = CapacityEstimator(
+            cores=process_cores(),
+            target_utilization=settings.admission_target_utilization,
+            initial_session_cost=settings.admission_initial_session_cost,
+        )
+        # Clients waiting for a free slot, in arrival order
+        self.waiting_room: dict[str, tuple[WebSocket, asyncio.Future]] = {}
+        self.buffered_messages: dict[str, list[str]] = {}
+        self._waiting_room_task: Optional[asyncio.Task] = None
         logger.info("Connection Manager initialized")
 
+    def session_limit(self) -> int:
+        """
+        Maximum number of concurrent sessions, from the measured capacity in
+        "capacity" admission mode, capped by MAX_WEBRTC_CONNECTIONS.
+        """
+        limit = settings.max_webrtc_connections
+        if settings.admission_mode == "capacity":
+            self.capacity.sample()
+            limit = min(limit, self.capacity.capacity())
+        return limit
+
     async def connect(self, websocket: WebSocket, client_id: str) -> bool:
         """
         Accept a WebSocket connection and register it if capacity allows.
+        Otherwise the client waits in the waiting room until a slot frees up,
+        or is rejected if the waiting room is full.
+
+        Returns:
+            True once the client is registered, False if it was rejected or
+            disconnected while waiting.
         """
-        if len(self.active_connections) >= settings.max_webrtc_connections:
-            await websocket.accept()
+        await websocket.accept()
+
+        # Clients already waiting go first
+        has_slot = len(self.active_connections) < self.session_limit()
+        if has_slot and not self.waiting_room:
+            self._register(client_id, websocket)
+            return True
+
+        if len(self.waiting_room) >= settings.admission_max_queue:
             await websocket.close(code=1013, reason="Server at capacity")
             logger.warning(
-                "Rejected %s: max WebRTC connections reached (%d)",
+                "Rejected %s: server at capacity (%d sessions) and waiting room full",
                 client_id,
-                settings.max_webrtc_connections,
+                len(self.active_connections),
             )
             return False
 
-        await websocket.accept()
+        return await self._wait_for_admission(client_id, websocket)
+
+    async def _wait_for_admission(self, client_id: str, websocket: WebSocket) -> bool:
+        """
+        Park a client in the waiting room until it is admitted or disconnects.
+        """
+        admitted: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.waiting_room[client_id] = (websocket, admitted)
+        logger.info(
+            "Client %s waiting for a free slot (position %d)",
+            client_id,
+            len(self.waiting_room),
+        )
+        if self._waiting_room_task is None or self._waiting_room_task.done():
+            self._waiting_room_task = asyncio.create_task(self._run_waiting_room())
+        await self._send_queue_position(client_id)
+
+        accepted = False
+        try:
+            while not admitted.done():
+                receive = asyncio.ensure_future(websocket.receive())
+                try:
+                    await asyncio.wait(
+                        {admitted, receive}, return_when=asyncio.FIRST_COMPLETED
+                    )
+                finally:
+                    receive.cancel()
+                if not receive.done() or receive.cancelled():
+                    continue
+                message = receive.result()
+                if message["type"] == "websocket.disconnect":
+                    logger.info("Client %s left the waiting room", client_id)
+                    if admitted.done() and admitted.result():
+                        self.disconnect(client_id)
+                    return False
+                # Clients may send their offer before they are admitted
+                self._buffer_message(client_id, message.get("text"))
+            accepted = admitted.result()
+            return accepted
+        finally:
+            entry = self.waiting_room.get(client_id)
+            if entry and entry[1] is admitted:
+                del self.waiting_room[client_id]
+            if not accepted:
+                self.buffered_messages.pop(client_id, None)
+
+    def _buffer_message(self, client_id: str, text: Optional[str]) -> None:
+        """
+        Keep a signaling message received from a waiting client.
+        """
+        if text is None:
+            return
+        buffered = self.buffered_messages.setdefault(client_id, [])
+        if len(buffered) >= MAX_BUFFERED_MESSAGES:
+            logger.warning("Dropped message from waiting client %s", client_id)
+            return
+        buffered.append(text)
+
+    def take_buffered_messages(self, client_id: str) -> list[str]:
+        """
+        Return and clear the signaling messages a client sent while waiting.
+        """
+        return self.buffered_messages.pop(client_id, [])
+
+    def _admit_waiting(self) -> None:
+        """
+        Admit waiting clients, in arrival order, while capacity allows.
+        """
+        limit = self.session_limit()
+        while self.waiting_room and len(self.active_connections) < limit:
+            client_id = next(iter(self.waiting_room))
+            websocket, admitted = self.waiting_room.pop(client_id)
+            if admitted.done():
+                continue
+            self._register(client_id, websocket)
+            admitted.set_result(True)
+
+    async def _run_waiting_room(self) -> None:
+        """
+        Background task admitting waiting clients as capacity frees up, and
+        keeping them informed of their position.
+        """
+        try:
+            while self.waiting_room:
+                await asyncio.sleep(WAITING_ROOM_UPDATE_SEC)
+                self._admit_waiting()
+                for client_id in list(self.waiting_room):
+                    await self._send_queue_position(client_id)
+        except asyncio.CancelledError:
+            return
+
+    def queue_eta_sec(self, position: int) -> float:
+        """
+        Upper bound of the wait for a waiting room position, assuming slots
+        free up no later than when sessions expire.
+        """
+        now = time.monotonic()
+        remaining = sorted(
+            max(0.0, SESSION_TTL_SEC - (now - started_at))
+            for started_at in self.session_started_at.values()
+        )
+        if not remaining:
+            return 0.0
+        rounds, index = divmod(position - 1, len(remaining))
+        return rounds * SESSION_TTL_SEC + remaining[index]
+
+    async def _send_queue_position(self, client_id: str) -> None:
+        """
+        Tell a waiting client its position in the waiting room and the expected wait.
+        """
+        entry = self.waiting_room.get(client_id)
+        if entry is None:
+            return
+        position = list(self.waiting_room).index(client_id) + 1
+        try:
+            await entry[0].send_json(
+                {
+                    "type": MessageType.QUEUE.value,
+                    "position": position,
+                    "eta_sec": round(self.queue_eta_sec(position)),
+                }
+            )
+        except Exception as e:
+            logger.info("Failed to send queue position to %s: %s", client_id, e)
+
+    def admission_stats(self) -> dict[str, float]:
+        """
+        Return the capacity estimate and waiting room length.
+        """
+        limit = self.session_limit()
+        return {
+            **self.capacity.stats(),
+            "session_limit": limit,
+            "active_sessions": len(self.active_connections),
+            "available_slots": max(0, limit - len(self.active_connections)),
+            "queue_length": len(self.waiting_room),
+        }
+
+    def _register(self, client_id: str, websocket: WebSocket) -> None:
+        """
+        Register an accepted client and start its session timer.
+        """
         self.active_connections[client_id] = websocket
         self.processing_paused[client_id] = False
         self.processing_reset[client_id] = False
@@ -54,10 +234,10 @@ class ConnectionManager:
         self.session_expiry_tasks[client_id] = asyncio.create_task(
             self._expire_session(client_id, started_at)
         )
+        self.capacity.set_sessions(len(self.active_connections))
         logger.info(
             "Client %s connected. Total: %d", client_id, len(self.active_connections)
         )
-        return True
 
     async def _expire_session(self, client_id: str, started_at: float) -> None:
         """
@@ -94,6 +274,7 @@ class ConnectionManager:
         Remove all resources associated with a client and cancel background tasks.
         """
         self.active_connections.pop(client_id, None)
+        self.capacity.set_sessions(len(self.active_connections))
         pc = self.peer_connections.pop(client_id, None)
         self.data_channels.pop(client_id, None)
         self.processing_paused.pop(client_id, None)
@@ -101,6 +282,8 @@ class ConnectionManager:
         self.session_started_at.pop(client_id, None)
         self._cancel_expiry_task(client_id)
         self.head_pose_recalibrate_requests.discard(client_id)
+        self.session_stats.pop(client_id, None)
+        self.buffered_messages.pop(client_id, None)
 
         task = self.frame_tasks.pop(client_id, None)
         if task and not task.done():
@@ -116,6 +299,10 @@ class ConnectionManager:
             client_id,
             len(self.active_connections),
         )
+
+        # A slot may have freed up for a waiting client
+        if self.waiting_room:
+            self._admit_waiting()
         return pc
 
     async def send_message(self, client_id: str, message: dict) -> None:
@@ -171,6 +358,19 @@ class ConnectionManager:
                 await pc.close()
                 logger.info("Closed RTCPeerConnection for %s", client_id)
 
+        # Release waiting clients
+        if self._waiting_room_task and not self._waiting_room_task.done():
+            self._waiting_room_task.cancel()
+        for client_id, (ws, admitted) in list(self.waiting_room.items()):
+            if not admitted.done():
+                admitted.set_result(False)
+            try:
+                await ws.close()
+            except Exception as e:
+                logger.warning("Failed to close WebSocket for %s: %s", client_id, e)
+        self.waiting_room.clear()
+        self.buffered_messages.clear()
+
         # Close all WebSockets
         for client_id, ws in list(self.active_connections.items()):
             try:
@@ -192,6 +392,7 @@ class ConnectionManager:
                 task.cancel()
         self.session_expiry_tasks.clear()
         self.head_pose_recalibrate_requests.clear()
+        self.session_stats.clear()
 
         logger.info("Connection Manager shutdown complete")
 
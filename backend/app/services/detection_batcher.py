@@ -0,0 +1,236 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.services.object_detector import (
+    Detections,
+    ObjectDetector,
+    YoloObjectDetector,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _BatchItem:
+    """
+    A single preprocessed frame waiting to be batched.
+    """
+
+    tensor: np.ndarray
+    future: Future = field(default_factory=Future)
+
+
+class BatchingObjectDetector(ObjectDetector):
+    """
+    Micro-batching scheduler in front of a YOLO detector.
+
+    Frames submitted concurrently by different sessions are collected for up to
+    ``max_wait_ms`` (or until ``max_batch_size`` frames are pending) and run as
+    one batched ``session.run``. Pre- and postprocessing stay on the calling
+    threads; only inference goes through the batching thread.
+    """
+
+    def __init__(
+        self,
+        detector: YoloObjectDetector,
+        max_batch_size: int = 8,
+        max_wait_ms: float = 4.0,
+    ):
+        """
+        Args:
+            detector: Underlying YOLO detector.
+            max_batch_size: Maximum number of frames per inference run.
+            max_wait_ms: Maximum time to wait for a batch to fill up.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be non-negative.")
+
+        self._detector = detector
+        self._max_wait_sec = max_wait_ms / 1000.0
+        self._max_batch_size = max_batch_size
+
+        if max_batch_size > 1 and not detector.supports_dynamic_batch:
+            logger.warning(
+                "Detector model has a fixed batch size; "
+                "export it with --dynamic to enable batched inference"
+            )
+            self._max_batch_size = 1
+
+        self._queue: queue.Queue[_BatchItem | None] = queue.Queue()
+        self._closed = False
+
+        self._stats_lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._batches = 0
+        self._frames = 0
+        self._largest_batch = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="detection-batcher", daemon=True
+        )
+        self._thread.start()
+
+        logger.info(
+            "Batching object detector started (max_batch_size=%d, max_wait_ms=%.1f)",
+            self._max_batch_size,
+            max_wait_ms,
+        )
+
+    def detect(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: int | None = None,
+    ) -> Detections:
+        """
+        Detect objects in an image, sharing the inference run with other callers.
+        """
+        if self._closed:
+            raise RuntimeError("Object detector has been closed")
+
+        tensor, orig_shape, ratio, pad = self._detector.prepare(img, input_size)
+
+        item = _BatchItem(tensor)
+        self._queue.put(item)
+        output = item.future.result()
+        if output is None:
+            return Detections.empty()
+
+        return self._detector.finalize(
+            output,
+            orig_shape,
+            ratio,
+            pad,
+            conf_threshold,
+            iou_threshold,
+            normalize,
+        )
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return batching statistics since startup.
+        """
+        with self._stats_lock:
+            elapsed = time.perf_counter() - self._started_at
+            return {
+                "batches": self._batches,
+                "frames": self._frames,
+                "largest_batch": self._largest_batch,
+                "mean_batch_size": self._frames / self._batches
+                if self._batches
+                else 0.0,
+                "frames_per_sec": self._frames / elapsed if elapsed > 0 else 0.0,
+                "pending": self._queue.qsize(),
+            }
+
+    def close(self) -> None:
+        """
+        Stop the batching thread and release the underlying detector.
+        Safe to call multiple times.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._detector.close()
+
+    def _collect(self, first: _BatchItem) -> tuple[list[_BatchItem], bool]:
+        """
+        Gather items until the batch is full or the wait time elapses.
+
+        Returns:
+            The collected batch and whether a shutdown sentinel was seen.
+        """
+        batch = [first]
+        deadline = time.perf_counter() + self._max_wait_sec
+
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    def _run_group(self, group: list[_BatchItem]) -> None:
+        """
+        Run one inference call for frames of the same input shape.
+        """
+        try:
+            if len(group) == 1:
+                outputs = [self._detector.infer(group[0].tensor)]
+            else:
+                output = self._detector.infer(
+                    np.concatenate([item.tensor for item in group], axis=0)
+                )
+                outputs = (
+                    self._detector.split_output(output, len(group))
+                    if output is not None
+                    else [None] * len(group)
+                )
+        except Exception as e:
+            logger.error("Batched inference failed: %s", e)
+            for item in group:
+                item.future.set_exception(RuntimeError(f"Inference failed: {e}"))
+            return
+
+        for item, output in zip(group, outputs):
+            item.future.set_result(output)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._frames += len(group)
+            self._largest_batch = max(self._largest_batch, len(group))
+
+    def _run(self) -> None:
+        """
+        Batching loop: collect frames, run them together, fan results out.
+        """
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                break
+
+            batch, stopping = self._collect(first)
+
+            # Frames letterboxed to different input sizes cannot share a run
+            groups: dict[tuple[int, ...], list[_BatchItem]] = {}
+            for item in batch:
+                groups.setdefault(item.tensor.shape, []).append(item)
+
+            for group in groups.values():
+                self._run_group(group)
+
+        # Fail anything still queued after shutdown
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item.future.set_exception(
+                    RuntimeError("Object detector has been closed")
+                )
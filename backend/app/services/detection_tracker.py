@@ -0,0 +1,156 @@
+"""
+Lightweight box tracking between object detector keyframes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from app.services.object_detector import ObjectDetection
+
+# Minimum IoU for a new detection to continue an existing track
+MATCH_IOU_THRESHOLD = 0.3
+
+
+@dataclass
+class _Track:
+    bbox: list[float]
+    conf: float
+    class_id: int
+    velocity: tuple[float, float] = (0.0, 0.0)
+    confidence: float = 1.0  # Tracking confidence, decays between keyframes
+
+
+def _iou(a: Sequence[float], b: Sequence[float]) -> float:
+    ix0, iy0 = max(a[0], b[0]), max(a[1], b[1])
+    ix1, iy1 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix1 - ix0) * max(0.0, iy1 - iy0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def _center(bbox: Sequence[float]) -> tuple[float, float]:
+    return (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+
+
+class DetectionTracker:
+    """
+    Runs the detector on keyframes and extrapolates boxes in between.
+
+    Boxes are normalized (0-1). Each track keeps the velocity measured between
+    its last two keyframes and is moved by it on every tracked frame. Tracking
+    confidence decays per tracked frame; a keyframe is forced as soon as any
+    track falls below ``min_tracking_confidence``.
+    """
+
+    def __init__(
+        self,
+        keyframe_interval: int = 5,
+        confidence_decay: float = 0.9,
+        min_tracking_confidence: float = 0.5,
+    ):
+        """
+        Args:
+            keyframe_interval: Run the detector every N frames.
+            confidence_decay: Factor applied to tracking confidence per tracked frame (0-1].
+            min_tracking_confidence: Tracking confidence that forces a keyframe (0-1).
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        if not (0.0 < confidence_decay <= 1.0):
+            raise ValueError("confidence_decay must be in the range (0, 1].")
+        if not (0.0 <= min_tracking_confidence < 1.0):
+            raise ValueError("min_tracking_confidence must be in the range [0, 1).")
+
+        self.keyframe_interval = keyframe_interval
+        self.confidence_decay = confidence_decay
+        self.min_tracking_confidence = min_tracking_confidence
+
+        self._tracks: list[_Track] = []
+        self._frames_since_keyframe = 0
+        self._has_keyframe = False
+
+        self.detected_frames = 0
+        self.tracked_frames = 0
+
+    def should_detect(self) -> bool:
+        """
+        Whether the detector must run on the next frame.
+        """
+        if not self._has_keyframe:
+            return True
+        if self._frames_since_keyframe + 1 >= self.keyframe_interval:
+            return True
+        return any(t.confidence < self.min_tracking_confidence for t in self._tracks)
+
+    def update(self, detections: Sequence[ObjectDetection]) -> None:
+        """
+        Start new tracks from keyframe detections, carrying velocity over matches.
+        """
+        elapsed = self._frames_since_keyframe + 1
+        previous = self._tracks
+        tracks: list[_Track] = []
+
+        for det in detections:
+            track = _Track(bbox=list(det.bbox), conf=det.conf, class_id=det.class_id)
+
+            best, best_iou = None, MATCH_IOU_THRESHOLD
+            for prev in previous:
+                if prev.class_id != det.class_id:
+                    continue
+                iou = _iou(prev.bbox, det.bbox)
+                if iou >= best_iou:
+                    best, best_iou = prev, iou
+
+            if best is not None:
+                (px, py), (nx, ny) = _center(best.bbox), _center(det.bbox)
+                track.velocity = ((nx - px) / elapsed, (ny - py) / elapsed)
+
+            tracks.append(track)
+
+        self._tracks = tracks
+        self._frames_since_keyframe = 0
+        self._has_keyframe = True
+        self.detected_frames += 1
+
+    def propagate(self) -> list[ObjectDetection]:
+        """
+        Extrapolate tracked boxes onto the current frame.
+        """
+        self._frames_since_keyframe += 1
+        self.tracked_frames += 1
+
+        detections = []
+        for track in self._tracks:
+            vx, vy = track.velocity
+            x0, y0, x1, y1 = track.bbox
+            track.bbox = [x0 + vx, y0 + vy, x1 + vx, y1 + vy]
+            track.confidence *= self.confidence_decay
+
+            cx, cy = _center(track.bbox)
+            if not (0.0 <= cx <= 1.0 and 0.0 <= cy <= 1.0):
+                # Left the frame; let the next keyframe confirm it
+                track.confidence = 0.0
+
+            detections.append(
+                ObjectDetection(
+                    bbox=list(track.bbox),
+                    conf=track.conf,
+                    class_id=track.class_id,
+                    tracked=True,
+                )
+            )
+
+        return detections
+
+    def stats(self) -> dict[str, float]:
+        total = self.detected_frames + self.tracked_frames
+        return {
+            "detected_frames": self.detected_frames,
+            "tracked_frames": self.tracked_frames,
+            "tracked_ratio": self.tracked_frames / total if total else 0.0,
+        }
@@ -0,0 +1,273 @@
+import functools
+import logging
+from pathlib import Path
+
+import onnxruntime as ort
+
+from app.core.config import settings
+from app.core.cpu_budget import get_cpu_plan, uses_global_thread_pool
+from app.services.detection_batcher import BatchingObjectDetector
+from app.services.object_detector import (
+    ObjectDetector,
+    ShapeMatchedObjectDetector,
+    YoloObjectDetector,
+    create_object_detector,
+    parse_input_shape,
+    resolve_model_path,
+)
+from app.services.phone_gate import PhoneGate, PhonePresenceClassifier
+from app.services.utils.ort_session import (
+    benchmark_providers,
+    build_session_options,
+    cached_model_path,
+    resolve_providers,
+    weights_shareable,
+)
+from app.services.utils.shared_weights import preload
+
+logger = logging.getLogger(__name__)
+
+
+def _model_path(input_shape: tuple[int, int] | None) -> Path:
+    return resolve_model_path(
+        settings.detector_precision, input_shape, settings.detector_phone_head
+    )
+
+
+def session_options() -> ort.SessionOptions:
+    """
+    Build ONNX Runtime session options from the settings profile, with the
+    thread counts of the CPU plan if one is enabled.
+    """
+    plan = get_cpu_plan()
+    return build_session_options(
+        intra_op_threads=(
+            plan.ort_intra_op_threads if plan else settings.ort_intra_op_threads
+        ),
+        inter_op_threads=(
+            plan.ort_inter_op_threads if plan else settings.ort_inter_op_threads
+        ),
+        allow_spinning=settings.ort_allow_spinning,
+        enable_cpu_mem_arena=settings.ort_enable_cpu_mem_arena,
+        enable_mem_pattern=settings.ort_enable_mem_pattern,
+        execution_mode=settings.ort_execution_mode,
+        optimization_level=settings.ort_graph_optimization_level,
+        use_global_thread_pool=uses_global_thread_pool(),
+    )
+
+
+def share_weights() -> bool:
+    """
+    Whether sessions use process-wide shared copies of the model weights.
+    """
+    return settings.ort_share_weights or settings.server_workers > 1
+
+
+@functools.cache
+def execution_providers() -> tuple[str, ...]:
+    """
+    Return the configured execution providers that are installed.
+
+    With ORT_BENCHMARK_PROVIDERS enabled, each provider is timed once per
+    process on a synthetic frame and the fastest is moved to the front.
+    """
+    providers = resolve_providers(settings.ort_providers)
+
+    if settings.ort_benchmark_providers and len(providers) > 1:
+        shapes = settings.detector_input_shapes
+        model_path = _model_path(parse_input_shape(shapes[0]) if shapes else None)
+        timings = benchmark_providers(model_path, providers, session_options())
+
+        for provider, latency_ms in sorted(timings.items(), key=lambda t: t[1]):
+            logger.info("Provider %s: %.2f ms per frame", provider, latency_ms)
+
+        if timings:
+            fastest = min(timings, key=timings.__getitem__)
+            providers = [fastest] + [p for p in providers if p != fastest]
+
+    logger.info("ONNX Runtime providers: %s", ", ".join(providers))
+    return tuple(providers)
+
+
+def _create_yolo_detector(
+    input_shape: tuple[int, int] | None, batching: bool
+) -> ObjectDetector:
+    detector = create_object_detector(
+        YoloObjectDetector,
+        model_path=_model_path(input_shape),
+        reuse_buffers=settings.preprocess_reuse_buffers,
+        session_options=session_options(),
+        providers=list(execution_providers()),
+        # Batched outputs are handed to other threads, so they cannot live in
+        # per-thread buffers
+        concurrent=settings.detector_concurrent and not batching,
+        model_cache_dir=_model_cache_dir(),
+        share_weights=share_weights(),
+    )
+    if batching and isinstance(detector, YoloObjectDetector):
+        detector = BatchingObjectDetector(
+            detector,
+            max_batch_size=settings.detector_max_batch_size,
+            max_wait_ms=settings.detector_max_batch_wait_ms,
+        )
+    return detector
+
+
+def _detector_model_paths() -> list[Path]:
+    shapes = settings.detector_input_shapes
+    if not shapes:
+        return [_model_path(None)]
+    return [_model_path(parse_input_shape(value)) for value in shapes]
+
+
+def _model_cache_dir() -> Path | None:
+    return Path(settings.ort_model_cache_dir) if settings.ort_model_cache_dir else None
+
+
+def preload_model_weights() -> None:
+    """
+    Load the shared weights of the configured detector models, and of the
+    ONNX face landmarker models if that backend is used, e.g. before forking
+    server workers. Only weights the sessions will actually share are loaded:
+    cached optimized detector models, and source models if the optimization
+    level is at most "extended" (see weights_shareable).
+
+    The MediaPipe face landmarker loads its model inside its own graph and
+    cannot be given preloaded weights, so each worker keeps its own copy.
+    """
+    level = session_options().graph_optimization_level
+    shareable = weights_shareable(level)
+
+    cache_dir = _model_cache_dir()
+    model_paths = []
+    for path in _detector_model_paths():
+        if not path.is_file():
+            continue
+        if cache_dir is not None:
+            # A cache miss writes the optimized model without shared weights
+            provider = resolve_providers(settings.ort_providers)[0]
+            cached = cached_model_path(path, provider, level, cache_dir)
+            if cached.is_file():
+                model_paths.append(cached)
+        elif shareable:
+            model_paths.append(path)
+
+    if settings.face_landmarker_backend == "onnx" and shareable:
+        from app.services.onnx_face_landmarker import (
+            FACE_DETECTOR_PATH,
+            FACE_MESH_PATH,
+        )
+
+        model_paths += [FACE_DETECTOR_PATH, FACE_MESH_PATH]
+
+    if cache_dir is None and not shareable:
+        logger.warning(
+            "Not preloading model weights: optimization level %s copies them;"
+            " use ORT_GRAPH_OPTIMIZATION_LEVEL=extended or ORT_MODEL_CACHE_DIR",
+            level,
+        )
+
+    if model_paths:
+        preload(model_paths)
+
+
+def build_object_detector(batching: bool = False) -> ObjectDetector:
+    """
+    Build the object detector described by the settings.
+
+    Args:
+        batching: Put a micro-batching scheduler in front of each model,
+                  if enabled in the settings.
+    """
+    batching = batching and settings.detector_batching_enabled
+
+    if not settings.detector_input_shapes:
+        return _create_yolo_detector(None, batching)
+
+    variants = []
+    for value in settings.detector_input_shapes:
+        shape = parse_input_shape(value)
+        variants.append((shape, _create_yolo_detector(shape, batching)))
+
+    logger.info(
+        "Shape-matched detector initialized with input shapes: %s",
+        ", ".join(f"{w}x{h}" for (w, h), _ in variants),
+    )
+    return ShapeMatchedObjectDetector(variants)
+
+
+@functools.cache
+def phone_presence_classifier() -> PhonePresenceClassifier | None:
+    """
+    Return the shared phone-presence classifier, or None if the gate is
+    disabled or its model cannot be loaded.
+    """
+    if not settings.phone_gate_enabled:
+        return None
+    try:
+        return PhonePresenceClassifier(
+            session_options=session_options(),
+            providers=list(execution_providers()),
+        )
+    except RuntimeError:
+        logger.exception("Phone gate disabled")
+        return None
+
+
+@functools.cache
+def roi_crops_supported() -> bool:
+    """
+    Whether any configured detector model accepts the smaller input size of
+    ROI crops. Models with a fixed input size letterbox a crop back up to
+    that size, so scanning it costs as much as scanning the whole frame.
+    """
+    try:
+        import onnx
+    except ImportError:
+        return True
+
+    for path in _detector_model_paths():
+        if not path.is_file():
+            continue
+        model = onnx.load(str(path), load_external_data=False)
+        height, width = model.graph.input[0].type.tensor_type.shape.dim[2:4]
+        if not height.HasField("dim_value") or not width.HasField("dim_value"):
+            return True
+
+    logger.warning(
+        "ROI phone detection disabled: the detector models have fixed input"
+        " sizes; export one with --dynamic to scan smaller crops"
+    )
+    return False
+
+
+def create_phone_gate() -> PhoneGate | None:
+    """
+    Create a per-session phone gate, or None if the gate is not in use.
+    """
+    classifier = phone_presence_classifier()
+    if classifier is None:
+        return None
+    return PhoneGate(
+        classifier,
+        threshold=settings.phone_gate_threshold,
+        safety_interval=settings.phone_gate_safety_interval,
+    )
+
+
+def batching_stats(detector: ObjectDetector) -> dict[str, dict[str, float]] | None:
+    """
+    Return batching statistics per model, or None if batching is not in use.
+    """
+    if isinstance(detector, BatchingObjectDetector):
+        return {"default": detector.stats()}
+
+    if isinstance(detector, ShapeMatchedObjectDetector):
+        stats = {
+            f"{w}x{h}": variant.stats()
+            for (w, h), variant in detector.variants
+            if isinstance(variant, BatchingObjectDetector)
+        }
+        return stats or None
+
+    return None
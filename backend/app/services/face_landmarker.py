@@ -12,6 +12,8 @@ import numpy as np
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
+from app.services.utils.frame_arena import BufferArena
+
 logger = logging.getLogger(__name__)
 
 # Path to the model file
@@ -32,6 +34,7 @@ class FaceLandmarker(Protocol):
     def detect(
         self,
         img: np.ndarray,
+        timestamp_ms: int | None = None,
     ) -> Sequence[FaceLandmark2D]: ...
 
     def close(self) -> None: ...
@@ -65,6 +68,10 @@ class MediapipeFaceLandmarker(FaceLandmarker):
             RuntimeError: If model loading fails.
         """
         self._lock = threading.Lock()
+        self._last_timestamp_ms = -1
+        self._clock_base_ms = 0
+        self._clock_origin_ms: int | None = None
+        self._buffers = BufferArena("face_landmarker")
 
         try:
             base_options = python.BaseOptions(model_asset_path=str(model_path))
@@ -88,28 +95,32 @@ class MediapipeFaceLandmarker(FaceLandmarker):
     def detect(
         self,
         img: np.ndarray,
+        timestamp_ms: int | None = None,
     ) -> Sequence[FaceLandmark2D]:
         """
         Detect face landmarks in an image.
 
         Args:
             img: BGR image to detect landmarks in.
+            timestamp_ms: Media timestamp of the frame. Falls back to wall-clock
+                time when not provided.
 
         Returns:
             List of detected face landmarks.
         """
-        rgb_frame = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(
-            image_format=mp.ImageFormat.SRGB,
-            data=rgb_frame,
-        )
-
-        timestamp_ms = int(time.time() * 1000)
-
         with self._lock:
+            # mp.Image copies the pixels, so the RGB buffer can be reused
+            self._buffers.count_frame()
+            rgb_frame, _ = self._buffers.buffer("rgb", img.shape)
+            cv2.cvtColor(img, cv2.COLOR_BGR2RGB, dst=rgb_frame)
+            mp_image = mp.Image(
+                image_format=mp.ImageFormat.SRGB,
+                data=rgb_frame,
+            )
+
             raw_result = self._landmarker.detect_for_video(
                 mp_image,
-                timestamp_ms,
+                self._next_timestamp(timestamp_ms),
             )
 
         if not raw_result.face_landmarks:
@@ -121,6 +132,33 @@ class MediapipeFaceLandmarker(FaceLandmarker):
 
         return face_landmarks
 
+    def reset_clock(self) -> None:
+        """
+        Start a new media clock, e.g. when the instance is handed to a new stream.
+
+        MediaPipe requires strictly increasing timestamps per instance, so the
+        next stream's timestamps are rebased after the last one seen.
+        """
+        with self._lock:
+            self._clock_base_ms = self._last_timestamp_ms + 1
+            self._clock_origin_ms = None
+
+    def _next_timestamp(self, timestamp_ms: int | None) -> int:
+        """
+        Map a media timestamp onto this instance's monotonic clock.
+        Must be called with the lock held.
+        """
+        if timestamp_ms is None:
+            ts = int(time.time() * 1000)
+        else:
+            if self._clock_origin_ms is None:
+                self._clock_origin_ms = timestamp_ms
+            ts = self._clock_base_ms + (timestamp_ms - self._clock_origin_ms)
+
+        ts = max(ts, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = ts
+        return ts
+
     def close(self) -> None:
         """
         Release underlying resources.
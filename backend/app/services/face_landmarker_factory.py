@@ -0,0 +1,48 @@
+import logging
+from typing import Callable
+
+from app.core.config import settings
+from app.services.detector_factory import (
+    execution_providers,
+    session_options,
+    share_weights,
+)
+from app.services.face_landmarker import (
+    FaceLandmarker,
+    MediapipeFaceLandmarker,
+    create_face_landmarker,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_face_landmarkers() -> tuple[Callable[[], FaceLandmarker], FaceLandmarker]:
+    """
+    Build the face landmarker backend described by the settings.
+
+    Returns:
+        A factory creating one landmarker per stream, and a shared instance
+        used when the pool is exhausted. Closing the shared instance releases
+        the backend's models.
+    """
+    if settings.face_landmarker_backend == "onnx":
+        from app.services.onnx_face_landmarker import (
+            OnnxFaceLandmarker,
+            OnnxFaceMeshModels,
+        )
+
+        # The ORT sessions are shared; each stream only keeps tracking state
+        models = OnnxFaceMeshModels(
+            session_options=session_options(),
+            providers=list(execution_providers()),
+            share_weights=share_weights(),
+        )
+        return (
+            lambda: OnnxFaceLandmarker(models),
+            OnnxFaceLandmarker(models, owns_models=True),
+        )
+
+    return (
+        lambda: create_face_landmarker(MediapipeFaceLandmarker),
+        create_face_landmarker(MediapipeFaceLandmarker),
+    )
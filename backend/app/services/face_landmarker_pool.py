@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from app.services.face_landmarker import FaceLandmarker
+
+logger = logging.getLogger(__name__)
+
+
+class FaceLandmarkerPool:
+    """
+    Bounded pool of face landmarker instances.
+
+    Each stream checks out its own instance for its lifetime so that tracking
+    state is never mixed across streams and streams can be landmarked in
+    parallel. When the pool is exhausted, callers get the shared fallback
+    instance instead and the exhaustion is counted.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], FaceLandmarker],
+        size: int,
+        fallback: FaceLandmarker,
+    ):
+        """
+        Args:
+            factory: Callable creating a new landmarker instance.
+            size: Maximum number of pooled instances.
+            fallback: Shared instance handed out when the pool is exhausted.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if size < 0:
+            raise ValueError("size must be non-negative.")
+
+        self._factory = factory
+        self._size = size
+        self._fallback = fallback
+        self._lock = threading.Lock()
+        self._idle: list[FaceLandmarker] = []
+        self._in_use: set[int] = set()
+        self._created = 0
+        self._closed = False
+
+        self._acquisitions = 0
+        self._exhaustions = 0
+        self._peak_in_use = 0
+
+        logger.info("Face landmarker pool initialized (size=%d)", size)
+
+    def acquire(self) -> FaceLandmarker:
+        """
+        Check out a landmarker instance.
+        May block while a new instance is created.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Face landmarker pool has been closed")
+
+            self._acquisitions += 1
+            landmarker = self._idle.pop() if self._idle else None
+            create = landmarker is None and self._created < self._size
+            if create:
+                self._created += 1
+            elif landmarker is None:
+                self._exhaustions += 1
+                logger.warning(
+                    "Face landmarker pool exhausted (size=%d); using shared instance",
+                    self._size,
+                )
+                return self._fallback
+
+        if create:
+            try:
+                landmarker = self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        assert landmarker is not None
+        reset_clock = getattr(landmarker, "reset_clock", None)
+        if reset_clock:
+            reset_clock()
+
+        with self._lock:
+            self._in_use.add(id(landmarker))
+            self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+
+        return landmarker
+
+    def release(self, landmarker: FaceLandmarker) -> None:
+        """
+        Return a landmarker instance to the pool.
+        """
+        if landmarker is self._fallback:
+            return
+
+        with self._lock:
+            self._in_use.discard(id(landmarker))
+            if not self._closed:
+                self._idle.append(landmarker)
+                return
+
+        landmarker.close()
+
+    @contextmanager
+    def lease(self) -> Iterator[FaceLandmarker]:
+        """
+        Check out a landmarker for the duration of a with-block.
+        """
+        landmarker = self.acquire()
+        try:
+            yield landmarker
+        finally:
+            self.release(landmarker)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return pool usage and exhaustion statistics.
+        """
+        with self._lock:
+            return {
+                "size": self._size,
+                "created": self._created,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "peak_in_use": self._peak_in_use,
+                "acquisitions": self._acquisitions,
+                "exhaustions": self._exhaustions,
+            }
+
+    def close(self) -> None:
+        """
+        Close all idle instances. Instances still checked out are closed on release.
+        Safe to call multiple times.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for landmarker in idle:
+            try:
+                landmarker.close()
+            except Exception:
+                logger.exception("Error while closing pooled FaceLandmarker")
@@ -88,6 +88,10 @@ OUTER_LIP: list[int] = [
 
 NOSE: list[int] = [4, 1, 195]
 
+LEFT_IRIS: list[int] = [468, 469, 470, 471, 472]
+
+RIGHT_IRIS: list[int] = [473, 474, 475, 476, 477]
+
 
 def combine_landmarks(*groups: list[int]) -> list[int]:
     """Combine multiple landmark lists into a unique list."""
@@ -0,0 +1,100 @@
+"""
+Reduced-rate face search while no face is visible.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import cv2
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmark2D, FaceLandmarker
+
+
+class FaceSearch:
+    """
+    Searches for a face at reduced rate and resolution while it is missing.
+
+    Search mode starts when the face missing state goes true. Until a face is
+    found again, the landmarker only runs on every N-th frame, on a downscaled
+    copy, and the frame is reported as face missing without further processing.
+    """
+
+    def __init__(self, interval: int = 5, max_width: int = 240):
+        """
+        Args:
+            interval: Run the landmarker every N frames while searching.
+            max_width: Maximum frame width used for searching.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if interval < 1:
+            raise ValueError("interval must be at least 1.")
+        if max_width <= 0:
+            raise ValueError("max_width must be positive.")
+
+        self.interval = interval
+        self.max_width = max_width
+
+        self.active = False
+        self._frames_searching = 0
+
+        self.search_calls = 0
+        self.skipped_frames = 0
+        self.searches_started = 0
+
+    def search(
+        self,
+        img: np.ndarray,
+        face_landmarker: FaceLandmarker,
+        timestamp_ms: int | None = None,
+    ) -> Sequence[FaceLandmark2D]:
+        """
+        Look for a face in a frame while in search mode.
+
+        Args:
+            img: BGR frame.
+            face_landmarker: Landmarker of the session.
+            timestamp_ms: Media timestamp of the frame.
+
+        Returns:
+            The normalized landmarks of the face, valid for the full-size
+            frame, if one was found and the frame should be processed in
+            full; otherwise an empty sequence.
+        """
+        self._frames_searching += 1
+        if (self._frames_searching - 1) % self.interval:
+            self.skipped_frames += 1
+            return []
+
+        h, w = img.shape[:2]
+        if w > self.max_width:
+            scale = self.max_width / w
+            img = cv2.resize(
+                img, (self.max_width, int(h * scale)), interpolation=cv2.INTER_AREA
+            )
+
+        self.search_calls += 1
+        face_landmarks = face_landmarker.detect(img, timestamp_ms)
+        if face_landmarks:
+            self.active = False
+        return face_landmarks
+
+    def update(self, face_missing: bool) -> None:
+        """
+        Enter search mode when the face missing state of a processed frame is set.
+        """
+        if face_missing and not self.active:
+            self.active = True
+            self._frames_searching = 0
+            self.searches_started += 1
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "face_search_active": int(self.active),
+            "face_search_calls": self.search_calls,
+            "face_search_skipped_frames": self.skipped_frames,
+            "face_searches": self.searches_started,
+        }
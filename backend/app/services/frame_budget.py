@@ -0,0 +1,94 @@
+"""
+Per-frame latency budget for live processing.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Sequence
+
+from app.services.object_detector import ObjectDetection
+
+
+class FrameBudget:
+    """
+    Tracks how much of a frame's time budget is used and decides whether the
+    detector still fits in it.
+
+    A frame's budget starts when it is received, so time spent waiting in the
+    queue counts against it. When too much of the budget is used before the
+    detector would run, the detector is skipped and the last detections are
+    carried forward.
+    """
+
+    def __init__(self, budget_sec: float, detect_fraction: float = 0.6):
+        """
+        Args:
+            budget_sec: Time budget per frame, usually the target frame interval.
+            detect_fraction: Fraction of the budget after which the detector
+                is skipped (0-1].
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if budget_sec <= 0:
+            raise ValueError("budget_sec must be positive.")
+        if not (0.0 < detect_fraction <= 1.0):
+            raise ValueError("detect_fraction must be in the range (0, 1].")
+
+        self.budget_sec = budget_sec
+        self.detect_fraction = detect_fraction
+
+        self._started_at = 0.0
+        self._detections: Sequence[ObjectDetection] = []
+
+        self.frames = 0
+        self.skipped_detections = 0
+        self.over_budget_frames = 0
+        self.last_latency_sec = 0.0
+
+    def start(self, received_at: float | None = None) -> None:
+        """
+        Start the budget of a frame.
+
+        Args:
+            received_at: time.monotonic() when the frame was received
+                (default: now).
+        """
+        self._started_at = received_at if received_at is not None else time.monotonic()
+
+    def allows_detection(self) -> bool:
+        """
+        Whether enough of the budget is left to run the detector.
+        """
+        elapsed = time.monotonic() - self._started_at
+        if elapsed < self.budget_sec * self.detect_fraction:
+            return True
+        self.skipped_detections += 1
+        return False
+
+    def carry_forward(self) -> Sequence[ObjectDetection]:
+        """
+        Return the detections of the last frame the detector ran on.
+        """
+        return self._detections
+
+    def record_detections(self, detections: Sequence[ObjectDetection]) -> None:
+        self._detections = detections
+
+    def finish(self) -> None:
+        """
+        End the budget of a frame.
+        """
+        self.last_latency_sec = time.monotonic() - self._started_at
+        self.frames += 1
+        if self.last_latency_sec > self.budget_sec:
+            self.over_budget_frames += 1
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "frame_budget_ms": round(self.budget_sec * 1000, 1),
+            "frame_latency_ms": round(self.last_latency_sec * 1000, 1),
+            "budget_skipped_detections": self.skipped_detections,
+            "over_budget_frames": self.over_budget_frames,
+        }
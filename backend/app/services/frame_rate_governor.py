@@ -0,0 +1,164 @@
+"""
+Load-aware frame-rate governor for live sessions.
+"""
+
+from __future__ import annotations
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FrameRateGovernor:
+    """
+    Lowers the processing rate of all live sessions smoothly when the host is
+    saturated, and raises it again when capacity frees up.
+
+    Utilization is estimated from the measured per-frame processing time and
+    the number of sessions, against the number of processing workers. Frames
+    queueing up behind busy workers back the rate off further. The rate never
+    drops below a per-session floor.
+
+    Only used from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        target_fps: float,
+        min_fps: float,
+        workers: int,
+        target_utilization: float = 0.8,
+        smoothing: float = 0.1,
+    ):
+        """
+        Args:
+            target_fps: Processing rate per session when the host is not saturated.
+            min_fps: Lowest processing rate per session.
+            workers: Number of frames that can be processed in parallel.
+            target_utilization: Worker utilization to aim for (0-1].
+            smoothing: Weight of each new measurement (0-1].
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if target_fps <= 0:
+            raise ValueError("target_fps must be positive.")
+        if not (0 < min_fps <= target_fps):
+            raise ValueError("min_fps must be in the range (0, target_fps].")
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if not (0.0 < target_utilization <= 1.0):
+            raise ValueError("target_utilization must be in the range (0, 1].")
+        if not (0.0 < smoothing <= 1.0):
+            raise ValueError("smoothing must be in the range (0, 1].")
+
+        self.target_fps = target_fps
+        self.min_fps = min_fps
+        self.workers = workers
+        self.target_utilization = target_utilization
+        self.smoothing = smoothing
+
+        self._scale = 1.0
+        self._min_scale = min_fps / target_fps
+        self._frame_time_sec: float | None = None
+        self._in_flight = 0
+        self._sessions: set[str] = set()
+
+    def register(self, client_id: str) -> None:
+        self._sessions.add(client_id)
+
+    def unregister(self, client_id: str) -> None:
+        self._sessions.discard(client_id)
+
+    def frame_started(self) -> None:
+        """
+        Record a frame handed to the processing workers.
+        """
+        self._in_flight += 1
+
+    def frame_finished(self, frame_time_sec: float | None) -> None:
+        """
+        Record a processed frame and adjust the rate.
+
+        Args:
+            frame_time_sec: Time a worker spent processing the frame, excluding
+                            time queued behind other frames, or None if the
+                            frame failed.
+        """
+        self._in_flight = max(0, self._in_flight - 1)
+        if frame_time_sec is not None and self._frame_time_sec is None:
+            self._frame_time_sec = frame_time_sec
+        elif frame_time_sec is not None:
+            self._frame_time_sec += self.smoothing * (
+                frame_time_sec - self._frame_time_sec
+            )
+        self._adjust()
+
+    def _full_rate_utilization(self) -> float:
+        """
+        Worker utilization if every session ran at the target rate.
+        """
+        if not self._frame_time_sec:
+            return 0.0
+        demand = len(self._sessions) * self.target_fps * self._frame_time_sec
+        return demand / self.workers
+
+    def _adjust(self) -> None:
+        utilization = self._full_rate_utilization()
+        desired = 1.0
+        if utilization > 0:
+            desired = min(1.0, self.target_utilization / utilization)
+        if self._in_flight > self.workers:
+            # Frames are queueing: back off below the current rate
+            desired = min(desired, self._scale * 0.9)
+
+        previous = self.effective_fps()
+        self._scale += self.smoothing * (desired - self._scale)
+        self._scale = min(1.0, max(self._min_scale, self._scale))
+
+        current = self.effective_fps()
+        if int(previous) != int(current):
+            logger.info("Frame rate governor: %.1f fps per session", current)
+
+    def effective_fps(self) -> float:
+        """
+        Current processing rate per session.
+        """
+        return max(self.min_fps, self.target_fps * self._scale)
+
+    def interval(self) -> float:
+        """
+        Current minimum time between processed frames of a session, in seconds.
+        """
+        return 1.0 / self.effective_fps()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "effective_fps": round(self.effective_fps(), 2),
+            "full_rate_utilization": round(self._full_rate_utilization(), 3),
+            "frame_time_ms": round((self._frame_time_sec or 0.0) * 1000, 1),
+            "frames_in_flight": self._in_flight,
+            "sessions": len(self._sessions),
+        }
+
+
+_governor: FrameRateGovernor | None = None
+
+
+def start_frame_rate_governor(
+    target_fps: float, min_fps: float, workers: int
+) -> FrameRateGovernor:
+    """
+    Start the process-wide frame-rate governor.
+    """
+    global _governor
+    if _governor is None:
+        _governor = FrameRateGovernor(target_fps, min_fps, workers)
+    return _governor
+
+
+def get_frame_rate_governor() -> FrameRateGovernor | None:
+    """
+    Return the frame-rate governor, or None if sessions run at the target rate.
+    """
+    return _governor
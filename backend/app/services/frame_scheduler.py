@@ -0,0 +1,168 @@
+"""
+Fair-share deadline scheduling of live frames onto the processing threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+
+@dataclass
+class _Job:
+    client_id: str
+    deadline: float
+    func: Callable[[], Any]
+    future: asyncio.Future
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Account:
+    frames: int = 0
+    service_sec: float = 0.0
+    wait_sec: float = 0.0
+    missed_deadlines: int = 0
+
+
+def timed(func: Callable[[], Any]) -> tuple[Any, float]:
+    """
+    Call func and return its result with the time the call took, in seconds.
+    """
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+class FrameScheduler:
+    """
+    Dispatches frames of all live sessions onto an executor, earliest deadline
+    first.
+
+    Each session has at most one pending frame, and frames are only handed to
+    the executor when a worker is free, so a session with a fast camera cannot
+    queue up work ahead of the others. With N sessions and W workers, a frame
+    waits for at most ceil(N / W) frames of other sessions. Ties go to the
+    session that has received the least service time.
+
+    Only used from the event loop thread, so no locking is needed.
+    """
+
+    def __init__(self, executor: Executor, workers: int):
+        """
+        Args:
+            executor: Executor running the frame processing.
+            workers: Number of frames to run on the executor at once.
+
+        Raises:
+            ValueError: If workers is less than 1.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+
+        self._executor = executor
+        self.workers = workers
+        self._pending: dict[str, _Job] = {}
+        self._running = 0
+        self._accounts: dict[str, _Account] = {}
+
+    async def run(
+        self, client_id: str, deadline: float, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """
+        Run a frame of a session once it is its turn, and return the result.
+
+        Args:
+            client_id: Session the frame belongs to.
+            deadline: time.monotonic() by which the result is due.
+            func: Processing function, called with args on the executor.
+
+        Raises:
+            RuntimeError: If the session already has a pending frame.
+        """
+        if client_id in self._pending:
+            raise RuntimeError(f"Session {client_id} already has a pending frame")
+
+        self._accounts.setdefault(client_id, _Account())
+        job = _Job(
+            client_id=client_id,
+            deadline=deadline,
+            func=functools.partial(func, *args),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._pending[client_id] = job
+        self._dispatch()
+
+        try:
+            return await job.future
+        finally:
+            # Drop the frame if the session stopped before it was dispatched
+            if self._pending.get(client_id) is job:
+                del self._pending[client_id]
+
+    def _next_job(self) -> _Job:
+        def priority(job: _Job) -> tuple[float, float]:
+            return job.deadline, self._accounts[job.client_id].service_sec
+
+        return self._pending.pop(min(self._pending.values(), key=priority).client_id)
+
+    def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._running < self.workers and self._pending:
+            job = self._next_job()
+            wait_sec = time.monotonic() - job.submitted_at
+            self._accounts[job.client_id].wait_sec += wait_sec
+            self._running += 1
+            future = loop.run_in_executor(self._executor, timed, job.func)
+            future.add_done_callback(functools.partial(self._finished, job))
+
+    def _finished(self, job: _Job, future: asyncio.Future) -> None:
+        self._running -= 1
+
+        account = self._accounts.get(job.client_id)
+        if future.cancelled():
+            job.future.cancel()
+        elif future.exception() is not None:
+            if not job.future.done():
+                job.future.set_exception(future.exception())
+        else:
+            result, service_sec = future.result()
+            if account is not None:
+                account.frames += 1
+                account.service_sec += service_sec
+                if time.monotonic() > job.deadline:
+                    account.missed_deadlines += 1
+            if not job.future.done():
+                job.future.set_result(result)
+
+        self._dispatch()
+
+    def session_stats(self, client_id: str) -> dict[str, float]:
+        """
+        Return the service accounting of a session.
+        """
+        account = self._accounts.get(client_id)
+        if account is None or account.frames == 0:
+            return {}
+        return {
+            "scheduled_frames": account.frames,
+            "service_time_sec": round(account.service_sec, 3),
+            "mean_service_ms": round(account.service_sec / account.frames * 1000, 1),
+            "mean_wait_ms": round(account.wait_sec / account.frames * 1000, 1),
+            "missed_deadlines": account.missed_deadlines,
+        }
+
+    def remove_session(self, client_id: str) -> None:
+        self._accounts.pop(client_id, None)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "pending": len(self._pending),
+            "sessions": len(self._accounts),
+        }
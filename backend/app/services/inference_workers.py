@@ -0,0 +1,448 @@
+"""
+Process-pool frame processing with shared-memory frame handoff.
+
+Each worker process owns its own face landmarker pool, object detector and the
+per-session metric state of the sessions assigned to it. Frames are written by
+the parent into a fixed-size shared-memory ring owned by the worker, so only a
+slot index crosses the process boundary; the worker sends back the serialized
+inference result.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.face_landmarker import FaceLandmarker
+from app.services.face_landmarker_pool import FaceLandmarkerPool
+from app.services.object_detector import ObjectDetector
+from app.services.pipeline_state import PipelineState
+
+logger = logging.getLogger(__name__)
+
+# Largest frame that fits in a ring slot (frames are at most 480px wide
+# after resizing; this leaves room for portrait video)
+SLOT_MAX_HEIGHT = 1080
+SLOT_MAX_WIDTH = 480
+SLOT_BYTES = SLOT_MAX_HEIGHT * SLOT_MAX_WIDTH * 3
+
+
+class _FrameRing:
+    """
+    Fixed-size ring of frame slots in a shared-memory block.
+    """
+
+    def __init__(self, num_slots: int):
+        self.num_slots = num_slots
+        self.shm = SharedMemory(create=True, size=num_slots * SLOT_BYTES)
+        self._lock = threading.Lock()
+        self._free = list(range(num_slots))
+        self._next = 0
+
+    def write(self, img: np.ndarray) -> int | None:
+        """
+        Copy a frame into a free slot.
+
+        Returns:
+            The slot index, or None if no slot is free or the frame does not fit.
+        """
+        if img.dtype != np.uint8 or img.nbytes > SLOT_BYTES:
+            return None
+
+        with self._lock:
+            if not self._free:
+                return None
+            # Hand out slots in ring order so recently released ones cool down
+            self._free.sort(key=lambda s: (s - self._next) % self.num_slots)
+            slot = self._free.pop(0)
+            self._next = (slot + 1) % self.num_slots
+
+        view = slot_view(self.shm, slot, img.shape)
+        np.copyto(view, img)
+        return slot
+
+    def release(self, slot: int) -> None:
+        with self._lock:
+            self._free.append(slot)
+
+    def close(self) -> None:
+        try:
+            self.shm.close()
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def slot_view(shm: SharedMemory, slot: int, shape: tuple[int, ...]) -> np.ndarray:
+    """
+    Return an ndarray view of a frame stored in a ring slot.
+    """
+    return np.ndarray(shape, dtype=np.uint8, buffer=shm.buf, offset=slot * SLOT_BYTES)
+
+
+@dataclass
+class _Worker:
+    """
+    Parent-side handle of a worker process.
+    """
+
+    index: int
+    executor: ProcessPoolExecutor
+    ring: _FrameRing
+    sessions: set[str] = field(default_factory=set)
+    # Sessions whose state was lost with a crashed process
+    sessions_to_reset: set[str] = field(default_factory=set)
+
+
+class InferenceWorkerPool:
+    """
+    Pool of frame-processing worker processes.
+
+    Sessions are pinned to a worker so that their metric and tracking state
+    stays in one process.
+    """
+
+    def __init__(
+        self, num_workers: int, slots_per_worker: int, landmarker_pool_size: int
+    ):
+        """
+        Args:
+            num_workers: Number of worker processes.
+            slots_per_worker: Number of shared-memory frame slots per worker.
+            landmarker_pool_size: Total face landmarker pool size, split across workers.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1.")
+        if slots_per_worker < 1:
+            raise ValueError("slots_per_worker must be at least 1.")
+
+        self._ctx = mp.get_context("spawn")
+        self._slots_per_worker = slots_per_worker
+        self._landmarkers_per_worker = max(1, -(-landmarker_pool_size // num_workers))
+
+        self._workers: list[_Worker] = []
+        self._assignments: dict[str, _Worker] = {}
+        self._inline_frames = 0
+        self._shared_frames = 0
+        self._restarts = 0
+
+        for index in range(num_workers):
+            ring = _FrameRing(slots_per_worker)
+            executor = self._start_executor(ring, index)
+            self._workers.append(_Worker(index=index, executor=executor, ring=ring))
+
+        # Spawn processes and load models now rather than on the first frame
+        for worker in self._workers:
+            worker.executor.submit(_ping).result()
+
+        logger.info(
+            "Inference worker pool started (workers=%d, slots_per_worker=%d)",
+            num_workers,
+            slots_per_worker,
+        )
+
+    def _start_executor(self, ring: _FrameRing, index: int) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=self._ctx,
+            initializer=_init_worker,
+            initargs=(ring.shm.name, self._landmarkers_per_worker, index),
+        )
+
+    def _restart_worker(self, worker: _Worker, broken: ProcessPoolExecutor) -> None:
+        """
+        Replace a worker whose process died. Its sessions stay assigned to it
+        and start over from a fresh state on their next frame.
+        """
+        if worker.executor is not broken:
+            return  # Already restarted by another session's frame
+
+        logger.error(
+            "Inference worker %d died; restarting it for %d session(s)",
+            worker.index,
+            len(worker.sessions),
+        )
+        broken.shutdown(wait=False, cancel_futures=True)
+        worker.ring.close()
+
+        worker.ring = _FrameRing(self._slots_per_worker)
+        worker.executor = self._start_executor(worker.ring, worker.index)
+        worker.sessions_to_reset = set(worker.sessions)
+        self._restarts += 1
+
+    def open_session(self, client_id: str) -> None:
+        """
+        Pin a session to the least loaded worker.
+        """
+        worker = min(self._workers, key=lambda w: len(w.sessions))
+        worker.sessions.add(client_id)
+        self._assignments[client_id] = worker
+
+    def close_session(self, client_id: str) -> None:
+        """
+        Drop a session and release its state in the worker.
+        """
+        worker = self._assignments.pop(client_id, None)
+        if worker is None:
+            return
+        worker.sessions.discard(client_id)
+        worker.sessions_to_reset.discard(client_id)
+        try:
+            worker.executor.submit(_end_session, client_id)
+        except RuntimeError:
+            pass  # Pool already shut down
+
+    async def process_frame(
+        self,
+        client_id: str,
+        timestamp: str,
+        img_bgr: np.ndarray,
+        media_timestamp_ms: int | None = None,
+        *,
+        reset: bool = False,
+        recalibrate_head_pose: bool = False,
+        received_at: float | None = None,
+    ) -> tuple[str, dict[str, float], float]:
+        """
+        Process a frame in the session's worker.
+
+        Args:
+            received_at: time.monotonic() when the frame was received; the
+                monotonic clock is shared by all processes.
+
+        Returns:
+            Inference result serialized as JSON, the session's pipeline stats,
+            and the time the worker spent processing the frame, in seconds.
+
+        Raises:
+            BrokenProcessPool: If the worker died; it is restarted for the
+                session's next frame.
+        """
+        worker = self._assignments.get(client_id)
+        if worker is None:
+            raise RuntimeError(f"No inference worker assigned to {client_id}")
+
+        if client_id in worker.sessions_to_reset:
+            worker.sessions_to_reset.discard(client_id)
+            reset = True
+
+        executor, ring = worker.executor, worker.ring
+        slot = ring.write(img_bgr)
+        if slot is None:
+            # Ring full or frame too large: fall back to pickling the frame
+            self._inline_frames += 1
+        else:
+            self._shared_frames += 1
+
+        try:
+            future: Future = executor.submit(
+                _process_frame,
+                client_id,
+                timestamp,
+                slot,
+                img_bgr.shape,
+                img_bgr if slot is None else None,
+                media_timestamp_ms,
+                reset,
+                recalibrate_head_pose,
+                received_at,
+            )
+            if slot is not None:
+                # Release only once the worker is done reading, even if we are
+                # cancelled
+                future.add_done_callback(lambda _: ring.release(slot))
+
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._restart_worker(worker, executor)
+            raise
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return worker and frame handoff statistics.
+        """
+        return {
+            "workers": len(self._workers),
+            "sessions": len(self._assignments),
+            "shared_memory_frames": self._shared_frames,
+            "inline_frames": self._inline_frames,
+            "worker_restarts": self._restarts,
+        }
+
+    def close(self) -> None:
+        """
+        Shut down worker processes and free shared memory.
+        """
+        for worker in self._workers:
+            worker.executor.shutdown(wait=True, cancel_futures=True)
+            worker.ring.close()
+        self._workers.clear()
+        self._assignments.clear()
+
+
+_pool: InferenceWorkerPool | None = None
+
+
+def start_inference_worker_pool(
+    num_workers: int, slots_per_worker: int, landmarker_pool_size: int
+) -> InferenceWorkerPool:
+    """
+    Start the process-wide inference worker pool.
+    """
+    global _pool
+    if _pool is None:
+        _pool = InferenceWorkerPool(num_workers, slots_per_worker, landmarker_pool_size)
+    return _pool
+
+
+def get_inference_worker_pool() -> InferenceWorkerPool | None:
+    """
+    Return the inference worker pool, or None if frames run in-process.
+    """
+    return _pool
+
+
+def stop_inference_worker_pool() -> None:
+    """
+    Stop the process-wide inference worker pool, if started.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+# ---------------------------------------------------------------------------
+# Worker process side
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _WorkerSession:
+    face_landmarker: FaceLandmarker
+    state: PipelineState = field(default_factory=PipelineState)
+
+
+@dataclass
+class _WorkerState:
+    shm: SharedMemory
+    landmarker_pool: FaceLandmarkerPool
+    object_detector: ObjectDetector
+    sessions: dict[str, _WorkerSession] = field(default_factory=dict)
+
+
+_state: _WorkerState | None = None
+
+
+def _init_worker(shm_name: str, landmarker_pool_size: int, index: int) -> None:
+    """
+    Attach to the frame ring and load models in a worker process.
+    """
+    global _state
+
+    from app.core.cpu_budget import apply_cpu_plan, get_cpu_plan
+    from app.core.logging import configure_logging
+    from app.services.detector_factory import (
+        build_object_detector,
+        phone_presence_classifier,
+    )
+    from app.services.face_landmarker_factory import build_face_landmarkers
+
+    configure_logging()
+
+    # Before any inference session is created
+    plan = get_cpu_plan()
+    if plan:
+        server_index = int(os.environ.get("SERVER_WORKER_INDEX", 0))
+        apply_cpu_plan(plan, server_index * settings.inference_worker_processes + index)
+
+    shm = SharedMemory(name=shm_name)
+    # The parent owns the segment; don't let this process's tracker unlink it
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+
+    landmarker_factory, fallback_landmarker = build_face_landmarkers()
+    _state = _WorkerState(
+        shm=shm,
+        landmarker_pool=FaceLandmarkerPool(
+            landmarker_factory,
+            size=landmarker_pool_size,
+            fallback=fallback_landmarker,
+        ),
+        object_detector=build_object_detector(),
+    )
+    # Load the phone gate classifier before the first session needs it
+    phone_presence_classifier()
+
+
+def _ping() -> bool:
+    return _state is not None
+
+
+def _process_frame(
+    client_id: str,
+    timestamp: str,
+    slot: int | None,
+    shape: tuple[int, ...],
+    inline_img: np.ndarray | None,
+    media_timestamp_ms: int | None,
+    reset: bool,
+    recalibrate_head_pose: bool,
+    received_at: float | None,
+) -> tuple[str, dict[str, float], float]:
+    """
+    Process one frame of a session inside the worker.
+    """
+    from app.services.video_processor import process_video_frame
+
+    assert _state is not None, "Inference worker not initialized"
+
+    session = _state.sessions.get(client_id)
+    if session is None:
+        session = _WorkerSession(face_landmarker=_state.landmarker_pool.acquire())
+        _state.sessions[client_id] = session
+
+    if reset:
+        session.state = PipelineState()
+    if recalibrate_head_pose:
+        session.state.metric_manager.reset_head_pose_baseline()
+
+    img = inline_img if slot is None else slot_view(_state.shm, slot, shape)
+
+    start = time.perf_counter()
+    result = process_video_frame(
+        timestamp,
+        img,
+        session.face_landmarker,
+        _state.object_detector,
+        session.state,
+        media_timestamp_ms,
+        received_at,
+    )
+    service_sec = time.perf_counter() - start
+    return result.model_dump_json(), session.state.stats(), service_sec
+
+
+def _end_session(client_id: str) -> None:
+    """
+    Release the state of a finished session.
+    """
+    if _state is None:
+        return
+    session = _state.sessions.pop(client_id, None)
+    if session is not None:
+        _state.landmarker_pool.release(session.face_landmarker)
@@ -0,0 +1,171 @@
+"""
+Optical-flow landmark propagation between face landmarker keyframes.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmark2D
+from app.services.face_landmarks import (
+    ESSENTIAL_LANDMARKS,
+    LEFT_IRIS,
+    RIGHT_IRIS,
+    combine_landmarks,
+)
+
+# Points tracked with optical flow: the essential points, the irises, and the
+# extra head pose reference points (forehead, nose bridge, chin, cheeks).
+FLOW_LANDMARKS: list[int] = combine_landmarks(
+    ESSENTIAL_LANDMARKS, LEFT_IRIS, RIGHT_IRIS, [10, 6, 175, 234, 454]
+)
+
+LK_PARAMS = dict(
+    winSize=(15, 15),
+    maxLevel=3,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03),
+)
+
+
+class LandmarkPropagator:
+    """
+    Propagates face landmarks between landmarker keyframes.
+
+    On non-keyframes the flow points are tracked with pyramidal Lucas-Kanade
+    flow, and the remaining landmarks follow the similarity transform fitted
+    to the tracked points, so the full landmark layout is preserved. A
+    forward-backward flow check detects drift and forces a landmarker run.
+    """
+
+    def __init__(
+        self,
+        keyframe_interval: int = 3,
+        max_fb_error_px: float = 1.0,
+        min_good_fraction: float = 0.8,
+    ):
+        """
+        Args:
+            keyframe_interval: Run the landmarker at least every N frames.
+            max_fb_error_px: Forward-backward error above which a point is considered lost.
+            min_good_fraction: Fraction of flow points that must be tracked reliably (0-1].
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        if max_fb_error_px <= 0:
+            raise ValueError("max_fb_error_px must be positive.")
+        if not (0.0 < min_good_fraction <= 1.0):
+            raise ValueError("min_good_fraction must be in the range (0, 1].")
+
+        self.keyframe_interval = keyframe_interval
+        self.max_fb_error_px = max_fb_error_px
+        self.min_good_fraction = min_good_fraction
+
+        self._prev_gray: Optional[np.ndarray] = None
+        self._landmarks: Optional[np.ndarray] = None  # (N, 2) pixel coordinates
+        self._frames_since_keyframe = 0
+
+        self._started_at = time.perf_counter()
+        self.landmarker_calls = 0
+        self.propagated_frames = 0
+        self.drift_resets = 0
+
+    def should_detect(self, gray: np.ndarray) -> bool:
+        """
+        Whether the landmarker must run on this frame.
+        """
+        if self._landmarks is None or self._prev_gray is None:
+            return True
+        if self._prev_gray.shape != gray.shape:
+            return True
+        return self._frames_since_keyframe + 1 >= self.keyframe_interval
+
+    def update(
+        self, gray: np.ndarray, face_landmarks: Sequence[FaceLandmark2D]
+    ) -> None:
+        """
+        Record a landmarker keyframe.
+        """
+        self.landmarker_calls += 1
+        self._frames_since_keyframe = 0
+        self._prev_gray = gray
+
+        if len(face_landmarks) <= max(FLOW_LANDMARKS):
+            # No face (or an unexpected layout): nothing to propagate from
+            self._landmarks = None
+            return
+
+        h, w = gray.shape[:2]
+        # Optical flow needs float32 points; a tuple scale would promote to float64
+        scale = np.array((w, h), dtype=np.float32)
+        self._landmarks = np.asarray(face_landmarks, dtype=np.float32) * scale
+
+    def propagate(self, gray: np.ndarray) -> Optional[list[FaceLandmark2D]]:
+        """
+        Propagate the last landmarks onto the current frame.
+
+        Returns:
+            Normalized landmarks, or None if drift was detected and the
+            landmarker must run instead.
+        """
+        if self._landmarks is None or self._prev_gray is None:
+            return None
+
+        prev_pts = self._landmarks[FLOW_LANDMARKS].reshape(-1, 1, 2)
+
+        next_pts, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray, gray, prev_pts, None, **LK_PARAMS
+        )
+        back_pts, back_status, _ = cv2.calcOpticalFlowPyrLK(
+            gray, self._prev_gray, next_pts, None, **LK_PARAMS
+        )
+
+        fb_error = np.linalg.norm((prev_pts - back_pts).reshape(-1, 2), axis=1)
+        good = (
+            (status.ravel() == 1)
+            & (back_status.ravel() == 1)
+            & (fb_error <= self.max_fb_error_px)
+        )
+
+        if good.mean() < self.min_good_fraction:
+            self.drift_resets += 1
+            return None
+
+        src = prev_pts.reshape(-1, 2)[good]
+        dst = next_pts.reshape(-1, 2)[good]
+        transform, _ = cv2.estimateAffinePartial2D(src, dst)
+        if transform is None:
+            self.drift_resets += 1
+            return None
+
+        # Move all landmarks rigidly, then refine the tracked ones with their own flow
+        landmarks = cv2.transform(self._landmarks.reshape(-1, 1, 2), transform)
+        landmarks = landmarks.reshape(-1, 2)
+        flow_idx = np.asarray(FLOW_LANDMARKS)[good]
+        landmarks[flow_idx] = dst
+
+        self._landmarks = landmarks
+        self._prev_gray = gray
+        self._frames_since_keyframe += 1
+        self.propagated_frames += 1
+
+        h, w = gray.shape[:2]
+        normalized = landmarks / (w, h)
+        return [(float(x), float(y)) for x, y in normalized]
+
+    def stats(self) -> dict[str, float]:
+        elapsed = time.perf_counter() - self._started_at
+        return {
+            "landmarker_calls": self.landmarker_calls,
+            "landmarker_calls_per_sec": self.landmarker_calls / elapsed
+            if elapsed > 0
+            else 0.0,
+            "propagated_frames": self.propagated_frames,
+            "landmark_drift_resets": self.drift_resets,
+        }
@@ -1,6 +1,7 @@
 from app.core.config import settings
 from app.services.metrics.base_metric import BaseMetric, MetricOutputBase
 from app.services.metrics.frame_context import FrameContext
+from app.services.object_detector import Detections
 
 PHONE_CLASS_ID = 67  # COCO
 
@@ -60,10 +61,13 @@ class PhoneUsageMetric(BaseMetric):
     def update(self, context: FrameContext) -> PhoneUsageMetricOutput:
         obj_detections = context.object_detections or []
 
-        phone_detected = any(
-            d.conf >= self.conf and (d.class_id == PHONE_CLASS_ID)
-            for d in obj_detections
-        )
+        if isinstance(obj_detections, Detections):
+            phone_detected = obj_detections.any_of(PHONE_CLASS_ID, self.conf)
+        else:
+            phone_detected = any(
+                d.conf >= self.conf and (d.class_id == PHONE_CLASS_ID)
+                for d in obj_detections
+            )
 
         if phone_detected:
             self._usage_counter = min(self._usage_counter + 1, self._min_usage_frames)
@@ -0,0 +1,110 @@
+"""
+Frame-difference gate that reuses model outputs while the scene is still.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import cv2
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmark2D
+from app.services.object_detector import ObjectDetection
+
+# Width of the grayscale thumbnail compared between frames
+THUMBNAIL_WIDTH = 64
+
+
+class MotionGate:
+    """
+    Decides per frame whether the models must run again.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with the
+    thumbnail of the last frame the models ran on. While the mean absolute
+    difference stays below the threshold, the outputs of that frame are reused.
+    """
+
+    def __init__(self, threshold: float = 2.0, refresh_interval: int = 10):
+        """
+        Args:
+            threshold: Mean absolute gray-level difference (0-255) below which
+                a frame is considered unchanged.
+            refresh_interval: Run the models at least every N frames.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if threshold < 0:
+            raise ValueError("threshold must not be negative.")
+        if refresh_interval < 1:
+            raise ValueError("refresh_interval must be at least 1.")
+
+        self.threshold = threshold
+        self.refresh_interval = refresh_interval
+
+        self._reference: Optional[np.ndarray] = None
+        self._pending: Optional[np.ndarray] = None
+        self._face_landmarks: Sequence[FaceLandmark2D] = []
+        self._object_detections: Sequence[ObjectDetection] = []
+        self._frames_since_refresh = 0
+
+        self.last_difference = 0.0
+        self.processed_frames = 0
+        self.reused_frames = 0
+
+    def _thumbnail(self, img: np.ndarray) -> np.ndarray:
+        h, w = img.shape[:2]
+        size = (THUMBNAIL_WIDTH, max(1, h * THUMBNAIL_WIDTH // w))
+        small = cv2.resize(img, size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def reuse(
+        self, img: np.ndarray
+    ) -> Optional[tuple[Sequence[FaceLandmark2D], Sequence[ObjectDetection]]]:
+        """
+        Return the previous outputs if the frame is unchanged, or None if the
+        models must run. In that case, call update() with their outputs.
+
+        Args:
+            img: BGR frame.
+        """
+        thumbnail = self._thumbnail(img)
+        self._frames_since_refresh += 1
+
+        reference = self._reference
+        if (
+            reference is not None
+            and reference.shape == thumbnail.shape
+            and self._frames_since_refresh < self.refresh_interval
+        ):
+            self.last_difference = float(cv2.absdiff(thumbnail, reference).mean())
+            if self.last_difference < self.threshold:
+                self.reused_frames += 1
+                return self._face_landmarks, self._object_detections
+
+        self._pending = thumbnail
+        return None
+
+    def update(
+        self,
+        face_landmarks: Sequence[FaceLandmark2D],
+        object_detections: Sequence[ObjectDetection],
+    ) -> None:
+        """
+        Store the outputs of the models for the frame passed to reuse().
+        """
+        self._reference = self._pending
+        self._face_landmarks = face_landmarks
+        self._object_detections = object_detections
+        self._frames_since_refresh = 0
+        self.processed_frames += 1
+
+    def stats(self) -> dict[str, float]:
+        total = self.processed_frames + self.reused_frames
+        return {
+            "motion_threshold": self.threshold,
+            "motion_last_difference": round(self.last_difference, 2),
+            "motion_reused_frames": self.reused_frames,
+            "motion_reuse_ratio": self.reused_frames / total if total else 0.0,
+        }
@@ -1,34 +1,182 @@
+from __future__ import annotations
+
 import logging
 import os
 import threading
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Protocol
 
-import cv2
 import numpy as np
 import onnxruntime as ort
 from pydantic import BaseModel
 
-from app.services.utils.image_utils import letterbox
+from app.services.utils.frame_arena import BufferArena, letterbox_into, to_input_tensor
+from app.services.utils.image_utils import letterbox, letterbox_cost
+from app.services.utils.ort_session import (
+    CPU_PROVIDER,
+    build_session_options,
+    create_session,
+)
 
 logger = logging.getLogger(__name__)
 
 # Path to the model file
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 MODEL_PATH = PROJECT_ROOT / "assets" / "models" / "yolov8n.onnx"
+INT8_MODEL_PATH = MODEL_PATH.with_name("yolov8n.int8.onnx")
 
 # Essential classes to filter out from object detections
 ESSENTIAL_CLASSES: list[int] = [67]  # cell phone
 
+# Maximum number of boxes passed to NMS per frame
+MAX_NMS_CANDIDATES = 300
+
+# Metadata key holding the class ID of a pruned single-class head with
+# in-graph NMS (see scripts/export_yolo_onnx.py --phone-head)
+NMS_CLASS_ID_METADATA_KEY = "nms_class_id"
+
 
 class ObjectDetection(BaseModel):
     """
     Object detection result for a single detected object.
+
+    Attributes:
+        tracked: True if the box was propagated by the tracker
+                 rather than produced by the detector on this frame.
     """
 
     bbox: list[float]
     conf: float
     class_id: int
+    tracked: bool = False
+
+
+class Detections(Sequence[ObjectDetection]):
+    """
+    Array-backed detections of a single frame.
+
+    Boxes stay in NumPy arrays through the pipeline; ObjectDetection objects
+    are only built when the detections are accessed as a sequence or
+    serialized (see detection_list).
+
+    Attributes:
+        boxes: (N, 4) xyxy boxes.
+        confs: (N,) confidences.
+        class_ids: (N,) class IDs.
+    """
+
+    __slots__ = ("boxes", "confs", "class_ids")
+
+    def __init__(self, boxes: np.ndarray, confs: np.ndarray, class_ids: np.ndarray):
+        self.boxes = boxes
+        self.confs = confs
+        self.class_ids = class_ids
+
+    @classmethod
+    def empty(cls) -> Detections:
+        return cls(
+            np.empty((0, 4), dtype=np.float32),
+            np.empty(0, dtype=np.float32),
+            np.empty(0, dtype=np.intp),
+        )
+
+    @classmethod
+    def from_sequence(cls, detections: Sequence[ObjectDetection]) -> Detections:
+        if isinstance(detections, Detections):
+            return detections
+        if not detections:
+            return cls.empty()
+        return cls(
+            np.array([d.bbox for d in detections], dtype=np.float32),
+            np.array([d.conf for d in detections], dtype=np.float32),
+            np.array([d.class_id for d in detections], dtype=np.intp),
+        )
+
+    def any_of(self, class_id: int, min_conf: float) -> bool:
+        """
+        Whether any detection of a class reaches a confidence.
+        """
+        return bool(np.any((self.class_ids == class_id) & (self.confs >= min_conf)))
+
+    def to_list(self) -> list[ObjectDetection]:
+        return [
+            ObjectDetection.model_construct(bbox=bbox, conf=conf, class_id=class_id)
+            for bbox, conf, class_id in zip(
+                self.boxes.tolist(), self.confs.tolist(), self.class_ids.tolist()
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.confs)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Detections(
+                self.boxes[index], self.confs[index], self.class_ids[index]
+            )
+        return ObjectDetection.model_construct(
+            bbox=self.boxes[index].tolist(),
+            conf=float(self.confs[index]),
+            class_id=int(self.class_ids[index]),
+        )
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+
+def detection_list(detections: Sequence[ObjectDetection]) -> list[ObjectDetection]:
+    """
+    Convert detections into ObjectDetection objects for serialization.
+    """
+    if isinstance(detections, Detections):
+        return detections.to_list()
+    return list(detections)
+
+
+class _ThreadBinding:
+    """
+    IO binding of one thread for one input shape.
+    """
+
+    def __init__(self, session: ort.InferenceSession):
+        self.session = session
+        self.binding = session.io_binding()
+        self.output_name = session.get_outputs()[0].name
+        self.output: np.ndarray | None = None
+
+    def run(self, input_name: str, tensor: np.ndarray, dynamic_output: bool):
+        self.binding.bind_input(
+            input_name,
+            "cpu",
+            0,
+            np.float32,
+            list(tensor.shape),
+            tensor.ctypes.data,
+        )
+
+        # The number of rows of in-graph NMS output varies per frame
+        if dynamic_output or self.output is None:
+            self.binding.bind_output(self.output_name, "cpu")
+            self.session.run_with_iobinding(self.binding)
+            output = self.binding.copy_outputs_to_cpu()[0]
+            if dynamic_output:
+                return output
+
+            # Learned the output shape; write into this buffer from now on
+            self.output = np.empty_like(output)
+            self.binding.bind_output(
+                self.output_name,
+                "cpu",
+                0,
+                self.output.dtype.type,
+                list(self.output.shape),
+                self.output.ctypes.data,
+            )
+            return output
+
+        self.session.run_with_iobinding(self.binding)
+        return self.output
 
 
 class ObjectDetector(Protocol):
@@ -42,7 +190,8 @@ class ObjectDetector(Protocol):
         normalize: bool = True,
         conf_threshold: float = 0.4,
         iou_threshold: float = 0.5,
-    ) -> list[ObjectDetection]: ...
+        input_size: int | None = None,
+    ) -> Sequence[ObjectDetection]: ...
 
     def close(self) -> None: ...
 
@@ -52,13 +201,37 @@ class YoloObjectDetector(ObjectDetector):
     YOLO-based implementation of object detector.
     """
 
-    def __init__(self, model_path: Path = MODEL_PATH, input_size: int = 640):
+    def __init__(
+        self,
+        model_path: Path = MODEL_PATH,
+        input_size: int = 640,
+        reuse_buffers: bool = True,
+        session_options: ort.SessionOptions | None = None,
+        providers: list[str] | None = None,
+        concurrent: bool = False,
+        model_cache_dir: Path | None = None,
+        share_weights: bool = False,
+    ):
         """
         Initialize object detector.
 
         Args:
             model_path: Path to the ONNX model file.
-            input_size: Input size for the model (default: 640).
+            input_size: Input size for the model (default: 640). Ignored for
+                models with a fixed input shape, which is used as-is.
+            reuse_buffers: Letterbox and preprocess into per-thread reusable
+                buffers instead of allocating new arrays for every frame.
+            session_options: ONNX Runtime session options (default: all graph
+                optimizations, half the CPU cores for intra-op threads).
+            providers: Execution providers in order of preference
+                (default: CPU only).
+            concurrent: Run inference from several threads at once through
+                per-thread IO bindings instead of serializing on a lock.
+                Outputs then live in per-thread buffers that are overwritten
+                by the thread's next call.
+            model_cache_dir: Directory to cache the optimized model in, so later
+                starts skip graph optimization (default: no caching).
+            share_weights: Use process-wide shared copies of the model weights.
 
         Raises:
             ValueError: If parameters are invalid.
@@ -66,6 +239,9 @@ class YoloObjectDetector(ObjectDetector):
         """
         self._lock = threading.Lock()
         self._closed = False
+        self._reuse_buffers = reuse_buffers
+        self._concurrent = concurrent
+        self._thread_buffers = threading.local()
 
         # Validate input_size
         if not isinstance(input_size, int) or input_size <= 0:
@@ -79,22 +255,22 @@ class YoloObjectDetector(ObjectDetector):
             )
 
         self.input_size = input_size
+        self.input_shape: tuple[int, int] = (input_size, input_size)  # (w, h)
 
         # Validate model path
         self._validate_model_path(model_path)
 
         # Initialize ONNX session
         try:
-            sess_opts = ort.SessionOptions()
-            sess_opts.graph_optimization_level = (
-                ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-            )
-            sess_opts.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
-
-            self.session = ort.InferenceSession(
-                str(model_path),
-                sess_options=sess_opts,
-                providers=["CPUExecutionProvider"],
+            if session_options is None:
+                session_options = build_session_options()
+
+            self.session = create_session(
+                Path(model_path),
+                session_options,
+                providers or [CPU_PROVIDER],
+                model_cache_dir,
+                share_weights,
             )
 
             self.input_name = self.session.get_inputs()[0].name
@@ -102,7 +278,28 @@ class YoloObjectDetector(ObjectDetector):
             # Validate model input shape
             self._validate_model_input()
 
-            logger.info(f"Object Detector initialized with model: {model_path}")
+            # Use the model's own input shape when it is fixed
+            height, width = self.session.get_inputs()[0].shape[2:4]
+            if isinstance(height, int) and isinstance(width, int):
+                self.input_shape = (width, height)
+
+            # Pruned heads output final (batch, x0, y0, x1, y1, score) rows
+            self.in_graph_nms = len(self.session.get_outputs()[0].shape) == 2
+            metadata = self.session.get_modelmeta().custom_metadata_map
+            self._nms_class_id = int(
+                metadata.get(NMS_CLASS_ID_METADATA_KEY, ESSENTIAL_CLASSES[0])
+            )
+            if self.in_graph_nms:
+                logger.info(
+                    "Model has in-graph NMS for class %d; "
+                    "host-side postprocessing is skipped",
+                    self._nms_class_id,
+                )
+
+            logger.info(
+                f"Object Detector initialized with model: {model_path} "
+                f"(providers: {', '.join(self.session.get_providers())})"
+            )
 
         except Exception as e:
             logger.error(f"Failed to initialize ONNX session: {e}")
@@ -114,7 +311,8 @@ class YoloObjectDetector(ObjectDetector):
         normalize: bool = True,
         conf_threshold: float = 0.3,
         iou_threshold: float = 0.5,
-    ) -> list[ObjectDetection]:
+        input_size: int | None = None,
+    ) -> Detections:
         """
         Detect objects in an image.
 
@@ -123,6 +321,8 @@ class YoloObjectDetector(ObjectDetector):
             normalize: Whether to normalize bounding boxes to 0-1 range.
             conf_threshold: Confidence threshold for object detection.
             iou_threshold: Intersection over union threshold for object detection.
+            input_size: Override of the model input size. Only honored by
+                models exported with dynamic spatial dimensions.
 
         Returns:
             List of detected objects.
@@ -131,24 +331,13 @@ class YoloObjectDetector(ObjectDetector):
             raise RuntimeError("Object detector has been closed")
 
         try:
-            orig_shape = img.shape[:2]
-
-            img_lb, ratio, pad = letterbox(img, self.input_size)
-
-            tensor = self._preprocess(img_lb)
-
-            with self._lock:
-                outputs = self.session.run(None, {self.input_name: tensor})
+            tensor, orig_shape, ratio, pad = self.prepare(img, input_size)
 
-            # Validate outputs
-            if not outputs or len(outputs) == 0:
-                logger.warning("Model returned empty output")
-                return []
+            output = self.infer(tensor)
+            if output is None:
+                return Detections.empty()
 
-            output = outputs[0]
-            assert isinstance(output, np.ndarray)
-
-            results = self._postprocess(
+            results = self.finalize(
                 output,
                 orig_shape,
                 ratio,
@@ -165,6 +354,152 @@ class YoloObjectDetector(ObjectDetector):
             logger.error(f"Detection failed: {e}", exc_info=True)
             raise RuntimeError(f"Inference failed: {e}") from e
 
+    @property
+    def supports_dynamic_batch(self) -> bool:
+        """Whether the loaded model accepts more than one image per run."""
+        if self._closed or self.session is None:
+            return False
+        batch_dim = self.session.get_inputs()[0].shape[0]
+        return not isinstance(batch_dim, int) or batch_dim != 1
+
+    @property
+    def supports_dynamic_shape(self) -> bool:
+        """Whether the loaded model accepts input sizes other than input_size."""
+        if self._closed or self.session is None:
+            return False
+        height, width = self.session.get_inputs()[0].shape[2:4]
+        return not isinstance(height, int) or not isinstance(width, int)
+
+    def prepare(
+        self, img: np.ndarray, input_size: int | None = None
+    ) -> tuple[np.ndarray, tuple[int, int], float, tuple[int, int]]:
+        """
+        Letterbox and preprocess a BGR image into a model input tensor.
+
+        Args:
+            img: BGR image.
+            input_size: Override of the model input size (dynamic-shape models only).
+
+        Returns:
+            tensor: Input tensor with a batch dimension of 1. When buffers are
+                reused, the tensor belongs to the calling thread and is only
+                valid until its next call.
+            orig_shape: Original (height, width) of the image.
+            ratio: Letterbox scaling factor.
+            pad: Letterbox (pad_left, pad_top).
+        """
+        target: int | tuple[int, int] = self.input_shape
+        if input_size is not None and self.supports_dynamic_shape:
+            target = input_size
+
+        orig_shape = img.shape[:2]
+
+        if not self._reuse_buffers:
+            img_lb, ratio, pad = letterbox(img, target)
+            return self._preprocess(img_lb), orig_shape, ratio, pad
+
+        arena = self._arena()
+        arena.count_frame()
+        canvas, ratio, pad = letterbox_into(arena, img, target)
+        return to_input_tensor(arena, canvas), orig_shape, ratio, pad
+
+    def _arena(self) -> BufferArena:
+        """
+        Return the calling thread's preprocessing buffers.
+        """
+        arena = getattr(self._thread_buffers, "arena", None)
+        if arena is None:
+            arena = BufferArena("detector")
+            self._thread_buffers.arena = arena
+        return arena
+
+    def infer(self, tensor: np.ndarray) -> np.ndarray | None:
+        """
+        Run the model on a (possibly batched) input tensor.
+
+        Returns:
+            Raw model output, or None if the model returned nothing.
+        """
+        session = self.session
+        if self._closed or session is None:
+            raise RuntimeError("Object detector has been closed")
+
+        if self._concurrent:
+            return self._infer_bound(session, tensor)
+
+        with self._lock:
+            outputs = session.run(None, {self.input_name: tensor})
+
+        # Validate outputs
+        if not outputs or len(outputs) == 0:
+            logger.warning("Model returned empty output")
+            return None
+
+        output = outputs[0]
+        assert isinstance(output, np.ndarray)
+        return output
+
+    def _infer_bound(
+        self, session: ort.InferenceSession, tensor: np.ndarray
+    ) -> np.ndarray:
+        """
+        Run the model without the session lock, through the calling thread's
+        IO binding.
+
+        The input is bound in place, and fixed-layout outputs are written into
+        a preallocated per-thread buffer, so nothing is allocated per call.
+        """
+        tensor = np.ascontiguousarray(tensor, dtype=np.float32)
+
+        bindings = getattr(self._thread_buffers, "bindings", None)
+        if bindings is None:
+            bindings = self._thread_buffers.bindings = {}
+
+        bound = bindings.get(tensor.shape)
+        if bound is None:
+            bound = bindings[tensor.shape] = _ThreadBinding(session)
+
+        return bound.run(self.input_name, tensor, dynamic_output=self.in_graph_nms)
+
+    def finalize(
+        self,
+        output: np.ndarray,
+        orig_shape: tuple[int, int],
+        ratio: float,
+        pad: tuple[int, int],
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        normalize: bool = True,
+    ) -> Detections:
+        """
+        Convert the raw output of a single image into detections.
+
+        For models with in-graph NMS, only the letterbox is undone; the IoU
+        threshold baked in at export time applies.
+        """
+        if self.in_graph_nms:
+            return self._map_nms_output(
+                output, orig_shape, ratio, pad, conf_threshold, normalize
+            )
+
+        return self._postprocess(
+            output,
+            orig_shape,
+            ratio,
+            pad,
+            conf_threshold,
+            iou_threshold,
+            normalize,
+        )
+
+    def split_output(self, output: np.ndarray, batch_size: int) -> list[np.ndarray]:
+        """
+        Split the raw output of a batched run into per-image outputs.
+        """
+        if self.in_graph_nms:
+            return [output[output[:, 0] == i] for i in range(batch_size)]
+        return [output[i : i + 1] for i in range(batch_size)]
+
     def close(self) -> None:
         """
         Release underlying resources.
@@ -201,137 +536,139 @@ class YoloObjectDetector(ObjectDetector):
         conf_thres: float,
         iou_thres: float,
         normalize: bool = False,
-    ) -> list[ObjectDetection]:
+    ) -> Detections:
         """
-        Post process raw YOLOv8 ONNX output to a list of ObjectDetection.
+        Post process raw YOLOv8 ONNX output to array-backed detections.
+
+        Anchors are pre-thresholded on the essential-class score rows, so the
+        full (4 + classes) x anchors output is never transposed or copied.
         """
         try:
-            output = np.squeeze(output).T
-
-            boxes = output[:, :4]
-            scores = output[:, 4:]
+            preds = output[0] if output.ndim == 3 else output  # (4 + classes, anchors)
 
-            class_ids = scores.argmax(axis=1)
-            confidences = scores[np.arange(scores.shape[0]), class_ids]
-
-            # Filter by confidence & essential classes
-            boxes, confidences, class_ids = (
-                YoloObjectDetector._filter_confidence_and_classes(
-                    boxes, confidences, class_ids, conf_thres
-                )
+            # Pre-threshold on the essential-class rows only
+            score_rows = (
+                preds[[4 + c for c in ESSENTIAL_CLASSES]]
+                if ESSENTIAL_CLASSES
+                else preds[4:]
             )
-            if boxes.size == 0:
-                return []
+            candidates = np.flatnonzero(score_rows.max(axis=0) >= conf_thres)
+            if candidates.size == 0:
+                return Detections.empty()
+
+            # Keep anchors whose best class overall is an essential class
+            scores = preds[4:, candidates]
+            class_ids = scores.argmax(axis=0)
+            confidences = scores[class_ids, np.arange(candidates.size)]
+            if ESSENTIAL_CLASSES:
+                mask = np.isin(class_ids, ESSENTIAL_CLASSES)
+                candidates = candidates[mask]
+                class_ids, confidences = class_ids[mask], confidences[mask]
+                if candidates.size == 0:
+                    return Detections.empty()
+
+            # Bound the NMS work on very low thresholds
+            if candidates.size > MAX_NMS_CANDIDATES:
+                top = np.argpartition(-confidences, MAX_NMS_CANDIDATES)[
+                    :MAX_NMS_CANDIDATES
+                ]
+                candidates, class_ids, confidences = (
+                    candidates[top],
+                    class_ids[top],
+                    confidences[top],
+                )
 
             # Convert xywh -> xyxy
-            boxes = YoloObjectDetector._xywh_to_xyxy(boxes)
+            xywh = preds[:4, candidates].T
+            half_wh = xywh[:, 2:] / 2
+            boxes = np.concatenate((xywh[:, :2] - half_wh, xywh[:, :2] + half_wh), 1)
 
             # Undo letterbox
+            boxes -= (pad[0], pad[1], pad[0], pad[1])
             boxes /= ratio
-            boxes[:, [0, 2]] -= pad[0]
-            boxes[:, [1, 3]] -= pad[1]
 
             # Clip / normalize
             h, w = orig_shape
             if normalize:
-                boxes[:, [0, 2]] /= w
-                boxes[:, [1, 3]] /= h
+                boxes /= (w, h, w, h)
             else:
-                boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
-                boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+                np.clip(boxes, 0, (w, h, w, h), out=boxes)
 
-            # Apply class-aware NMS
-            keep_idxs = YoloObjectDetector._apply_nms(
-                boxes, confidences, class_ids, conf_thres, iou_thres
-            )
-            boxes = boxes[keep_idxs]
-            confidences = confidences[keep_idxs]
-            class_ids = class_ids[keep_idxs]
-
-            # Convert to ObjectDetection
-            return YoloObjectDetector._to_object_detections(
-                boxes, confidences, class_ids
+            keep = YoloObjectDetector._apply_nms(
+                boxes, confidences, class_ids, iou_thres
             )
+            return Detections(boxes[keep], confidences[keep], class_ids[keep])
 
         except Exception as e:
             logger.error(f"Postprocessing failed: {e}")
             raise RuntimeError(f"Failed to postprocess output: {e}") from e
 
-    @staticmethod
-    def _filter_confidence_and_classes(
-        boxes: np.ndarray,
-        confidences: np.ndarray,
-        class_ids: np.ndarray,
+    def _map_nms_output(
+        self,
+        output: np.ndarray,
+        orig_shape: tuple[int, int],
+        ratio: float,
+        pad: tuple[int, int],
         conf_thres: float,
-    ):
-        """Filter boxes by confidence and essential classes."""
-        mask = confidences >= conf_thres
-        boxes, confidences, class_ids = boxes[mask], confidences[mask], class_ids[mask]
-
-        if ESSENTIAL_CLASSES:
-            class_mask = np.isin(class_ids, ESSENTIAL_CLASSES)
-            boxes, confidences, class_ids = (
-                boxes[class_mask],
-                confidences[class_mask],
-                class_ids[class_mask],
-            )
-
-        return boxes, confidences, class_ids
+        normalize: bool,
+    ) -> Detections:
+        """
+        Map the rows of an in-graph NMS output back to the original image.
+        """
+        rows = output[output[:, 5] >= conf_thres]
 
-    @staticmethod
-    def _xywh_to_xyxy(boxes: np.ndarray) -> np.ndarray:
-        """Convert bounding boxes from xywh to xyxy format."""
-        boxes_copy = boxes.copy()
-        boxes_copy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2
-        boxes_copy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2
-        boxes_copy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2
-        boxes_copy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2
-        return boxes_copy
+        boxes = rows[:, 1:5] - (pad[0], pad[1], pad[0], pad[1])
+        boxes /= ratio
 
-    @staticmethod
-    def _apply_nms(boxes, confidences, class_ids, conf_thres, iou_thres):
-        """Apply Non-Max Suppression (NMS) to boxes
-        to remove duplicate or overlapping bounding boxes for the same object."""
-        if len(boxes) == 0:
-            return np.array([], dtype=np.int32)
+        h, w = orig_shape
+        if normalize:
+            boxes /= (w, h, w, h)
+        else:
+            np.clip(boxes, 0, (w, h, w, h), out=boxes)
 
-        keep_idxs = []
-        unique_classes = np.unique(class_ids)
+        class_ids = np.full(len(rows), self._nms_class_id, dtype=np.intp)
+        return Detections(boxes, rows[:, 5], class_ids)
 
-        for cls in unique_classes:
-            cls_mask = class_ids == cls
-            cls_indices = np.flatnonzero(cls_mask)
-            cls_boxes = boxes[cls_mask]
-            cls_scores = confidences[cls_mask]
-
-            try:
-                keep = cv2.dnn.NMSBoxes(
-                    cls_boxes.tolist(),
-                    cls_scores.tolist(),
-                    conf_thres,
-                    iou_thres,
-                )
+    @staticmethod
+    def _apply_nms(
+        boxes: np.ndarray,
+        confidences: np.ndarray,
+        class_ids: np.ndarray,
+        iou_thres: float,
+    ) -> np.ndarray:
+        """Apply class-aware Non-Max Suppression (NMS) to xyxy boxes
+        to remove duplicate or overlapping bounding boxes for the same object.
 
-                if len(keep) > 0:
-                    keep_flat = np.array(keep).flatten()
-                    keep_idxs.extend(cls_indices[keep_flat])
-            except Exception as e:
-                logger.warning(f"NMS failed for class {cls}: {e}")
-                continue
+        Boxes are shifted apart by class, so a single greedy pass never
+        suppresses boxes of different classes.
+        """
+        if len(boxes) == 0:
+            return np.array([], dtype=np.intp)
+
+        span = float(boxes.max() - boxes.min()) + 1.0
+        offset = boxes + (class_ids * span)[:, None]
+        x0, y0, x1, y1 = offset.T
+        areas = (x1 - x0).clip(0) * (y1 - y0).clip(0)
+
+        order = confidences.argsort()[::-1]
+        keep = []
+        while order.size > 0:
+            i = order[0]
+            keep.append(i)
+            rest = order[1:]
+
+            inter_w = (np.minimum(x1[i], x1[rest]) - np.maximum(x0[i], x0[rest])).clip(
+                0
+            )
+            inter_h = (np.minimum(y1[i], y1[rest]) - np.maximum(y0[i], y0[rest])).clip(
+                0
+            )
+            inter = inter_w * inter_h
+            iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
 
-        return np.array(keep_idxs, dtype=np.int32)
+            order = rest[iou <= iou_thres]
 
-    @staticmethod
-    def _to_object_detections(boxes, confidences, class_ids):
-        """Convert raw output to list of ObjectDetection."""
-        return [
-            ObjectDetection(
-                bbox=boxes[i].tolist(),
-                conf=float(confidences[i]),
-                class_id=int(class_ids[i]),
-            )
-            for i in range(len(boxes))
-        ]
+        return np.array(keep, dtype=np.intp)
 
     @staticmethod
     def _validate_model_path(model_path: Path) -> None:
@@ -376,8 +713,97 @@ class YoloObjectDetector(ObjectDetector):
             logger.error(f"Failed to validate model input: {e}")
 
 
-def create_object_detector(implementation: type[ObjectDetector]) -> ObjectDetector:
+class ShapeMatchedObjectDetector(ObjectDetector):
+    """
+    Routes each frame to the detector whose input shape fits it best.
+
+    Detectors exported at several input sizes (including non-square ones such
+    as 480x288 for 16:9 frames) avoid upsampling the downscaled pipeline
+    frames and spending compute on padding.
+    """
+
+    def __init__(self, variants: list[tuple[tuple[int, int], ObjectDetector]]):
+        """
+        Args:
+            variants: (input (width, height), detector) pairs.
+
+        Raises:
+            ValueError: If no variants are given.
+        """
+        if not variants:
+            raise ValueError("At least one detector variant is required.")
+        self._variants = variants
+
+    @property
+    def variants(self) -> list[tuple[tuple[int, int], ObjectDetector]]:
+        return list(self._variants)
+
+    def select(self, img_shape: tuple[int, ...]) -> ObjectDetector:
+        """
+        Pick the variant that avoids upsampling with the least padding.
+        """
+
+        def cost(variant: tuple[tuple[int, int], ObjectDetector]):
+            upsampled, padding = letterbox_cost(img_shape, variant[0])
+            width, height = variant[0]
+            return upsampled, padding, width * height
+
+        return min(self._variants, key=cost)[1]
+
+    def detect(
+        self,
+        img: np.ndarray,
+        normalize: bool = True,
+        conf_threshold: float = 0.3,
+        iou_threshold: float = 0.5,
+        input_size: int | None = None,
+    ) -> Sequence[ObjectDetection]:
+        return self.select(img.shape).detect(
+            img, normalize, conf_threshold, iou_threshold, input_size
+        )
+
+    def close(self) -> None:
+        for _, detector in self._variants:
+            detector.close()
+
+
+def resolve_model_path(
+    precision: str,
+    input_shape: tuple[int, int] | None = None,
+    phone_head: bool = False,
+) -> Path:
+    """
+    Return the detector model path for a precision ("fp32" or "int8") and,
+    optionally, a fixed (width, height) input shape and the pruned
+    phone-only head with in-graph NMS.
+    """
+    if precision not in ("fp32", "int8"):
+        raise ValueError(f"Unsupported detector precision: {precision}")
+
+    path = MODEL_PATH
+    if input_shape is not None:
+        width, height = input_shape
+        path = path.with_name(f"{path.stem}_{width}x{height}{path.suffix}")
+
+    if precision == "int8":
+        path = path.with_name(f"{path.stem}.int8{path.suffix}")
+    if phone_head:
+        path = path.with_name(f"{path.stem}.phone_nms{path.suffix}")
+    return path
+
+
+def parse_input_shape(value: str) -> tuple[int, int]:
+    """
+    Parse an input shape such as "480x288" (width x height) or "640".
+    """
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def create_object_detector(
+    implementation: type[ObjectDetector], **kwargs
+) -> ObjectDetector:
     """
     Factory method to create a object detector.
     """
-    return implementation()
+    return implementation(**kwargs)
@@ -0,0 +1,447 @@
+"""
+ONNX Runtime face landmarker backend.
+
+Runs a BlazeFace short-range face detector and a face-mesh model with iris
+refinement (478 landmarks, the MediaPipe Face Landmarker v2 layout) on ONNX
+Runtime. The models are shared by all streams and accept crops from several
+streams in one call; per-stream tracking state lives in OnnxFaceLandmarker.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from pathlib import Path
+from typing import Sequence
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+from app.services.face_landmarker import FaceLandmark2D, FaceLandmarker
+from app.services.utils.image_utils import letterbox
+from app.services.utils.ort_session import (
+    CPU_PROVIDER,
+    build_session_options,
+    copy_session_options,
+    create_session,
+)
+
+logger = logging.getLogger(__name__)
+
+# Paths to the model files
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FACE_DETECTOR_PATH = PROJECT_ROOT / "assets" / "models" / "face_detector.onnx"
+FACE_MESH_PATH = PROJECT_ROOT / "assets" / "models" / "face_landmarks_detector.onnx"
+
+NUM_LANDMARKS = 478
+DETECTOR_INPUT_SIZE = 128
+MESH_INPUT_SIZE = 256
+
+# Crop enlargement around the face, as in MediaPipe's face mesh graph
+ROI_SCALE = 1.5
+
+# Landmarks defining the face rotation when tracking (outer eye corners)
+ROTATION_LANDMARKS = (33, 263)
+
+# (center x, center y, side length) in pixels and rotation in radians
+FaceRoi = tuple[float, float, float, float]
+
+
+def _ssd_anchors() -> np.ndarray:
+    """
+    Anchor centers of the BlazeFace short-range model (896, 2), normalized.
+    """
+    anchors = []
+    for stride, per_cell in ((8, 2), (16, 6)):
+        grid = DETECTOR_INPUT_SIZE // stride
+        ys, xs = np.mgrid[0:grid, 0:grid]
+        centers = np.stack(((xs + 0.5) / grid, (ys + 0.5) / grid), axis=-1)
+        anchors.append(np.repeat(centers.reshape(-1, 2), per_cell, axis=0))
+    return np.concatenate(anchors).astype(np.float32)
+
+
+def _rotation(start: np.ndarray, end: np.ndarray) -> float:
+    """
+    Rotation that brings the start -> end vector to horizontal.
+    """
+    return -math.atan2(-(end[1] - start[1]), end[0] - start[0])
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -100, 100)))
+
+
+class _OnnxModel:
+    """
+    ONNX Runtime session with layout and batching information.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        session_options: ort.SessionOptions,
+        providers: list[str],
+        share_weights: bool = False,
+    ):
+        self.session = create_session(
+            model_path, session_options, providers, share_weights=share_weights
+        )
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.channels_first = model_input.shape[1] == 3
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+
+    def run(self, batch: np.ndarray) -> list[np.ndarray]:
+        """
+        Run on an NHWC float32 batch, one call if the model allows it.
+        """
+        if self.channels_first:
+            batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+
+        if self.dynamic_batch or len(batch) == 1:
+            return self.session.run(None, {self.input_name: batch})
+
+        runs = [self.session.run(None, {self.input_name: item[None]}) for item in batch]
+        return [np.concatenate(outputs) for outputs in zip(*runs)]
+
+
+class OnnxFaceMeshModels:
+    """
+    Face detector and face-mesh models shared by all streams.
+    Thread-safe; ONNX Runtime sessions can be called concurrently.
+    """
+
+    def __init__(
+        self,
+        detector_path: Path = FACE_DETECTOR_PATH,
+        mesh_path: Path = FACE_MESH_PATH,
+        session_options: ort.SessionOptions | None = None,
+        providers: list[str] | None = None,
+        min_face_detection_confidence: float = 0.3,
+        min_face_presence_confidence: float = 0.3,
+        share_weights: bool = False,
+    ):
+        """
+        Args:
+            detector_path: BlazeFace short-range face detector model.
+            mesh_path: Face-mesh model with iris refinement (478 landmarks).
+            session_options: ONNX Runtime session options for both models.
+            providers: Execution providers in order of preference.
+            min_face_detection_confidence: Minimum face detector score.
+            min_face_presence_confidence: Minimum face-mesh presence score;
+                below it tracking is dropped and the detector runs again.
+            share_weights: Use process-wide shared copies of the model weights.
+
+        Raises:
+            RuntimeError: If model loading fails or the mesh model does not
+                produce 478 landmarks.
+        """
+        self.min_face_detection_confidence = min_face_detection_confidence
+        self.min_face_presence_confidence = min_face_presence_confidence
+        self._anchors = _ssd_anchors()
+
+        try:
+            providers = providers or [CPU_PROVIDER]
+            session_options = session_options or build_session_options()
+            # Each model gets its own options, which hold its shared weights
+            self._detector = _OnnxModel(
+                detector_path,
+                copy_session_options(session_options),
+                providers,
+                share_weights,
+            )
+            self._mesh = _OnnxModel(
+                mesh_path,
+                copy_session_options(session_options),
+                providers,
+                share_weights,
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize ONNX face landmarker: {e}")
+            raise RuntimeError(f"Failed to load face landmarker models: {e}") from e
+
+        # Tell the landmark and presence outputs apart by their size
+        self._landmarks_output = self._presence_output = None
+        for i, output in enumerate(self._mesh.session.get_outputs()):
+            size = math.prod(d for d in output.shape[1:] if isinstance(d, int))
+            if size == NUM_LANDMARKS * 3:
+                self._landmarks_output = i
+            elif size == 1 and self._presence_output is None:
+                self._presence_output = i
+
+        if self._landmarks_output is None:
+            raise RuntimeError(
+                f"Face mesh model {mesh_path} does not output {NUM_LANDMARKS} landmarks"
+            )
+
+        logger.info(
+            "ONNX face landmarker initialized with models: %s, %s",
+            detector_path.name,
+            mesh_path.name,
+        )
+
+    def detect_faces(self, imgs: Sequence[np.ndarray]) -> list[FaceRoi | None]:
+        """
+        Find the most confident face in each BGR image and return its crop region.
+        """
+        batch = np.empty(
+            (len(imgs), DETECTOR_INPUT_SIZE, DETECTOR_INPUT_SIZE, 3), dtype=np.float32
+        )
+        letterboxes = []
+        for i, img in enumerate(imgs):
+            img_lb, scale, pad = letterbox(img, DETECTOR_INPUT_SIZE, color=(0, 0, 0))
+            cv2.cvtColor(img_lb, cv2.COLOR_BGR2RGB, dst=img_lb)
+            np.multiply(img_lb, 2.0 / 255.0, out=batch[i], casting="unsafe")
+            batch[i] -= 1.0  # [-1, 1]
+            letterboxes.append((scale, pad))
+
+        regressors, scores = self._split_detector_outputs(self._detector.run(batch))
+
+        rois: list[FaceRoi | None] = []
+        for i, (scale, pad) in enumerate(letterboxes):
+            face_scores = _sigmoid(scores[i])
+            best = int(face_scores.argmax())
+            if face_scores[best] < self.min_face_detection_confidence:
+                rois.append(None)
+                continue
+
+            reg = regressors[i, best] / DETECTOR_INPUT_SIZE
+            anchor = self._anchors[best]
+            points = np.vstack((anchor + reg[0:2], anchor + reg[4:16].reshape(6, 2)))
+
+            # Letterboxed, normalized -> original image pixels
+            points = (points * DETECTOR_INPUT_SIZE - pad) / scale
+            width, height = reg[2:4] * DETECTOR_INPUT_SIZE / scale
+
+            center, right_eye, left_eye = points[0], points[1], points[2]
+            rois.append(
+                (
+                    float(center[0]),
+                    float(center[1]),
+                    float(max(width, height) * ROI_SCALE),
+                    _rotation(right_eye, left_eye),
+                )
+            )
+        return rois
+
+    def landmarks(
+        self, imgs: Sequence[np.ndarray], rois: Sequence[FaceRoi]
+    ) -> list[np.ndarray | None]:
+        """
+        Run the face-mesh model on the face region of each BGR image.
+
+        Returns:
+            (478, 2) normalized landmarks per image, or None where no face is present.
+        """
+        batch = np.empty(
+            (len(imgs), MESH_INPUT_SIZE, MESH_INPUT_SIZE, 3), dtype=np.float32
+        )
+        inverses = []
+        for i, (img, roi) in enumerate(zip(imgs, rois)):
+            crop, inverse = self._crop(img, roi)
+            np.multiply(crop, 1.0 / 255.0, out=batch[i], casting="unsafe")
+            inverses.append(inverse)
+
+        outputs = self._mesh.run(batch)
+        coords = outputs[self._landmarks_output].reshape(len(imgs), NUM_LANDMARKS, 3)
+        presence = (
+            _sigmoid(outputs[self._presence_output].reshape(len(imgs)))
+            if self._presence_output is not None
+            else np.ones(len(imgs))
+        )
+
+        results: list[np.ndarray | None] = []
+        for i, (img, inverse) in enumerate(zip(imgs, inverses)):
+            if presence[i] < self.min_face_presence_confidence:
+                results.append(None)
+                continue
+            h, w = img.shape[:2]
+            points = coords[i, :, :2] @ inverse[:, :2].T + inverse[:, 2]
+            results.append(points / (w, h))
+        return results
+
+    def detect_batch(
+        self,
+        imgs: Sequence[np.ndarray],
+        rois: Sequence[FaceRoi | None] | None = None,
+    ) -> tuple[list[np.ndarray | None], list[FaceRoi | None]]:
+        """
+        Landmark one face per image, for images from any number of streams.
+
+        Args:
+            imgs: BGR images.
+            rois: Face regions tracked from each stream's previous frame; the
+                face detector only runs for images without one.
+
+        Returns:
+            (478, 2) normalized landmarks per image (None if no face), and the
+            regions to track on each stream's next frame.
+        """
+        rois = list(rois) if rois is not None else [None] * len(imgs)
+
+        missing = [i for i, roi in enumerate(rois) if roi is None]
+        if missing:
+            for i, roi in zip(missing, self.detect_faces([imgs[i] for i in missing])):
+                rois[i] = roi
+
+        found = [i for i, roi in enumerate(rois) if roi is not None]
+        results: list[np.ndarray | None] = [None] * len(imgs)
+        next_rois: list[FaceRoi | None] = [None] * len(imgs)
+        if not found:
+            return results, next_rois
+
+        landmarks = self.landmarks([imgs[i] for i in found], [rois[i] for i in found])
+        for i, points in zip(found, landmarks):
+            results[i] = points
+            if points is not None:
+                h, w = imgs[i].shape[:2]
+                next_rois[i] = self._roi_from_landmarks(points * (w, h))
+        return results, next_rois
+
+    def close(self) -> None:
+        """
+        Release the sessions. Safe to call multiple times.
+        """
+        self._detector = self._mesh = None  # type: ignore[assignment]
+        logger.info("ONNX face landmarker closed")
+
+    @staticmethod
+    def _split_detector_outputs(
+        outputs: list[np.ndarray],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return (batch, anchors, 16) box regressors and (batch, anchors) scores.
+        """
+        regressors = next(o for o in outputs if o.shape[-1] == 16)
+        scores = next(o for o in outputs if o.shape[-1] == 1)
+        return regressors, scores[..., 0]
+
+    @staticmethod
+    def _roi_from_landmarks(points: np.ndarray) -> FaceRoi:
+        """
+        Crop region for the next frame from landmarks in pixels.
+        """
+        (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+        start, end = points[ROTATION_LANDMARKS[0]], points[ROTATION_LANDMARKS[1]]
+        return (
+            float((x0 + x1) / 2),
+            float((y0 + y1) / 2),
+            float(max(x1 - x0, y1 - y0) * ROI_SCALE),
+            _rotation(start, end),
+        )
+
+    @staticmethod
+    def _crop(img: np.ndarray, roi: FaceRoi) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cut out an upright RGB face crop.
+
+        Returns:
+            The crop and the affine transform from crop to image pixels.
+        """
+        cx, cy, size, rotation = roi
+        matrix = cv2.getRotationMatrix2D(
+            (cx, cy), math.degrees(rotation), MESH_INPUT_SIZE / max(size, 1.0)
+        )
+        matrix[:, 2] += (MESH_INPUT_SIZE / 2 - cx, MESH_INPUT_SIZE / 2 - cy)
+
+        crop = cv2.warpAffine(
+            img,
+            matrix,
+            (MESH_INPUT_SIZE, MESH_INPUT_SIZE),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+        )
+        cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=crop)
+        return crop, cv2.invertAffineTransform(matrix)
+
+
+class OnnxFaceLandmarker(FaceLandmarker):
+    """
+    Per-stream face landmarker on top of shared ONNX face-mesh models.
+
+    Like MediaPipe in video mode, the face region found on one frame is
+    tracked to the next, and the face detector only runs when tracking is lost.
+    """
+
+    def __init__(self, models: OnnxFaceMeshModels, owns_models: bool = False):
+        """
+        Args:
+            models: Shared detector and face-mesh models.
+            owns_models: Close the models when this instance is closed.
+        """
+        self.models = models
+        self._owns_models = owns_models
+        self._lock = threading.Lock()
+        self._roi: FaceRoi | None = None
+
+    def detect(
+        self,
+        img: np.ndarray,
+        timestamp_ms: int | None = None,
+    ) -> Sequence[FaceLandmark2D]:
+        """
+        Detect face landmarks in an image.
+
+        Args:
+            img: BGR image to detect landmarks in.
+            timestamp_ms: Unused; accepted for interface compatibility.
+
+        Returns:
+            List of detected face landmarks.
+        """
+        return detect_many([self], [img])[0]
+
+    def reset_clock(self) -> None:
+        """
+        Drop the tracked face region, e.g. when handed to a new stream.
+        """
+        with self._lock:
+            self._roi = None
+
+    def close(self) -> None:
+        """
+        Release underlying resources.
+        Safe to call multiple times.
+        """
+        if self._owns_models:
+            self.models.close()
+
+
+def detect_many(
+    landmarkers: Sequence[OnnxFaceLandmarker], imgs: Sequence[np.ndarray]
+) -> list[list[FaceLandmark2D]]:
+    """
+    Landmark one frame for each of several streams in a single batched call.
+
+    Args:
+        landmarkers: Per-stream landmarkers sharing the same models.
+        imgs: BGR frame of each stream.
+
+    Returns:
+        Face landmarks per stream (empty if no face).
+    """
+    if not landmarkers:
+        return []
+
+    models = landmarkers[0].models
+
+    # Lock in a fixed order so concurrent batches never deadlock
+    locked = sorted(set(landmarkers), key=id)
+    for landmarker in locked:
+        landmarker._lock.acquire()
+    try:
+        results, next_rois = models.detect_batch(
+            imgs, [landmarker._roi for landmarker in landmarkers]
+        )
+        for landmarker, roi in zip(landmarkers, next_rois):
+            landmarker._roi = roi
+    finally:
+        for landmarker in locked:
+            landmarker._lock.release()
+
+    return [
+        [] if points is None else [(float(x), float(y)) for x, y in points.tolist()]
+        for points in results
+    ]
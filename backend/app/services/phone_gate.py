@@ -0,0 +1,208 @@
+"""
+Cheap phone-presence gate in front of the full object detector.
+
+A small binary classifier (e.g. a MobileNet-class ONNX model) scores a
+low-resolution crop of the hand region, or of the lower half of the frame
+when no face is found. The full detector only runs when the gate fires,
+while a phone is being tracked, and at a periodic safety interval.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Sequence
+
+import cv2
+import numpy as np
+import onnxruntime as ort
+
+from app.services.face_landmarker import FaceLandmark2D
+from app.services.metrics.phone_usage import PHONE_CLASS_ID
+from app.services.object_detector import Detections, ObjectDetection
+from app.services.roi_detection import compute_phone_search_roi
+from app.services.utils.ort_session import CPU_PROVIDER, build_session_options
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+PHONE_GATE_MODEL_PATH = PROJECT_ROOT / "assets" / "models" / "phone_gate.onnx"
+
+# Input size used when the model has dynamic spatial dimensions
+DEFAULT_INPUT_SIZE = 96
+
+
+def _phone_probability(output: np.ndarray) -> float:
+    """
+    Read the phone probability from a classifier output.
+
+    A single value is a probability, or a logit if it falls outside [0, 1];
+    two values are (no phone, phone) logits.
+    """
+    values = np.asarray(output, dtype=np.float32).ravel()
+    if values.size >= 2:
+        exp = np.exp(values[:2] - values[:2].max())
+        return float(exp[1] / exp.sum())
+
+    value = float(values[0])
+    if 0.0 <= value <= 1.0:
+        return value
+    return float(1.0 / (1.0 + np.exp(-value)))
+
+
+class PhonePresenceClassifier:
+    """
+    Binary phone-presence classifier shared by all streams.
+    Thread-safe; ONNX Runtime sessions can be called concurrently.
+    """
+
+    def __init__(
+        self,
+        model_path: Path = PHONE_GATE_MODEL_PATH,
+        session_options: ort.SessionOptions | None = None,
+        providers: list[str] | None = None,
+    ):
+        """
+        Args:
+            model_path: ONNX classifier taking an RGB image scaled to [0, 1].
+            session_options: ONNX Runtime session options.
+            providers: Execution providers in order of preference.
+
+        Raises:
+            RuntimeError: If model loading fails.
+        """
+        try:
+            self.session = ort.InferenceSession(
+                str(model_path),
+                sess_options=session_options or build_session_options(),
+                providers=providers or [CPU_PROVIDER],
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to load phone gate model: {e}") from e
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.channels_first = model_input.shape[1] == 3
+
+        shape = model_input.shape
+        h, w = shape[2:4] if self.channels_first else shape[1:3]
+        self.input_size = (
+            w if isinstance(w, int) else DEFAULT_INPUT_SIZE,
+            h if isinstance(h, int) else DEFAULT_INPUT_SIZE,
+        )
+        logger.info(
+            "Phone gate classifier loaded: %s (%dx%d)",
+            model_path.name,
+            *self.input_size,
+        )
+
+    def score(self, img: np.ndarray, region: tuple[int, int, int, int]) -> float:
+        """
+        Return the phone probability for a region of a BGR frame.
+
+        Args:
+            img: BGR frame.
+            region: (x0, y0, x1, y1) pixel region to classify.
+        """
+        x0, y0, x1, y1 = region
+        crop = cv2.resize(
+            img[y0:y1, x0:x1], self.input_size, interpolation=cv2.INTER_AREA
+        )
+        tensor = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+        if self.channels_first:
+            tensor = tensor.transpose(2, 0, 1)
+
+        output = self.session.run(None, {self.input_name: tensor[None]})[0]
+        return _phone_probability(output)
+
+
+def gate_region(
+    face_landmarks: Sequence[FaceLandmark2D], frame_width: int, frame_height: int
+) -> tuple[int, int, int, int]:
+    """
+    Region scored by the gate: the hand region around the face if one is
+    found, otherwise the lower half of the frame.
+    """
+    roi = compute_phone_search_roi(face_landmarks, frame_width, frame_height)
+    if roi is not None:
+        return roi
+    return 0, frame_height // 2, frame_width, frame_height
+
+
+class PhoneGate:
+    """
+    Per-session decision whether the full detector runs on a frame.
+    """
+
+    def __init__(
+        self,
+        classifier: PhonePresenceClassifier,
+        threshold: float = 0.2,
+        safety_interval: int = 15,
+    ):
+        """
+        Args:
+            classifier: Shared phone-presence classifier.
+            threshold: Phone probability at which the gate fires.
+            safety_interval: Maximum number of frames between full detections.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if not (0.0 <= threshold <= 1.0):
+            raise ValueError("threshold must be in the range [0, 1].")
+        if safety_interval < 1:
+            raise ValueError("safety_interval must be at least 1.")
+
+        self.classifier = classifier
+        self.threshold = threshold
+        self.safety_interval = safety_interval
+
+        self._frames_since_detection = 0
+        self._phone_detected = False
+
+        self.gated_frames = 0
+        self.fired_frames = 0
+        self.safety_detections = 0
+        self.full_detections = 0
+
+    def should_detect(
+        self, img: np.ndarray, face_landmarks: Sequence[FaceLandmark2D]
+    ) -> bool:
+        """
+        Whether the full detector must run on this frame.
+        """
+        self._frames_since_detection += 1
+
+        # Keep detecting while a phone is in view, so sustained use is not lost
+        if self._phone_detected:
+            return True
+        if self._frames_since_detection >= self.safety_interval:
+            self.safety_detections += 1
+            return True
+
+        h, w = img.shape[:2]
+        score = self.classifier.score(img, gate_region(face_landmarks, w, h))
+        if score >= self.threshold:
+            self.fired_frames += 1
+            return True
+
+        self.gated_frames += 1
+        return False
+
+    def update(self, detections: Sequence[ObjectDetection]) -> None:
+        """
+        Record the result of a full detection.
+        """
+        self._frames_since_detection = 0
+        self.full_detections += 1
+        detections = Detections.from_sequence(detections)
+        self._phone_detected = detections.any_of(PHONE_CLASS_ID, 0.0)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "phone_gate_skipped_frames": self.gated_frames,
+            "phone_gate_fired_frames": self.fired_frames,
+            "phone_gate_safety_detections": self.safety_detections,
+            "phone_gate_full_detections": self.full_detections,
+        }
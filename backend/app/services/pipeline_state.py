@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+from app.core.config import settings
+from app.services.detection_tracker import DetectionTracker
+from app.services.detector_factory import create_phone_gate, roi_crops_supported
+from app.services.face_search import FaceSearch
+from app.services.frame_budget import FrameBudget
+from app.services.landmark_propagator import LandmarkPropagator
+from app.services.metrics.metric_manager import MetricManager
+from app.services.motion_gate import MotionGate
+from app.services.phone_gate import PhoneGate
+from app.services.roi_detection import RoiPhoneSearch
+from app.services.smoother import SequenceSmoother
+
+
+def _create_phone_search() -> Optional[RoiPhoneSearch]:
+    if not settings.detector_roi_enabled or not roi_crops_supported():
+        return None
+    return RoiPhoneSearch(
+        input_size=settings.detector_roi_input_size,
+        full_scan_interval=settings.detector_roi_full_scan_interval,
+    )
+
+
+def _create_detection_tracker() -> Optional[DetectionTracker]:
+    if settings.detector_keyframe_interval <= 1:
+        return None
+    return DetectionTracker(
+        keyframe_interval=settings.detector_keyframe_interval,
+        min_tracking_confidence=settings.detector_min_tracking_confidence,
+    )
+
+
+def _create_landmark_propagator() -> Optional[LandmarkPropagator]:
+    if settings.landmarker_keyframe_interval <= 1:
+        return None
+    return LandmarkPropagator(
+        keyframe_interval=settings.landmarker_keyframe_interval,
+        max_fb_error_px=settings.landmark_flow_max_fb_error_px,
+    )
+
+
+def _create_frame_budget() -> Optional[FrameBudget]:
+    if not settings.frame_budget_enabled:
+        return None
+    return FrameBudget(
+        budget_sec=1 / max(1, settings.target_fps),
+        detect_fraction=settings.frame_budget_detect_fraction,
+    )
+
+
+def _create_face_search() -> Optional[FaceSearch]:
+    if not settings.face_search_enabled:
+        return None
+    return FaceSearch(
+        interval=settings.face_search_interval,
+        max_width=settings.face_search_max_width,
+    )
+
+
+def _create_motion_gate() -> Optional[MotionGate]:
+    if not settings.motion_gate_enabled:
+        return None
+    return MotionGate(
+        threshold=settings.motion_gate_threshold,
+        refresh_interval=settings.motion_gate_refresh_interval,
+    )
+
+
+@dataclass
+class PipelineState:
+    """
+    Per-session state carried across processed frames.
+    """
+
+    metric_manager: MetricManager = field(default_factory=MetricManager)
+    smoother: SequenceSmoother = field(
+        default_factory=lambda: SequenceSmoother(alpha=0.8, max_missing=5)
+    )
+    frame_budget: Optional[FrameBudget] = field(default_factory=_create_frame_budget)
+    face_search: Optional[FaceSearch] = field(default_factory=_create_face_search)
+    motion_gate: Optional[MotionGate] = field(default_factory=_create_motion_gate)
+    landmark_propagator: Optional[LandmarkPropagator] = field(
+        default_factory=_create_landmark_propagator
+    )
+    phone_search: Optional[RoiPhoneSearch] = field(default_factory=_create_phone_search)
+    detection_tracker: Optional[DetectionTracker] = field(
+        default_factory=_create_detection_tracker
+    )
+    phone_gate: Optional[PhoneGate] = field(default_factory=create_phone_gate)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return per-session pipeline statistics.
+        """
+        stats: dict[str, float] = {}
+        if self.frame_budget:
+            stats.update(self.frame_budget.stats())
+        if self.face_search:
+            stats.update(self.face_search.stats())
+        if self.motion_gate:
+            stats.update(self.motion_gate.stats())
+        if self.landmark_propagator:
+            stats.update(self.landmark_propagator.stats())
+        if self.phone_search:
+            stats.update(self.phone_search.stats())
+        if self.detection_tracker:
+            stats.update(self.detection_tracker.stats())
+        if self.phone_gate:
+            stats.update(self.phone_gate.stats())
+        return stats
@@ -0,0 +1,148 @@
+"""
+Landmark-guided region-of-interest phone detection.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional, Sequence
+
+import numpy as np
+
+from app.services.face_landmarker import FaceLandmark2D
+from app.services.object_detector import Detections, ObjectDetector
+
+logger = logging.getLogger(__name__)
+
+# Search region around the face, in face widths/heights.
+# A phone is held beside the head (calls) or in front of the chest (texting).
+ROI_SIDE_FACTOR = 1.75
+ROI_ABOVE_FACTOR = 0.25
+ROI_BELOW_FACTOR = 2.0
+
+# Regions covering more than this fraction of the frame are scanned in full
+MAX_ROI_AREA_FRACTION = 0.7
+
+
+def compute_phone_search_roi(
+    face_landmarks: Sequence[FaceLandmark2D],
+    frame_width: int,
+    frame_height: int,
+) -> Optional[tuple[int, int, int, int]]:
+    """
+    Derive a phone search region from normalized face landmarks.
+
+    Args:
+        face_landmarks: Normalized (0-1) face landmarks.
+        frame_width: Frame width in pixels.
+        frame_height: Frame height in pixels.
+
+    Returns:
+        (x0, y0, x1, y1) pixel region, or None if no useful region can be derived.
+    """
+    if not face_landmarks:
+        return None
+
+    xs = [p[0] for p in face_landmarks]
+    ys = [p[1] for p in face_landmarks]
+
+    face_x0, face_x1 = min(xs) * frame_width, max(xs) * frame_width
+    face_y0, face_y1 = min(ys) * frame_height, max(ys) * frame_height
+    face_w = face_x1 - face_x0
+    face_h = face_y1 - face_y0
+    if face_w <= 1 or face_h <= 1:
+        return None
+
+    cx = (face_x0 + face_x1) / 2
+    x0 = max(0, int(cx - ROI_SIDE_FACTOR * face_w))
+    x1 = min(frame_width, int(cx + ROI_SIDE_FACTOR * face_w))
+    y0 = max(0, int(face_y0 - ROI_ABOVE_FACTOR * face_h))
+    y1 = min(frame_height, int(face_y1 + ROI_BELOW_FACTOR * face_h))
+
+    if x1 <= x0 or y1 <= y0:
+        return None
+
+    if (x1 - x0) * (y1 - y0) > MAX_ROI_AREA_FRACTION * frame_width * frame_height:
+        return None
+
+    return x0, y0, x1, y1
+
+
+def detect_in_roi(
+    object_detector: ObjectDetector,
+    img: np.ndarray,
+    roi: tuple[int, int, int, int],
+    input_size: int,
+) -> Detections:
+    """
+    Run detection on a crop and map the boxes back to normalized frame coordinates.
+    """
+    x0, y0, x1, y1 = roi
+    h, w = img.shape[:2]
+
+    crop_detections = object_detector.detect(
+        img[y0:y1, x0:x1], normalize=False, input_size=input_size
+    )
+
+    detections = Detections.from_sequence(crop_detections)
+    boxes = (detections.boxes + (x0, y0, x0, y0)) / (w, h, w, h)
+    return Detections(boxes, detections.confs, detections.class_ids)
+
+
+class RoiPhoneSearch:
+    """
+    Per-session phone detection that scans only the region around the face.
+
+    Falls back to a full-frame scan every ``full_scan_interval`` frames and
+    whenever no face is available to derive a region from.
+    """
+
+    def __init__(self, input_size: int = 320, full_scan_interval: int = 15):
+        """
+        Args:
+            input_size: Detector input size used for region crops.
+            full_scan_interval: Maximum number of frames between full-frame scans.
+
+        Raises:
+            ValueError: If parameters are invalid.
+        """
+        if input_size <= 0:
+            raise ValueError("input_size must be positive.")
+        if full_scan_interval < 1:
+            raise ValueError("full_scan_interval must be at least 1.")
+
+        self.input_size = input_size
+        self.full_scan_interval = full_scan_interval
+        self._frames_since_full_scan = 0
+        self.full_scans = 0
+        self.roi_scans = 0
+
+    def detect(
+        self,
+        object_detector: ObjectDetector,
+        img: np.ndarray,
+        face_landmarks: Sequence[FaceLandmark2D],
+    ) -> Detections:
+        """
+        Detect objects, scanning the face region when possible.
+        """
+        h, w = img.shape[:2]
+        self._frames_since_full_scan += 1
+
+        roi = None
+        if self._frames_since_full_scan < self.full_scan_interval:
+            roi = compute_phone_search_roi(face_landmarks, w, h)
+
+        if roi is None:
+            self._frames_since_full_scan = 0
+            self.full_scans += 1
+            return Detections.from_sequence(object_detector.detect(img, normalize=True))
+
+        self.roi_scans += 1
+        return detect_in_roi(object_detector, img, roi, self.input_size)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "full_scans": self.full_scans,
+            "roi_scans": self.roi_scans,
+        }
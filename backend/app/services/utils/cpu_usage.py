@@ -0,0 +1,42 @@
+"""
+Process CPU time from /proc (Linux only, falls back to the current process).
+"""
+
+import os
+import time
+from pathlib import Path
+
+
+def _child_pids() -> list[int]:
+    pids = []
+    for children in Path("/proc/self/task").glob("*/children"):
+        try:
+            pids.extend(int(pid) for pid in children.read_text().split())
+        except (OSError, ValueError):
+            continue
+    return pids
+
+
+def _proc_cpu_seconds(pid: int) -> float:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return 0.0
+    # Fields after the command name, which may contain spaces; utime and
+    # stime are fields 14 and 15 of the full line
+    fields = stat.rpartition(")")[2].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def cpu_seconds(include_children: bool = True) -> float:
+    """
+    Return the CPU time used by this process, in seconds.
+
+    Args:
+        include_children: Add the CPU time of running child processes, such as
+            inference workers.
+    """
+    total = time.process_time()
+    if include_children:
+        total += sum(_proc_cpu_seconds(pid) for pid in _child_pids())
+    return total
@@ -0,0 +1,143 @@
+"""
+Reusable preprocessing buffers.
+
+Letterboxing and tensor conversion write into buffers owned by a per-thread
+(or per-instance) arena instead of allocating new arrays on every frame.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+_registry: weakref.WeakSet[BufferArena] = weakref.WeakSet()
+_registry_lock = threading.Lock()
+
+_INV_255 = np.float32(1.0 / 255.0)
+
+
+class BufferArena:
+    """
+    Keyed set of reusable buffers with allocation accounting.
+
+    Not thread-safe; use one arena per thread or per locked instance.
+    """
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Arena group name used to aggregate statistics.
+        """
+        self.name = name
+        self._buffers: dict[object, np.ndarray] = {}
+        self.frames = 0
+        self.allocations = 0
+        self.allocated_bytes = 0
+
+        with _registry_lock:
+            _registry.add(self)
+
+    def buffer(
+        self, key: object, shape: tuple[int, ...], dtype=np.uint8
+    ) -> tuple[np.ndarray, bool]:
+        """
+        Return the buffer stored under key, allocating it if needed.
+
+        Returns:
+            The buffer and whether it was newly allocated.
+        """
+        buf = self._buffers.get(key)
+        if buf is not None and buf.shape == shape and buf.dtype == dtype:
+            return buf, False
+
+        buf = np.empty(shape, dtype=dtype)
+        self._buffers[key] = buf
+        self.allocations += 1
+        self.allocated_bytes += buf.nbytes
+        return buf, True
+
+    def count_frame(self) -> None:
+        self.frames += 1
+
+
+def letterbox_into(
+    arena: BufferArena,
+    img: np.ndarray,
+    new_size: int | tuple[int, int],
+    color: tuple[int, int, int] = (114, 114, 114),
+) -> tuple[np.ndarray, float, tuple[int, int]]:
+    """
+    Letterbox an image into a reusable canvas.
+
+    Same geometry as image_utils.letterbox, but the resize is written straight
+    into the canvas and the padding is only repainted when the layout changes.
+
+    Returns:
+        canvas: Letterboxed image (owned by the arena; valid until the next call).
+        scale: Scaling factor applied to original image.
+        pad: Tuple of (pad_left, pad_top) applied to width and height.
+    """
+    new_w, new_h = (new_size, new_size) if isinstance(new_size, int) else new_size
+
+    h, w = img.shape[:2]
+    scale = min(new_w / w, new_h / h)
+    nw, nh = int(w * scale), int(h * scale)
+    pad_left = (new_w - nw) // 2
+    pad_top = (new_h - nh) // 2
+
+    canvas, created = arena.buffer(("canvas", new_w, new_h), (new_h, new_w, 3))
+    layout, _ = arena.buffer(("layout", new_w, new_h), (4,), np.int32)
+    if created or tuple(layout) != (nw, nh, pad_left, pad_top):
+        canvas[:] = color
+        layout[:] = (nw, nh, pad_left, pad_top)
+
+    region = canvas[pad_top : pad_top + nh, pad_left : pad_left + nw]
+    if (nw, nh) == (w, h):
+        np.copyto(region, img)
+    else:
+        cv2.resize(img, (nw, nh), dst=region, interpolation=cv2.INTER_LINEAR)
+
+    return canvas, scale, (pad_left, pad_top)
+
+
+def to_input_tensor(arena: BufferArena, canvas: np.ndarray) -> np.ndarray:
+    """
+    Convert a BGR HWC uint8 image into a reusable 1x3xHxW float32 RGB tensor in [0, 1].
+
+    The channel swap, layout change and scaling happen in a single pass.
+    """
+    h, w = canvas.shape[:2]
+    tensor, _ = arena.buffer(("tensor", w, h), (1, 3, h, w), np.float32)
+    np.multiply(canvas[:, :, ::-1].transpose(2, 0, 1), _INV_255, out=tensor[0])
+    return tensor
+
+
+def arena_stats() -> dict[str, dict[str, float]]:
+    """
+    Return allocation statistics aggregated by arena name.
+    """
+    totals: dict[str, dict[str, float]] = defaultdict(
+        lambda: {"arenas": 0, "frames": 0, "allocations": 0, "allocated_bytes": 0}
+    )
+    with _registry_lock:
+        arenas = list(_registry)
+
+    for arena in arenas:
+        entry = totals[arena.name]
+        entry["arenas"] += 1
+        entry["frames"] += arena.frames
+        entry["allocations"] += arena.allocations
+        entry["allocated_bytes"] += arena.allocated_bytes
+
+    for entry in totals.values():
+        frames = entry["frames"]
+        entry["allocations_per_frame"] = (
+            entry["allocations"] / frames if frames else 0.0
+        )
+        entry["bytes_per_frame"] = entry["allocated_bytes"] / frames if frames else 0.0
+
+    return dict(totals)
@@ -4,7 +4,7 @@ import numpy as np
 
 def letterbox(
     img: np.ndarray,
-    new_size: int,
+    new_size: int | tuple[int, int],
     color: tuple[int, int, int] = (114, 114, 114),
 ) -> tuple[np.ndarray, float, tuple[int, int]]:
     """
@@ -12,7 +12,8 @@ def letterbox(
 
     Args:
         img: Input image as a NumPy array (H x W x C, BGR format).
-        new_size: Target size for the output image (square, e.g., 640).
+        new_size: Target size for the output image, either square (e.g., 640)
+                  or a (width, height) tuple (e.g., (480, 288)).
         color: Padding color as RGB tuple. Default is gray (114,114,114).
 
     Returns:
@@ -21,21 +22,28 @@ def letterbox(
         pad: Tuple of (pad_left, pad_top) applied to width and height.
     """
 
+    # Target width and height
+    new_w, new_h = (new_size, new_size) if isinstance(new_size, int) else new_size
+
     # Original image height and width
     h, w = img.shape[:2]
 
     # Compute scaling factor to fit image inside new_size while preserving aspect ratio
-    scale = min(new_size / w, new_size / h)
+    scale = min(new_w / w, new_h / h)
 
     # Compute new width and height after scaling
     nw, nh = int(w * scale), int(h * scale)
 
     # Resize image to new width and height
-    resized = cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    resized = (
+        img
+        if (nw, nh) == (w, h)
+        else cv2.resize(img, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    )
 
-    # Compute padding to make final image exactly new_size x new_size
-    pad_w = new_size - nw  # total width padding
-    pad_h = new_size - nh  # total height padding
+    # Compute padding to make final image exactly new_w x new_h
+    pad_w = new_w - nw  # total width padding
+    pad_h = new_h - nh  # total height padding
     pad_left = pad_w // 2  # pad on left side
     pad_top = pad_h // 2  # pad on top side
 
@@ -53,3 +61,24 @@ def letterbox(
 
     # Return padded image, scaling factor, and top-left padding
     return padded, scale, (pad_left, pad_top)
+
+
+def letterbox_cost(
+    img_shape: tuple[int, ...], input_shape: tuple[int, int]
+) -> tuple[bool, float]:
+    """
+    Rate how well an image fits a model input shape.
+
+    Args:
+        img_shape: Image shape (H, W, ...).
+        input_shape: Model input (width, height).
+
+    Returns:
+        Whether the image would be upsampled, and the fraction of the input
+        that would be padding.
+    """
+    h, w = img_shape[:2]
+    in_w, in_h = input_shape
+    scale = min(in_w / w, in_h / h)
+    used = int(w * scale) * int(h * scale)
+    return scale > 1.0, 1.0 - used / (in_w * in_h)
@@ -0,0 +1,45 @@
+"""
+Process memory usage from /proc (Linux only).
+"""
+
+import os
+from pathlib import Path
+
+# smaps_rollup fields reported, in kB
+_FIELDS = {
+    "Rss": "rss_mb",
+    "Pss": "pss_mb",
+    "Shared_Clean": "shared_clean_mb",
+    "Shared_Dirty": "shared_dirty_mb",
+    "Private_Clean": "private_clean_mb",
+    "Private_Dirty": "private_dirty_mb",
+}
+
+
+def process_memory(pid: int | None = None) -> dict[str, float]:
+    """
+    Return RSS, PSS and shared/private memory of a process in MB.
+
+    PSS divides shared pages between the processes sharing them, so summing
+    it over server workers gives the real footprint of the node.
+
+    Args:
+        pid: Process ID (default: the current process).
+
+    Returns:
+        Memory figures keyed by name, empty if /proc is unavailable.
+    """
+    pid = pid or os.getpid()
+    path = Path(f"/proc/{pid}/smaps_rollup")
+
+    try:
+        lines = path.read_text().splitlines()
+    except OSError:
+        return {}
+
+    usage: dict[str, float] = {"pid": pid}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if name in _FIELDS:
+            usage[_FIELDS[name]] = int(value.split()[0]) / 1024
+    return usage
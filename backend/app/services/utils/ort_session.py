@@ -0,0 +1,374 @@
+"""
+ONNX Runtime session configuration, optimized model caching and
+execution-provider selection.
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import platform
+import time
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+
+from app.services.utils.shared_weights import add_shared_initializers
+
+logger = logging.getLogger(__name__)
+
+CPU_PROVIDER = "CPUExecutionProvider"
+
+OPTIMIZATION_LEVELS = {
+    "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+    "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+    "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+    "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+}
+
+EXECUTION_MODES = {
+    "sequential": ort.ExecutionMode.ORT_SEQUENTIAL,
+    "parallel": ort.ExecutionMode.ORT_PARALLEL,
+}
+
+
+def build_session_options(
+    intra_op_threads: int = 0,
+    inter_op_threads: int = 0,
+    allow_spinning: bool = True,
+    enable_cpu_mem_arena: bool = True,
+    enable_mem_pattern: bool = True,
+    execution_mode: str = "sequential",
+    optimization_level: str = "all",
+    use_global_thread_pool: bool = False,
+) -> ort.SessionOptions:
+    """
+    Build ONNX Runtime session options.
+
+    Args:
+        intra_op_threads: Threads used inside an operator (0 = half the CPU cores).
+        inter_op_threads: Threads used across operators in parallel execution
+                          mode (0 = ONNX Runtime default).
+        allow_spinning: Let idle pool threads busy-wait for new work. Lowers
+                        latency at the cost of CPU when sessions share cores.
+        enable_cpu_mem_arena: Use the CPU memory arena allocator.
+        enable_mem_pattern: Pre-plan memory from the first run's allocation pattern.
+        execution_mode: "sequential" or "parallel".
+        optimization_level: "disable", "basic", "extended" or "all".
+        use_global_thread_pool: Run on the process-wide thread pools instead of
+                                per-session ones; the thread counts above are
+                                then ignored. The global pools must be set up
+                                before the first session is created.
+
+    Raises:
+        ValueError: If the execution mode or optimization level is unknown.
+    """
+    if execution_mode not in EXECUTION_MODES:
+        raise ValueError(f"Unsupported ORT execution mode: {execution_mode}")
+    if optimization_level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"Unsupported ORT optimization level: {optimization_level}")
+
+    sess_opts = ort.SessionOptions()
+    sess_opts.graph_optimization_level = OPTIMIZATION_LEVELS[optimization_level]
+    sess_opts.execution_mode = EXECUTION_MODES[execution_mode]
+    sess_opts.intra_op_num_threads = intra_op_threads or max(
+        1, (os.cpu_count() or 2) // 2
+    )
+    if inter_op_threads > 0:
+        sess_opts.inter_op_num_threads = inter_op_threads
+    if use_global_thread_pool:
+        sess_opts.use_per_session_threads = False
+    sess_opts.enable_cpu_mem_arena = enable_cpu_mem_arena
+    sess_opts.enable_mem_pattern = enable_mem_pattern
+
+    spinning = "1" if allow_spinning else "0"
+    sess_opts.add_session_config_entry("session.intra_op.allow_spinning", spinning)
+    sess_opts.add_session_config_entry("session.inter_op.allow_spinning", spinning)
+
+    return sess_opts
+
+
+# Session config entries set by build_session_options
+SESSION_CONFIG_KEYS = (
+    "session.intra_op.allow_spinning",
+    "session.inter_op.allow_spinning",
+)
+
+
+def copy_session_options(source: ort.SessionOptions) -> ort.SessionOptions:
+    """
+    Copy the settings of session options built by build_session_options.
+    Added initializers and the optimized model path are not copied.
+    """
+    sess_opts = ort.SessionOptions()
+    for name in (
+        "graph_optimization_level",
+        "execution_mode",
+        "intra_op_num_threads",
+        "inter_op_num_threads",
+        "use_per_session_threads",
+        "enable_cpu_mem_arena",
+        "enable_mem_pattern",
+    ):
+        setattr(sess_opts, name, getattr(source, name))
+
+    for key in SESSION_CONFIG_KEYS:
+        try:
+            value = source.get_session_config_entry(key)
+        except Exception:
+            continue
+        sess_opts.add_session_config_entry(key, value)
+
+    return sess_opts
+
+
+def resolve_providers(requested: list[str]) -> list[str]:
+    """
+    Keep the requested execution providers that are installed, in order,
+    always ending with the CPU provider as a fallback.
+    """
+    available = set(ort.get_available_providers())
+
+    providers = []
+    for provider in requested:
+        if provider in available:
+            providers.append(provider)
+        else:
+            logger.warning("ONNX Runtime provider %s is not available", provider)
+
+    if CPU_PROVIDER not in providers:
+        providers.append(CPU_PROVIDER)
+    return providers
+
+
+@functools.cache
+def cpu_features() -> str:
+    """
+    Return the CPU's instruction set extensions, from the first "flags"
+    (x86) or "Features" (ARM) line of /proc/cpuinfo. Elsewhere, fall back to
+    the processor name.
+    """
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name.strip() in ("flags", "Features"):
+                    return " ".join(sorted(value.split()))
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def model_cache_key(
+    model_path: Path, provider: str, optimization_level: ort.GraphOptimizationLevel
+) -> str:
+    """
+    Key an optimized model by the source model's content, the ONNX Runtime
+    version, the provider, the optimization level, the CPU architecture and
+    its feature flags. Fully optimized graphs can contain kernels and weight
+    layouts chosen for the instruction sets of the CPU that wrote them (e.g.
+    AVX-512 vs AVX2), so a cache on a volume shared between hosts must not
+    mix them.
+    """
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+
+    digest.update(
+        "|".join(
+            (
+                ort.__version__,
+                provider,
+                str(optimization_level),
+                platform.machine(),
+                cpu_features(),
+            )
+        ).encode()
+    )
+    return digest.hexdigest()[:16]
+
+
+def cached_model_path(
+    model_path: Path,
+    provider: str,
+    optimization_level: ort.GraphOptimizationLevel,
+    cache_dir: Path,
+) -> Path:
+    """
+    Return where the optimized version of a model is cached.
+    """
+    key = model_cache_key(model_path, provider, optimization_level)
+    return cache_dir / f"{model_path.stem}.{key}.onnx"
+
+
+def weights_shareable(optimization_level: ort.GraphOptimizationLevel) -> bool:
+    """
+    Whether sessions at this optimization level can use shared weights.
+
+    Above "extended", layout transforms (e.g. NCHWc) and weight prepacking
+    rewrite the initializers into private copies, so shared weights are kept
+    alongside those copies instead of replacing them.
+    """
+    return int(optimization_level) <= int(
+        ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+    )
+
+
+def create_session(
+    model_path: Path,
+    session_options: ort.SessionOptions,
+    providers: list[str],
+    cache_dir: Path | None = None,
+    share_weights: bool = False,
+) -> ort.InferenceSession:
+    """
+    Create an inference session, reusing a cached optimized model if available.
+
+    On a cache miss, the session is built from the source model and the
+    optimized graph is written to the cache. On a hit, the cached graph is
+    loaded with graph optimizations disabled, skipping the optimization pass.
+
+    Args:
+        model_path: Source ONNX model.
+        session_options: Session options; modified for cache writes.
+        providers: Execution providers in order of preference.
+        cache_dir: Directory of optimized models, or None to disable caching.
+        share_weights: Use process-wide shared copies of the model's weights
+                       (see shared_weights). Applied when loading a cached
+                       optimized model, or when the optimization level is at
+                       most "extended"; not applied while an optimized model
+                       is being written to the cache.
+    """
+    start = time.perf_counter()
+
+    if cache_dir is None:
+        if share_weights and not weights_shareable(
+            session_options.graph_optimization_level
+        ):
+            logger.warning(
+                "Not sharing weights of %s: optimization level %s copies them;"
+                " use ORT_GRAPH_OPTIMIZATION_LEVEL=extended or ORT_MODEL_CACHE_DIR",
+                model_path.name,
+                session_options.graph_optimization_level,
+            )
+        elif share_weights:
+            add_shared_initializers(session_options, model_path)
+        session = ort.InferenceSession(
+            str(model_path), sess_options=session_options, providers=providers
+        )
+        logger.info(
+            "Session for %s created in %.0f ms",
+            model_path.name,
+            (time.perf_counter() - start) * 1000,
+        )
+        return session
+
+    cached_path = cached_model_path(
+        model_path, providers[0], session_options.graph_optimization_level, cache_dir
+    )
+
+    if cached_path.is_file():
+        # Separate options, so a failed load leaves none of the cached
+        # model's initializers behind for the fallback
+        cached_options = copy_session_options(session_options)
+        cached_options.graph_optimization_level = (
+            ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+        )
+        try:
+            if share_weights:
+                add_shared_initializers(cached_options, cached_path)
+            session = ort.InferenceSession(
+                str(cached_path), sess_options=cached_options, providers=providers
+            )
+            logger.info(
+                "Session for %s loaded from optimized model cache in %.0f ms",
+                model_path.name,
+                (time.perf_counter() - start) * 1000,
+            )
+            return session
+        except Exception as e:
+            logger.warning("Ignoring unusable cached model %s: %s", cached_path, e)
+            cached_path.unlink(missing_ok=True)
+            return create_session(
+                model_path,
+                session_options,
+                providers,
+                cache_dir=cache_dir,
+                share_weights=share_weights,
+            )
+
+    # Write to a process-specific file first, so concurrent starts never
+    # read a partially written model
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cached_path.with_name(f"{cached_path.name}.{os.getpid()}.tmp")
+    session_options.optimized_model_filepath = str(tmp_path)
+
+    session = ort.InferenceSession(
+        str(model_path), sess_options=session_options, providers=providers
+    )
+    try:
+        os.replace(tmp_path, cached_path)
+    except OSError as e:
+        logger.warning("Could not cache optimized model %s: %s", cached_path, e)
+
+    logger.info(
+        "Session for %s optimized in %.0f ms (cached as %s)",
+        model_path.name,
+        (time.perf_counter() - start) * 1000,
+        cached_path.name,
+    )
+    return session
+
+
+def _synthetic_input(session: ort.InferenceSession) -> dict[str, np.ndarray]:
+    """
+    Build a random input for a session, using 1 / 640 for symbolic dimensions.
+    """
+    model_input = session.get_inputs()[0]
+    shape = [
+        dim if isinstance(dim, int) else (1 if i == 0 else 640)
+        for i, dim in enumerate(model_input.shape)
+    ]
+    rng = np.random.default_rng(0)
+    return {model_input.name: rng.random(shape, dtype=np.float32)}
+
+
+def benchmark_providers(
+    model_path: Path,
+    providers: list[str],
+    session_options: ort.SessionOptions,
+    runs: int = 20,
+    warmup_runs: int = 3,
+) -> dict[str, float]:
+    """
+    Time each execution provider on a synthetic frame.
+
+    Returns:
+        Mean latency in milliseconds per provider. Providers that fail to
+        load or run are left out.
+    """
+    results: dict[str, float] = {}
+
+    for provider in providers:
+        try:
+            session = ort.InferenceSession(
+                str(model_path),
+                sess_options=session_options,
+                providers=[provider],
+            )
+            feed = _synthetic_input(session)
+
+            for _ in range(warmup_runs):
+                session.run(None, feed)
+
+            start = time.perf_counter()
+            for _ in range(runs):
+                session.run(None, feed)
+            results[provider] = (time.perf_counter() - start) * 1000 / runs
+
+        except Exception as e:
+            logger.warning("Benchmark of provider %s failed: %s", provider, e)
+
+    return results
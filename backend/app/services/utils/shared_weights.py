@@ -0,0 +1,109 @@
+"""
+Model weights loaded once and shared between inference sessions.
+
+Initializers are read into NumPy arrays and handed to ONNX Runtime with
+SessionOptions.add_initializer, which uses the array memory in place. Sessions
+of models with identical tensors (e.g. the same detector exported at several
+input shapes) share one copy, and arrays loaded before the server forks its
+workers are shared copy-on-write between them.
+
+Uses the ``onnx`` package to read the model files.
+"""
+
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+# Small tensors (shapes, scalars) are not worth sharing
+MIN_SHARED_BYTES = 4096
+
+_lock = threading.Lock()
+_arrays_by_digest: dict[tuple, np.ndarray] = {}
+_values_by_model: dict[Path, dict[str, ort.OrtValue]] = {}
+
+
+def _load_initializers(model_path: Path) -> dict[str, ort.OrtValue]:
+    try:
+        import onnx
+        from onnx import numpy_helper
+    except ImportError:
+        logger.warning("Install 'onnx' to share model weights between sessions")
+        return {}
+
+    model = onnx.load(str(model_path))
+
+    values = {}
+    for initializer in model.graph.initializer:
+        array = numpy_helper.to_array(initializer)
+        if array.nbytes < MIN_SHARED_BYTES:
+            continue
+
+        array = np.ascontiguousarray(array)
+        key = (
+            array.dtype.str,
+            array.shape,
+            hashlib.blake2b(array.tobytes(), digest_size=16).digest(),
+        )
+        array = _arrays_by_digest.setdefault(key, array)
+        values[initializer.name] = ort.OrtValue.ortvalue_from_numpy(array)
+
+    return values
+
+
+def shared_initializers(model_path: Path) -> dict[str, ort.OrtValue]:
+    """
+    Return the shared initializers of a model, loading them on first use.
+
+    The returned values stay referenced here for the life of the process, as
+    ONNX Runtime requires for initializers added to a session.
+    """
+    model_path = Path(model_path).resolve()
+    with _lock:
+        values = _values_by_model.get(model_path)
+        if values is None:
+            values = _values_by_model[model_path] = _load_initializers(model_path)
+            if values:
+                logger.info(
+                    "Loaded %d shared initializers (%.1f MB) from %s",
+                    len(values),
+                    shared_bytes() / 1e6,
+                    model_path.name,
+                )
+        return values
+
+
+def add_shared_initializers(
+    session_options: ort.SessionOptions, model_path: Path
+) -> int:
+    """
+    Make a session use the shared copies of a model's initializers.
+
+    Returns:
+        Number of initializers added.
+    """
+    values = shared_initializers(model_path)
+    for name, value in values.items():
+        session_options.add_initializer(name, value)
+    return len(values)
+
+
+def preload(model_paths: list[Path]) -> None:
+    """
+    Load the shared initializers of several models, e.g. before forking.
+    """
+    for model_path in model_paths:
+        if Path(model_path).is_file():
+            shared_initializers(model_path)
+
+
+def shared_bytes() -> int:
+    """
+    Total size of the distinct shared arrays.
+    """
+    return sum(array.nbytes for array in _arrays_by_digest.values())
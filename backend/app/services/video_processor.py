@@ -4,24 +4,35 @@ import functools
 import logging
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
+from typing import Sequence
 
 import cv2
 from aiortc.mediastreams import MediaStreamError
 
 from app.core.config import settings
+from app.core.cpu_budget import get_cpu_plan
 from app.models.inference import InferenceData, Resolution
 from app.services.connection_manager import ConnectionManager
 from app.services.face_landmarker import (
+    FaceLandmark2D,
     FaceLandmarker,
     get_essential_landmarks,
 )
+from app.services.face_landmarker_pool import FaceLandmarkerPool
 from app.services.face_landmarks import ESSENTIAL_LANDMARKS
+from app.services.frame_rate_governor import get_frame_rate_governor
+from app.services.frame_scheduler import FrameScheduler, timed
+from app.services.inference_workers import get_inference_worker_pool
 from app.services.metrics.frame_context import FrameContext
-from app.services.metrics.metric_manager import MetricManager
-from app.services.object_detector import ObjectDetector
-from app.services.smoother import SequenceSmoother
+from app.services.object_detector import (
+    Detections,
+    ObjectDetection,
+    ObjectDetector,
+    detection_list,
+)
+from app.services.pipeline_state import PipelineState
 
 logger = logging.getLogger(__name__)
 
@@ -32,57 +43,248 @@ RENDER_LANDMARKS_FULL = False  # Option to render all landmarks or only essentia
 MAX_DATA_CHANNEL_BUFFER = 1_000_000  # bytes
 
 # Dedicated thread pool for CPU-bound frame processing
-executor = ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, 4))
+_cpu_plan = get_cpu_plan()
+EXECUTOR_WORKERS = (
+    _cpu_plan.executor_workers if _cpu_plan else min(os.cpu_count() or 4, 4)
+)
+executor = ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS)
 atexit.register(executor.shutdown, wait=True)
 
+# Separate pool for the detection stage of frames whose landmarking runs
+# alongside it; frame threads wait on it, so it cannot be the pool above
+stage_executor = (
+    ThreadPoolExecutor(
+        max_workers=EXECUTOR_WORKERS, thread_name_prefix="detection-stage"
+    )
+    if settings.parallel_stages_enabled
+    else None
+)
+if stage_executor:
+    atexit.register(stage_executor.shutdown, wait=True)
+
+# Fair-share, earliest-deadline-first dispatch of live frames onto the pool
+scheduler = (
+    FrameScheduler(executor, EXECUTOR_WORKERS)
+    if settings.frame_scheduler_enabled
+    else None
+)
+
+
+def resize_to_max_width(img_bgr):
+    """
+    Downscale a frame to at most MAX_WIDTH pixels wide.
+    """
+    h, w = img_bgr.shape[:2]
+    if w > MAX_WIDTH:
+        scale = MAX_WIDTH / w
+        img_bgr = cv2.resize(img_bgr, (int(w * scale), int(h * scale)))
+    return img_bgr
+
+
+def detect_landmarks(
+    img_bgr,
+    face_landmarker: FaceLandmarker,
+    state: PipelineState,
+    media_timestamp_ms: int | None = None,
+    found_landmarks: Sequence[FaceLandmark2D] | None = None,
+) -> Sequence[FaceLandmark2D]:
+    """
+    Run the face landmarker, or propagate landmarks with optical flow if enabled.
+
+    Args:
+        found_landmarks: Landmarks already found on this frame (by the face
+            search); used as the frame's landmarks instead of running the
+            landmarker again.
+    """
+    propagator = state.landmark_propagator
+    if not propagator:
+        if found_landmarks is not None:
+            return found_landmarks
+        return face_landmarker.detect(img_bgr, media_timestamp_ms)
+
+    gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+    if found_landmarks is not None:
+        face_landmarks = found_landmarks
+    else:
+        if not propagator.should_detect(gray):
+            propagated = propagator.propagate(gray)
+            if propagated is not None:
+                return propagated
+        face_landmarks = face_landmarker.detect(img_bgr, media_timestamp_ms)
+    propagator.update(gray, face_landmarks)
+    return face_landmarks
+
+
+def detect_objects(
+    img_bgr,
+    face_landmarks: Sequence[FaceLandmark2D],
+    object_detector: ObjectDetector,
+    state: PipelineState,
+) -> Sequence[ObjectDetection]:
+    """
+    Run the object detector on a frame, on the face region if enabled.
+    """
+    if state.phone_search:
+        return state.phone_search.detect(object_detector, img_bgr, face_landmarks)
+    return object_detector.detect(img_bgr, normalize=True)
+
+
+def detection_needs_landmarks(state: PipelineState) -> bool:
+    """
+    Whether object detection uses the face landmarks of the same frame.
+    """
+    return state.phone_search is not None or state.phone_gate is not None
+
+
+def detect_or_track_objects(
+    img_bgr,
+    face_landmarks: Sequence[FaceLandmark2D],
+    object_detector: ObjectDetector,
+    state: PipelineState,
+) -> Sequence[ObjectDetection]:
+    """
+    Detect objects, unless tracked boxes or the phone gate make it unnecessary.
+    """
+    tracker = state.detection_tracker
+    if tracker and not tracker.should_detect():
+        return tracker.propagate()
+
+    gate = state.phone_gate
+    if gate and not gate.should_detect(img_bgr, face_landmarks):
+        # The phone gate found nothing worth a full detection
+        object_detections: Sequence[ObjectDetection] = Detections.empty()
+    else:
+        object_detections = detect_objects(
+            img_bgr, face_landmarks, object_detector, state
+        )
+        if gate:
+            gate.update(object_detections)
+
+    if tracker:
+        tracker.update(object_detections)
+    return object_detections
+
 
 def process_video_frame(
     timestamp: str,
     img_bgr,
     face_landmarker: FaceLandmarker,
     object_detector: ObjectDetector,
-    metric_manager: MetricManager,
-    smoother: SequenceSmoother,
+    state: PipelineState,
+    media_timestamp_ms: int | None = None,
+    received_at: float | None = None,
 ) -> InferenceData:
     """
     Process a single video frame.
+
+    Args:
+        received_at: time.monotonic() when the frame was received, used as the
+            start of the frame's latency budget (default: now).
     """
+    budget = state.frame_budget
+    if budget:
+        budget.start(received_at)
 
+    # Resize if needed
+    img_bgr = resize_to_max_width(img_bgr)
     h, w = img_bgr.shape[:2]
 
-    # Resize if needed
-    if w > MAX_WIDTH:
-        scale = MAX_WIDTH / w
-        w, h = int(w * scale), int(h * scale)
-        img_bgr = cv2.resize(img_bgr, (w, h))
+    # While no face is visible, only look for one at reduced rate and resolution
+    face_search = state.face_search
+    found_landmarks = None
+    if face_search and face_search.active:
+        found_landmarks = face_search.search(
+            img_bgr, face_landmarker, media_timestamp_ms
+        )
+        if not found_landmarks:
+            return InferenceData(
+                timestamp=timestamp,
+                resolution=Resolution(width=w, height=h),
+                metrics={"face_missing": True},
+            )
+
+    # Reuse the last outputs while the scene is unchanged
+    detection_skipped = False
+    motion_gate = state.motion_gate
+    reused = (
+        motion_gate.reuse(img_bgr) if motion_gate and found_landmarks is None else None
+    )
+    if reused is not None:
+        face_landmarks, object_detections = reused
+    else:
+        detection = None
+        if stage_executor and not detection_needs_landmarks(state):
+            # Run detection alongside landmarking, joined before the metrics
+            detect = not budget or budget.allows_detection()
+            if detect:
+                detection = stage_executor.submit(
+                    detect_or_track_objects, img_bgr, [], object_detector, state
+                )
+            try:
+                face_landmarks = detect_landmarks(
+                    img_bgr, face_landmarker, state, media_timestamp_ms, found_landmarks
+                )
+            except BaseException:
+                # Don't leave detection updating the session's state while
+                # its next frame is processed
+                if detection and not detection.cancel():
+                    wait([detection])
+                raise
+        else:
+            # Detect landmarks, or propagate them from the last keyframe
+            face_landmarks = detect_landmarks(
+                img_bgr, face_landmarker, state, media_timestamp_ms, found_landmarks
+            )
+            detect = not budget or budget.allows_detection()
+
+        if budget and not detect:
+            # Too late for the detector: keep the output on time
+            object_detections = budget.carry_forward()
+            detection_skipped = True
+        else:
+            # Detect objects, or propagate boxes from the last keyframe
+            object_detections = (
+                detection.result()
+                if detection
+                else detect_or_track_objects(
+                    img_bgr, face_landmarks, object_detector, state
+                )
+            )
+            if budget:
+                budget.record_detections(object_detections)
+        if motion_gate:
+            motion_gate.update(face_landmarks, object_detections)
 
-    # Detect landmarks
-    face_landmarks = face_landmarker.detect(img_bgr)
     essential_landmarks = get_essential_landmarks(face_landmarks, ESSENTIAL_LANDMARKS)
-    smoothed_landmarks = smoother.update(essential_landmarks)
-
-    # Detect objects
-    object_detections = object_detector.detect(img_bgr, normalize=True)
+    smoothed_landmarks = state.smoother.update(essential_landmarks)
 
     # Update metrics
     frame_context = FrameContext(
         face_landmarks=face_landmarks, object_detections=object_detections
     )
-    metrics = metric_manager.update(frame_context)
+    metrics = state.metric_manager.update(frame_context)
+    if face_search:
+        face_search.update(metrics["face_missing"])
+
+    if budget:
+        budget.finish()
 
     return InferenceData(
         timestamp=timestamp,
         resolution=Resolution(width=w, height=h),
         metrics=metrics,
         face_landmarks=smoothed_landmarks,
-        object_detections=object_detections,
+        object_detections=detection_list(object_detections),
+        detection_skipped=(
+            detection_skipped if settings.frame_budget_flag_skips else None
+        ),
     )
 
 
 async def process_video_frames(
     client_id: str,
     track,
-    face_landmarker,
+    face_landmarker_pool: FaceLandmarkerPool,
     object_detector: ObjectDetector,
     connection_manager: ConnectionManager,
     stop_processing: asyncio.Event,
@@ -96,14 +298,17 @@ async def process_video_frames(
     dropped_messages = 0
     start_time = time.perf_counter()
     last_process_time = 0.0
-    metric_manager = MetricManager()
-    smoother = SequenceSmoother(alpha=0.8, max_missing=5)
+    state = PipelineState()
 
     data_channel_retries = 0
     MAX_DATA_CHANNEL_RETRIES = 10
     # Keep only the most recent frame to avoid backlog-induced latency.
     frame_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
     reader_task: asyncio.Task | None = None
+    face_landmarker: FaceLandmarker | None = None
+    worker_pool = get_inference_worker_pool()
+    reset_worker_state = False
+    governor = get_frame_rate_governor()
 
     async def _read_frames() -> None:
         while True:
@@ -127,11 +332,21 @@ async def process_video_frames(
                     pass
 
             try:
-                frame_queue.put_nowait(frame)
+                frame_queue.put_nowait((frame, time.monotonic()))
             except asyncio.QueueFull:
                 pass
 
     try:
+        if governor:
+            governor.register(client_id)
+        if worker_pool:
+            # Landmarker and metric state live in the session's worker process
+            worker_pool.open_session(client_id)
+        else:
+            # Check out a dedicated landmarker for the lifetime of this session
+            face_landmarker = await asyncio.get_running_loop().run_in_executor(
+                executor, face_landmarker_pool.acquire
+            )
         reader_task = asyncio.create_task(_read_frames())
         while True:
             if stop_processing.is_set():
@@ -144,12 +359,15 @@ async def process_video_frames(
 
             try:
                 try:
-                    frame = await asyncio.wait_for(frame_queue.get(), timeout=0.5)
+                    frame, received_at = await asyncio.wait_for(
+                        frame_queue.get(), timeout=0.5
+                    )
                 except asyncio.TimeoutError:
                     continue
 
                 now = time.perf_counter()
-                if now - last_process_time < TARGET_INTERVAL_SEC:
+                interval = governor.interval() if governor else TARGET_INTERVAL_SEC
+                if now - last_process_time < interval:
                     continue
                 last_process_time = now
 
@@ -158,8 +376,8 @@ async def process_video_frames(
                     break
 
                 if connection_manager.processing_reset.get(client_id, False):
-                    metric_manager = MetricManager()
-                    smoother = SequenceSmoother(alpha=0.8, max_missing=5)
+                    state = PipelineState()
+                    reset_worker_state = True
                     frame_count = 0
                     processed_frames = 0
                     start_time = time.perf_counter()
@@ -198,8 +416,11 @@ async def process_video_frames(
                             dropped_messages,
                         )
                     continue
-                if connection_manager.consume_head_pose_recalibration(client_id):
-                    metric_manager.reset_head_pose_baseline()
+                recalibrate_head_pose = (
+                    connection_manager.consume_head_pose_recalibration(client_id)
+                )
+                if recalibrate_head_pose:
+                    state.metric_manager.reset_head_pose_baseline()
 
                 # Convert frame to numpy array
                 img = frame.to_ndarray(format="bgr24")
@@ -216,22 +437,65 @@ async def process_video_frames(
 
                 # Process frame
                 timestamp = datetime.now(timezone.utc).isoformat()
-                result = await asyncio.get_running_loop().run_in_executor(
-                    executor,
-                    functools.partial(
-                        process_video_frame,
-                        timestamp,
-                        img,
-                        face_landmarker,
-                        object_detector,
-                        metric_manager,
-                        smoother,
-                    ),
+                media_timestamp_ms = (
+                    int(frame.time * 1000) if frame.time is not None else None
                 )
+                if governor:
+                    governor.frame_started()
+                # Time spent processing the frame, excluding queue wait
+                service_sec = None
+                try:
+                    if worker_pool:
+                        (
+                            payload,
+                            session_stats,
+                            service_sec,
+                        ) = await worker_pool.process_frame(
+                            client_id,
+                            timestamp,
+                            resize_to_max_width(img),
+                            media_timestamp_ms,
+                            reset=reset_worker_state,
+                            recalibrate_head_pose=recalibrate_head_pose,
+                            received_at=received_at,
+                        )
+                        reset_worker_state = False
+                    else:
+                        process = functools.partial(
+                            process_video_frame,
+                            timestamp,
+                            img,
+                            face_landmarker,
+                            object_detector,
+                            state,
+                            media_timestamp_ms,
+                            received_at,
+                        )
+                        if scheduler:
+                            result, service_sec = await scheduler.run(
+                                client_id, received_at + interval, timed, process
+                            )
+                        else:
+                            (
+                                result,
+                                service_sec,
+                            ) = await asyncio.get_running_loop().run_in_executor(
+                                executor, timed, process
+                            )
+                        payload = result.model_dump_json()
+                        session_stats = state.stats()
+                        if scheduler:
+                            session_stats.update(scheduler.session_stats(client_id))
+                finally:
+                    if governor:
+                        governor.frame_finished(service_sec)
+                if governor:
+                    session_stats["effective_fps"] = governor.effective_fps()
+                connection_manager.session_stats[client_id] = session_stats
 
                 # Send result
                 try:
-                    channel.send(result.model_dump_json())
+                    channel.send(payload)
                 except Exception as e:
                     logger.info(
                         "Data channel send failed for %s: %s",
@@ -283,3 +547,11 @@ async def process_video_frames(
                 await reader_task
             except asyncio.CancelledError:
                 pass
+        if face_landmarker is not None:
+            face_landmarker_pool.release(face_landmarker)
+        if worker_pool:
+            worker_pool.close_session(client_id)
+        if governor:
+            governor.unregister(client_id)
+        if scheduler:
+            scheduler.remove_session(client_id)
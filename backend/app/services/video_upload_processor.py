@@ -8,11 +8,16 @@ from app.models.video_upload import (
     VideoFrameResult,
     VideoMetadata,
 )
+from app.services.detector_factory import create_phone_gate
 from app.services.face_landmarker import FaceLandmarker, get_essential_landmarks
 from app.services.face_landmarks import ESSENTIAL_LANDMARKS
 from app.services.metrics.frame_context import FrameContext
 from app.services.metrics.metric_manager import MetricManager
-from app.services.object_detector import ObjectDetector
+from app.services.object_detector import (
+    Detections,
+    ObjectDetector,
+    detection_list,
+)
 from app.services.smoother import SequenceSmoother
 
 logger = logging.getLogger(__name__)
@@ -81,6 +86,7 @@ def process_uploaded_video(
     metric_manager = MetricManager()
     metric_manager.reset()
     smoother = SequenceSmoother(alpha=0.8, max_missing=5)
+    phone_gate = create_phone_gate()
 
     frames: list[VideoFrameResult] = []
 
@@ -121,7 +127,9 @@ def process_uploaded_video(
                 w, h = int(w * scale), int(h * scale)
                 frame = cv2.resize(frame, (w, h))
 
-            face_landmarks = face_landmarker.detect(frame)
+            face_landmarks = face_landmarker.detect(
+                frame, int(timestamp_sec * 1000)
+            )
             has_face = bool(face_landmarks)
             essential_landmarks = (
                 get_essential_landmarks(face_landmarks, ESSENTIAL_LANDMARKS)
@@ -130,7 +138,12 @@ def process_uploaded_video(
             )
             smoothed_landmarks = smoother.update(essential_landmarks)
 
-            object_detections = object_detector.detect(frame, normalize=True)
+            if phone_gate and not phone_gate.should_detect(frame, face_landmarks):
+                object_detections = Detections.empty()
+            else:
+                object_detections = object_detector.detect(frame, normalize=True)
+                if phone_gate:
+                    phone_gate.update(object_detections)
 
             frame_context = FrameContext(
                 face_landmarks=face_landmarks, object_detections=object_detections
@@ -141,7 +154,7 @@ def process_uploaded_video(
                 VideoFrameResult(
                     timestamp=format_timestamp(timestamp_sec),
                     face_landmarks=smoothed_landmarks if has_face else None,
-                    object_detections=object_detections or None,
+                    object_detections=detection_list(object_detections) or None,
                     metrics=metrics,
                 )
             )
@@ -155,6 +168,13 @@ def process_uploaded_video(
     finally:
         cap.release()
 
+    if phone_gate:
+        logger.info(
+            "Phone gate: %d full detections, %d gated frames",
+            phone_gate.full_detections,
+            phone_gate.gated_frames,
+        )
+
     if duration_sec <= 0:
         duration_sec = last_timestamp_sec
 
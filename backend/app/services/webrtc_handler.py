@@ -13,6 +13,7 @@ from aiortc.sdp import candidate_from_sdp
 
 from app.models.webrtc import ICECandidateMessage, MessageType, SDPMessage
 from app.services.connection_manager import ConnectionManager
+from app.services.face_landmarker_pool import FaceLandmarkerPool
 from app.services.ice_servers import get_ice_servers
 from app.services.object_detector import ObjectDetector
 from app.services.video_processor import process_video_frames
@@ -23,7 +24,7 @@ logger = logging.getLogger(__name__)
 async def create_peer_connection(
     client_id: str,
     connection_manager: ConnectionManager,
-    face_landmarker,
+    face_landmarker_pool: FaceLandmarkerPool,
     object_detector: ObjectDetector,
 ) -> RTCPeerConnection:
     """
@@ -61,7 +62,7 @@ async def create_peer_connection(
                 process_video_frames(
                     client_id,
                     track,
-                    face_landmarker,
+                    face_landmarker_pool,
                     object_detector,
                     connection_manager,
                     stop_processing,
@@ -153,7 +154,7 @@ async def handle_offer(
     client_id: str,
     message: dict,
     connection_manager: ConnectionManager,
-    face_landmarker,
+    face_landmarker_pool: FaceLandmarkerPool,
     object_detector: ObjectDetector,
 ) -> None:
     """
@@ -164,7 +165,7 @@ async def handle_offer(
         offer_msg = SDPMessage(**message)
 
         pc = await create_peer_connection(
-            client_id, connection_manager, face_landmarker, object_detector
+            client_id, connection_manager, face_landmarker_pool, object_detector
         )
 
         offer = RTCSessionDescription(sdp=offer_msg.sdp, type=offer_msg.sdpType)
@@ -1,12 +1,106 @@
+import logging
 import os
+import signal
+import socket
+import time
 
 import uvicorn
 
+from app.core.config import settings
+from app.core.logging import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# Workers that exit sooner than this are restarted after a pause, so a worker
+# failing at startup does not make the parent fork in a tight loop
+MIN_WORKER_LIFETIME_SEC = 5.0
+
+
+def serve_preforked(host: str, port: int, workers: int) -> None:
+    """
+    Run several uvicorn workers forked from this process.
+
+    Model weights are loaded here before forking, so the workers share them
+    copy-on-write instead of each loading its own copy. Inference sessions
+    themselves are created in the workers, as they are not fork-safe.
+    Workers that exit are replaced until SIGTERM or SIGINT is received.
+    """
+    from app.services.detector_factory import preload_model_weights
+
+    configure_logging()
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+
+    preload_model_weights()
+
+    # Worker index and start time by pid
+    children: dict[int, tuple[int, float]] = {}
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            # Picks this worker's share of the CPUs when a CPU plan is enabled
+            os.environ["SERVER_WORKER_INDEX"] = str(index)
+            config = uvicorn.Config("app.main:app", host=host, port=port)
+            uvicorn.Server(config).run(sockets=[sock])
+            os._exit(0)
+        children[pid] = (index, time.monotonic())
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for child in children:
+            try:
+                os.kill(child, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(workers):
+        spawn(index)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        if pid not in children:
+            continue
+
+        index, started_at = children.pop(pid)
+        if stopping:
+            continue
+
+        logger.warning(
+            "Server worker %d (pid %d) exited with status %d; restarting",
+            index,
+            pid,
+            os.waitstatus_to_exitcode(status),
+        )
+        if time.monotonic() - started_at < MIN_WORKER_LIFETIME_SEC:
+            time.sleep(MIN_WORKER_LIFETIME_SEC)
+        if not stopping:
+            spawn(index)
+
+    sock.close()
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8000))
     dev = os.environ.get("ENVIRONMENT") == "development"
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=port,
-    )
+    if settings.server_workers > 1:
+        serve_preforked("0.0.0.0", port, settings.server_workers)
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host="0.0.0.0",
+            port=port,
+        )
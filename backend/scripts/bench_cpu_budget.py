@@ -0,0 +1,180 @@
+"""
+Throughput of the live pipeline under contention, with and without the CPU
+budget plan. Each configuration runs in its own process, since the plan sets
+process-wide thread pools.
+
+N simulated sessions submit frames to the frame-processing thread pool as
+fast as it accepts them, each waiting for its previous frame like a live
+session does. Reports frames per second and per-frame latency.
+
+Usage (from the backend folder):
+    python -m scripts.bench_cpu_budget [--clip clip.mp4] [--sessions 8] \\
+        [--seconds 20] [--cores 0] [--global-pool]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+MAX_WIDTH = 480  # Frames are downscaled to this width in the pipeline
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the CPU budget plan")
+    parser.add_argument("--clip", help="Clip to take frames from (default: noise)")
+    parser.add_argument("--sessions", type=int, default=8, help="Concurrent sessions")
+    parser.add_argument("--seconds", type=float, default=20.0, help="Run time")
+    parser.add_argument(
+        "--cores", type=int, default=0, help="Core budget (0 = all CPUs)"
+    )
+    parser.add_argument(
+        "--global-pool",
+        action="store_true",
+        help="Use a global ONNX Runtime thread pool in the planned run",
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def load_frames(clip: str | None, count: int = 60) -> list[np.ndarray]:
+    import cv2
+
+    if clip is None:
+        rng = np.random.default_rng(0)
+        return [rng.integers(0, 256, (270, MAX_WIDTH, 3), dtype=np.uint8)]
+
+    cap = cv2.VideoCapture(clip)
+    frames = []
+    try:
+        while len(frames) < count:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+    finally:
+        cap.release()
+    if not frames:
+        raise SystemExit(f"Cannot read frames from clip: {clip}")
+    return frames
+
+
+def run_worker(args: argparse.Namespace) -> None:
+    """
+    Run the pipeline with the settings of this process and print JSON results.
+    """
+    from app.core.cpu_budget import apply_cpu_plan, get_cpu_plan
+    from app.services.detector_factory import build_object_detector
+    from app.services.face_landmarker_factory import build_face_landmarkers
+    from app.services.pipeline_state import PipelineState
+    from app.services.video_processor import EXECUTOR_WORKERS, process_video_frame
+
+    plan = get_cpu_plan()
+    if plan:
+        apply_cpu_plan(plan, 0)
+
+    frames = load_frames(args.clip)
+    factory, fallback = build_face_landmarkers()
+    landmarkers = [factory() for _ in range(args.sessions)]
+    detector = build_object_detector()
+
+    def session(index: int, deadline: float, pool: ThreadPoolExecutor) -> list[float]:
+        state = PipelineState()
+        latencies = []
+        i = 0
+        while time.perf_counter() < deadline:
+            frame = frames[i % len(frames)]
+            start = time.perf_counter()
+            pool.submit(
+                process_video_frame,
+                "",
+                frame,
+                landmarkers[index],
+                detector,
+                state,
+                i * 66,
+            ).result()
+            latencies.append((time.perf_counter() - start) * 1000)
+            i += 1
+        return latencies
+
+    try:
+        with ThreadPoolExecutor(max_workers=EXECUTOR_WORKERS) as pool:
+            with ThreadPoolExecutor(max_workers=args.sessions) as sessions:
+                start = time.perf_counter()
+                deadline = start + args.seconds
+                futures = [
+                    sessions.submit(session, i, deadline, pool)
+                    for i in range(args.sessions)
+                ]
+                latencies = [lat for f in futures for lat in f.result()]
+                elapsed = time.perf_counter() - start
+    finally:
+        for landmarker in landmarkers:
+            landmarker.close()
+        fallback.close()
+
+    print(
+        json.dumps(
+            {
+                "plan": plan.describe() if plan else "default",
+                "fps": len(latencies) / elapsed,
+                "mean_ms": float(np.mean(latencies)),
+                "p95_ms": float(np.percentile(latencies, 95)),
+            }
+        )
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    if args.worker:
+        run_worker(args)
+        return
+
+    worker_args = [
+        sys.executable,
+        "-m",
+        "scripts.bench_cpu_budget",
+        "--worker",
+        "--sessions",
+        str(args.sessions),
+        "--seconds",
+        str(args.seconds),
+    ]
+    if args.clip:
+        worker_args += ["--clip", args.clip]
+
+    configs = {
+        "default": {"CPU_BUDGET_ENABLED": "false"},
+        "planned": {
+            "CPU_BUDGET_ENABLED": "true",
+            "CPU_BUDGET_CORES": str(args.cores),
+            "CPU_BUDGET_ORT_GLOBAL_THREAD_POOL": str(args.global_pool).lower(),
+        },
+    }
+
+    print(f"{args.sessions} sessions, {args.seconds:.0f} s per configuration")
+    for name, env in configs.items():
+        output = subprocess.run(
+            worker_args,
+            env={**os.environ, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{name:<8} {result['plan']}")
+        print(
+            f"{'':<8} {result['fps']:.1f} fps | mean {result['mean_ms']:.1f} ms | "
+            f"p95 {result['p95_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
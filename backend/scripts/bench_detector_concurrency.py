@@ -0,0 +1,112 @@
+"""
+Contention benchmark of the object detector.
+Runs detections from 1, 2, 4 and 8 threads against one shared detector,
+with the session lock (default) and with per-thread IO bindings (concurrent).
+
+Usage (from the backend folder):
+    python -m scripts.bench_detector_concurrency [--clip clip.mp4] \\
+        [--model assets/models/yolov8n.onnx] [--intra-op-threads 1]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from app.services.object_detector import MODEL_PATH, YoloObjectDetector
+from app.services.utils.ort_session import build_session_options
+
+MAX_WIDTH = 480  # Frames are downscaled to this width in the pipeline
+THREAD_COUNTS = (1, 2, 4, 8)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark detector contention")
+    parser.add_argument("--clip", help="Clip to take a frame from (default: noise)")
+    parser.add_argument("--model", default=str(MODEL_PATH))
+    parser.add_argument(
+        "--frames-per-thread", type=int, default=50, help="Detections per thread"
+    )
+    parser.add_argument(
+        "--intra-op-threads",
+        type=int,
+        default=0,
+        help="ONNX Runtime intra-op threads (0 = half the CPU cores)",
+    )
+    return parser.parse_args()
+
+
+def load_frame(clip: str | None) -> np.ndarray:
+    if clip is None:
+        rng = np.random.default_rng(0)
+        return rng.integers(0, 256, (270, MAX_WIDTH, 3), dtype=np.uint8)
+
+    cap = cv2.VideoCapture(clip)
+    ret, frame = cap.read()
+    cap.release()
+    if not ret:
+        raise SystemExit(f"Cannot read a frame from clip: {clip}")
+
+    h, w = frame.shape[:2]
+    if w > MAX_WIDTH:
+        scale = MAX_WIDTH / w
+        frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+    return frame
+
+
+def run(
+    detector: YoloObjectDetector, frame: np.ndarray, threads: int, per_thread: int
+) -> tuple[float, list[float]]:
+    """
+    Return throughput (frames/s) and per-detection latencies (ms).
+    """
+
+    def worker() -> list[float]:
+        latencies = []
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            detector.detect(frame)
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        # Warm up every thread's buffers and bindings
+        list(pool.map(lambda _: detector.detect(frame), range(threads)))
+
+        start = time.perf_counter()
+        futures = [pool.submit(worker) for _ in range(threads)]
+        latencies = [lat for future in futures for lat in future.result()]
+        elapsed = time.perf_counter() - start
+
+    return threads * per_thread / elapsed, latencies
+
+
+def main() -> None:
+    args = parse_args()
+    frame = load_frame(args.clip)
+
+    print(f"{'mode':<11} {'threads':>7} {'fps':>8} {'mean ms':>8} {'p95 ms':>8}")
+    for concurrent in (False, True):
+        detector = YoloObjectDetector(
+            model_path=args.model,
+            session_options=build_session_options(
+                intra_op_threads=args.intra_op_threads
+            ),
+            concurrent=concurrent,
+        )
+        try:
+            for threads in THREAD_COUNTS:
+                fps, latencies = run(detector, frame, threads, args.frames_per_thread)
+                print(
+                    f"{'concurrent' if concurrent else 'locked':<11} {threads:>7} "
+                    f"{fps:>8.1f} {np.mean(latencies):>8.2f} "
+                    f"{np.percentile(latencies, 95):>8.2f}"
+                )
+        finally:
+            detector.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Microbenchmark of detector postprocessing on recorded model outputs.
+Compares the previous per-class OpenCV NMS path, which built one
+ObjectDetection per box, with the vectorized array-backed path.
+
+Usage (from the backend folder):
+    # Record raw outputs from a clip, then benchmark them
+    python -m scripts.bench_postprocess --clip clip.mp4 --save outputs.npz
+    python -m scripts.bench_postprocess --outputs outputs.npz
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from app.services.object_detector import (
+    ESSENTIAL_CLASSES,
+    MODEL_PATH,
+    ObjectDetection,
+    YoloObjectDetector,
+    detection_list,
+)
+
+MAX_WIDTH = 480  # Frames are downscaled to this width in the pipeline
+CONF_THRESHOLD = 0.3
+IOU_THRESHOLD = 0.5
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark detector postprocessing")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--clip", help="Video clip to record model outputs from")
+    source.add_argument("--outputs", help="Previously recorded outputs (.npz)")
+    parser.add_argument("--model", default=str(MODEL_PATH))
+    parser.add_argument("--save", help="Write recorded outputs to this .npz file")
+    parser.add_argument("--max-frames", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def record_outputs(clip: str, model: str, max_frames: int) -> dict[str, np.ndarray]:
+    """
+    Run the model on a clip and keep the raw outputs with their letterbox info.
+    """
+    detector = YoloObjectDetector(model_path=model)
+    cap = cv2.VideoCapture(clip)
+    if not cap.isOpened():
+        raise SystemExit(f"Cannot open clip: {clip}")
+
+    outputs, shapes, ratios, pads = [], [], [], []
+    try:
+        while len(outputs) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            h, w = frame.shape[:2]
+            if w > MAX_WIDTH:
+                scale = MAX_WIDTH / w
+                frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+
+            tensor, orig_shape, ratio, pad = detector.prepare(frame)
+            output = detector.infer(tensor)
+            if output is None:
+                continue
+            outputs.append(output)
+            shapes.append(orig_shape)
+            ratios.append(ratio)
+            pads.append(pad)
+    finally:
+        cap.release()
+        detector.close()
+
+    return {
+        "outputs": np.stack(outputs),
+        "shapes": np.array(shapes),
+        "ratios": np.array(ratios),
+        "pads": np.array(pads),
+    }
+
+
+def legacy_postprocess(output, orig_shape, ratio, pad, conf_thres, iou_thres):
+    """
+    Previous postprocessing: full transpose and argmax, per-class
+    cv2.dnn.NMSBoxes on Python lists, one ObjectDetection per box.
+    """
+    output = np.squeeze(output).T
+    boxes = output[:, :4]
+    scores = output[:, 4:]
+    class_ids = scores.argmax(axis=1)
+    confidences = scores[np.arange(scores.shape[0]), class_ids]
+
+    mask = (confidences >= conf_thres) & np.isin(class_ids, ESSENTIAL_CLASSES)
+    boxes, confidences, class_ids = boxes[mask], confidences[mask], class_ids[mask]
+    if boxes.size == 0:
+        return []
+
+    xyxy = boxes.copy()
+    xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2
+    xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2
+    xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2
+    xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2
+    xyxy /= ratio
+    xyxy[:, [0, 2]] -= pad[0]
+    xyxy[:, [1, 3]] -= pad[1]
+    h, w = orig_shape
+    xyxy[:, [0, 2]] /= w
+    xyxy[:, [1, 3]] /= h
+
+    keep_idxs = []
+    for cls in np.unique(class_ids):
+        cls_indices = np.flatnonzero(class_ids == cls)
+        keep = cv2.dnn.NMSBoxes(
+            xyxy[cls_indices].tolist(),
+            confidences[cls_indices].tolist(),
+            conf_thres,
+            iou_thres,
+        )
+        if len(keep) > 0:
+            keep_idxs.extend(cls_indices[np.array(keep).flatten()])
+
+    return [
+        ObjectDetection(
+            bbox=xyxy[i].tolist(),
+            conf=float(confidences[i]),
+            class_id=int(class_ids[i]),
+        )
+        for i in keep_idxs
+    ]
+
+
+def vectorized_postprocess(output, orig_shape, ratio, pad, conf_thres, iou_thres):
+    return YoloObjectDetector._postprocess(
+        output, orig_shape, ratio, pad, conf_thres, iou_thres, normalize=True
+    )
+
+
+def bench(fn, recorded: dict[str, np.ndarray], repeat: int, serialize: bool):
+    """
+    Return per-frame latencies (us) and the detection count of the last pass.
+    """
+    latencies = []
+    count = 0
+    for _ in range(repeat):
+        count = 0
+        for output, shape, ratio, pad in zip(
+            recorded["outputs"],
+            recorded["shapes"],
+            recorded["ratios"],
+            recorded["pads"],
+        ):
+            start = time.perf_counter()
+            detections = fn(
+                output,
+                tuple(shape),
+                float(ratio),
+                tuple(pad),
+                CONF_THRESHOLD,
+                IOU_THRESHOLD,
+            )
+            if serialize:
+                detections = detection_list(detections)
+            latencies.append((time.perf_counter() - start) * 1e6)
+            count += len(detections)
+    return latencies, count
+
+
+def print_latency(name: str, latencies: list[float]) -> None:
+    arr = np.asarray(latencies)
+    print(
+        f"{name:<24} mean {arr.mean():8.1f} us | "
+        f"p50 {np.percentile(arr, 50):8.1f} us | "
+        f"p95 {np.percentile(arr, 95):8.1f} us"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.clip:
+        recorded = record_outputs(args.clip, args.model, args.max_frames)
+        if args.save:
+            np.savez_compressed(args.save, **recorded)
+            print(f"Outputs written to: {args.save}")
+    else:
+        with np.load(args.outputs) as data:
+            recorded = {key: data[key] for key in data.files}
+
+    if len(recorded["outputs"]) == 0:
+        raise SystemExit("No outputs recorded")
+
+    legacy_lat, legacy_count = bench(legacy_postprocess, recorded, args.repeat, False)
+    fast_lat, fast_count = bench(vectorized_postprocess, recorded, args.repeat, False)
+    fast_ser_lat, _ = bench(vectorized_postprocess, recorded, args.repeat, True)
+
+    print(f"Frames: {len(recorded['outputs'])} x {args.repeat}")
+    print_latency("legacy", legacy_lat)
+    print_latency("vectorized", fast_lat)
+    print_latency("vectorized + serialize", fast_ser_lat)
+    print(f"Speed-up: {np.mean(legacy_lat) / np.mean(fast_lat):.1f}x")
+    # Counts can differ slightly: the legacy path passed xyxy boxes to
+    # NMSBoxes, which expects xywh, so its overlap test was skewed.
+    print(f"Detections in last pass: legacy {legacy_count}, vectorized {fast_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Compare two detector models on a local clip.
+Reports per-frame latency and phone-detection agreement.
+
+Usage (from the backend folder):
+    python -m scripts.compare_detectors clip.mp4 \\
+        [--baseline assets/models/yolov8n.onnx] \\
+        [--candidate assets/models/yolov8n.int8.onnx]
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app.services.metrics.phone_usage import PHONE_CLASS_ID, PhoneUsageMetric
+from app.services.object_detector import (
+    INT8_MODEL_PATH,
+    MODEL_PATH,
+    ObjectDetection,
+    YoloObjectDetector,
+)
+
+MAX_WIDTH = 480  # Frames are downscaled to this width in the pipeline
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare two detector models")
+    parser.add_argument("clip", help="Video clip to run both models on")
+    parser.add_argument("--baseline", type=Path, default=MODEL_PATH)
+    parser.add_argument("--candidate", type=Path, default=INT8_MODEL_PATH)
+    parser.add_argument(
+        "--max-frames", type=int, default=500, help="Maximum frames to compare"
+    )
+    return parser.parse_args()
+
+
+def read_frames(clip: str, max_frames: int) -> list[np.ndarray]:
+    """
+    Read and downscale frames from a clip.
+    """
+    cap = cv2.VideoCapture(clip)
+    if not cap.isOpened():
+        raise SystemExit(f"Cannot open clip: {clip}")
+
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            h, w = frame.shape[:2]
+            if w > MAX_WIDTH:
+                scale = MAX_WIDTH / w
+                frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+            frames.append(frame)
+    finally:
+        cap.release()
+    return frames
+
+
+def run_model(
+    model_path: Path, frames: list[np.ndarray]
+) -> tuple[list[float], list[list[ObjectDetection]]]:
+    """
+    Run a model on all frames, returning latencies (ms) and detections.
+    """
+    detector = YoloObjectDetector(model_path=model_path)
+    try:
+        detector.detect(frames[0])  # Warm-up
+
+        latencies = []
+        detections = []
+        for frame in frames:
+            start = time.perf_counter()
+            detections.append(detector.detect(frame, normalize=True))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies, detections
+    finally:
+        detector.close()
+
+
+def phone_present(detections: list[ObjectDetection]) -> bool:
+    return any(
+        d.class_id == PHONE_CLASS_ID and d.conf >= PhoneUsageMetric.DEFAULT_CONF
+        for d in detections
+    )
+
+
+def best_phone_box(detections: list[ObjectDetection]) -> list[float] | None:
+    phones = [d for d in detections if d.class_id == PHONE_CLASS_ID]
+    return max(phones, key=lambda d: d.conf).bbox if phones else None
+
+
+def iou(a: list[float], b: list[float]) -> float:
+    ix0, iy0 = max(a[0], b[0]), max(a[1], b[1])
+    ix1, iy1 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, ix1 - ix0) * max(0.0, iy1 - iy0)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def print_latency(name: str, latencies: list[float]) -> None:
+    arr = np.asarray(latencies)
+    print(
+        f"{name:<10} mean {arr.mean():7.2f} ms | "
+        f"p50 {np.percentile(arr, 50):7.2f} ms | "
+        f"p95 {np.percentile(arr, 95):7.2f} ms"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+
+    frames = read_frames(args.clip, args.max_frames)
+    if not frames:
+        raise SystemExit("No frames read from clip")
+
+    base_lat, base_dets = run_model(args.baseline, frames)
+    cand_lat, cand_dets = run_model(args.candidate, frames)
+
+    print(f"Frames: {len(frames)}")
+    print_latency("baseline", base_lat)
+    print_latency("candidate", cand_lat)
+    print(f"Speed-up: {np.mean(base_lat) / np.mean(cand_lat):.2f}x")
+
+    both = only_base = only_cand = 0
+    ious = []
+    for b, c in zip(base_dets, cand_dets):
+        pb, pc = phone_present(b), phone_present(c)
+        both += pb and pc
+        only_base += pb and not pc
+        only_cand += pc and not pb
+        box_b, box_c = best_phone_box(b), best_phone_box(c)
+        if pb and pc and box_b and box_c:
+            ious.append(iou(box_b, box_c))
+
+    agreement = 1 - (only_base + only_cand) / len(frames)
+    print(
+        f"Phone frames: both {both}, baseline only {only_base}, candidate only {only_cand}"
+    )
+    print(f"Phone-detection agreement: {agreement:.1%}")
+    if ious:
+        print(f"Mean phone box IoU: {np.mean(ious):.3f}")
+
+
+if __name__ == "__main__":
+    main()
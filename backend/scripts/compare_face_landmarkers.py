@@ -0,0 +1,148 @@
+"""
+Compare the ONNX face landmarker backend with MediaPipe on a local clip.
+Reports per-frame latency, face-detection agreement and landmark parity
+(mean distance over all 478 landmarks, relative to the inter-ocular distance).
+
+Usage (from the backend folder):
+    python -m scripts.compare_face_landmarkers clip.mp4 [--batch 4]
+
+With --batch N the ONNX backend also landmarks N copies of each frame as if
+they came from N streams, to show the per-frame cost of batched calls.
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from app.services.face_landmarker import MediapipeFaceLandmarker
+from app.services.onnx_face_landmarker import (
+    OnnxFaceLandmarker,
+    OnnxFaceMeshModels,
+    detect_many,
+)
+
+MAX_WIDTH = 480  # Frames are downscaled to this width in the pipeline
+FPS = 15  # Media clock used for MediaPipe timestamps
+
+# Outer eye corners, used to normalize landmark distances
+LEFT_EYE_CORNER = 263
+RIGHT_EYE_CORNER = 33
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare face landmarker backends")
+    parser.add_argument("clip", help="Video clip to run both backends on")
+    parser.add_argument(
+        "--max-frames", type=int, default=500, help="Maximum frames to compare"
+    )
+    parser.add_argument(
+        "--batch", type=int, default=1, help="Streams per batched ONNX call"
+    )
+    return parser.parse_args()
+
+
+def read_frames(clip: str, max_frames: int) -> list[np.ndarray]:
+    """
+    Read and downscale frames from a clip.
+    """
+    cap = cv2.VideoCapture(clip)
+    if not cap.isOpened():
+        raise SystemExit(f"Cannot open clip: {clip}")
+
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            h, w = frame.shape[:2]
+            if w > MAX_WIDTH:
+                scale = MAX_WIDTH / w
+                frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+            frames.append(frame)
+    finally:
+        cap.release()
+    return frames
+
+
+def run_mediapipe(frames: list[np.ndarray]) -> tuple[list[float], list]:
+    landmarker = MediapipeFaceLandmarker()
+    try:
+        latencies, results = [], []
+        for i, frame in enumerate(frames):
+            start = time.perf_counter()
+            results.append(landmarker.detect(frame, i * 1000 // FPS))
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies, results
+    finally:
+        landmarker.close()
+
+
+def run_onnx(frames: list[np.ndarray], batch: int) -> tuple[list[float], list]:
+    models = OnnxFaceMeshModels()
+    try:
+        landmarkers = [OnnxFaceLandmarker(models) for _ in range(batch)]
+        latencies, results = [], []
+        for frame in frames:
+            start = time.perf_counter()
+            batch_results = detect_many(landmarkers, [frame] * batch)
+            latencies.append((time.perf_counter() - start) * 1000 / batch)
+            results.append(batch_results[0])
+        return latencies, results
+    finally:
+        models.close()
+
+
+def print_latency(name: str, latencies: list[float]) -> None:
+    arr = np.asarray(latencies)
+    print(
+        f"{name:<10} mean {arr.mean():7.2f} ms | "
+        f"p50 {np.percentile(arr, 50):7.2f} ms | "
+        f"p95 {np.percentile(arr, 95):7.2f} ms"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+
+    frames = read_frames(args.clip, args.max_frames)
+    if not frames:
+        raise SystemExit("No frames read from clip")
+
+    mp_lat, mp_results = run_mediapipe(frames)
+    onnx_lat, onnx_results = run_onnx(frames, args.batch)
+
+    print(f"Frames: {len(frames)}")
+    print_latency("mediapipe", mp_lat)
+    print_latency(f"onnx x{args.batch}", onnx_lat)
+    print(f"Speed-up: {np.mean(mp_lat) / np.mean(onnx_lat):.2f}x per frame")
+
+    both = only_mp = only_onnx = 0
+    errors = []
+    for (h, w), mp_lm, onnx_lm in zip(
+        (f.shape[:2] for f in frames), mp_results, onnx_results
+    ):
+        both += bool(mp_lm) and bool(onnx_lm)
+        only_mp += bool(mp_lm) and not onnx_lm
+        only_onnx += bool(onnx_lm) and not mp_lm
+        if not (mp_lm and onnx_lm):
+            continue
+
+        ref = np.asarray(mp_lm) * (w, h)
+        pred = np.asarray(onnx_lm) * (w, h)
+        inter_ocular = np.linalg.norm(ref[LEFT_EYE_CORNER] - ref[RIGHT_EYE_CORNER])
+        if inter_ocular > 0:
+            errors.append(np.linalg.norm(ref - pred, axis=1).mean() / inter_ocular)
+
+    print(f"Face frames: both {both}, mediapipe only {only_mp}, onnx only {only_onnx}")
+    if errors:
+        print(
+            f"Landmark error (inter-ocular normalized): mean {np.mean(errors):.3f}, "
+            f"p95 {np.percentile(errors, 95):.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,488 @@
 """
 Export YOLOv8 model to ONNX format.
 Only used for exporting the model.
+
+Usage (from the backend folder):
+    python -m scripts.export_yolo_onnx [--weights yolov8s.pt] [--dynamic]
+
+With --dynamic the batch dimension is left symbolic so that several frames
+can be run in one inference call (see DETECTOR_BATCHING_ENABLED).
+
+With --int8 a statically quantized INT8 copy of the model is written next to
+the FP32 one (<name>.int8.onnx), calibrated on frames sampled from local
+driver-cabin videos:
+    python -m scripts.export_yolo_onnx --weights yolov8n.pt --output yolov8n.onnx \\
+        --int8 --calibration-video cabin1.mp4 --calibration-video cabin2.mp4
+
+Use --skip-export to quantize an already exported model.
+
+With --imgsz WxH the model is exported at a fixed, possibly non-square input
+shape matched to the 480px-wide pipeline frames, e.g. 480x288 for 16:9 video,
+and named <name>_<W>x<H>.onnx (see DETECTOR_INPUT_SHAPES):
+    python -m scripts.export_yolo_onnx --weights yolov8n.pt --imgsz 480x288
+
+With --phone-head a copy of the model (and of the INT8 model, if written) is
+pruned to the box and phone-score rows, with confidence thresholding and NMS
+built into the graph, and named <name>.phone_nms.onnx (see DETECTOR_PHONE_HEAD):
+    python -m scripts.export_yolo_onnx --weights yolov8n.pt --output yolov8n.onnx \\
+        --phone-head
+
+With --phone-gate a low-resolution copy of the model is reduced to a single
+output, the highest phone score over all anchors, and written to
+phone_gate.onnx for the phone-presence gate (see PHONE_GATE_ENABLED):
+    python -m scripts.export_yolo_onnx --weights yolov8n.pt --phone-gate \
+        [--phone-gate-imgsz 160]
 """
 
+import argparse
 import shutil
 from pathlib import Path
 
-from ultralytics import YOLO
+OUTPUT_FOLDER = Path(__file__).resolve().parents[1] / "assets/models"
+MAX_WIDTH = 480  # Frames are downscaled to this width in the pipeline
+PHONE_CLASS_ID = 67  # COCO
+NMS_CLASS_ID_METADATA_KEY = "nms_class_id"  # read by YoloObjectDetector
+PHONE_GATE_FILENAME = "phone_gate.onnx"  # read by PhonePresenceClassifier
+
+
+def parse_input_shape(value: str) -> tuple[int, int]:
+    """
+    Parse an input shape such as "480x288" (width x height) or "640".
+    """
+    width, _, height = value.lower().partition("x")
+    return int(width), int(height or width)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export YOLOv8 to ONNX")
+    parser.add_argument(
+        "--weights", default="yolov8s.pt", help="Pre-trained YOLO weights"
+    )
+    parser.add_argument(
+        "--dynamic",
+        action="store_true",
+        help="Export with a dynamic batch dimension for batched inference",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Output file name (default: name chosen by the exporter)",
+    )
+    parser.add_argument(
+        "--skip-export",
+        action="store_true",
+        help="Reuse the existing --output model instead of exporting",
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Also write a statically quantized INT8 model",
+    )
+    parser.add_argument(
+        "--calibration-video",
+        action="append",
+        default=[],
+        help="Video to sample calibration frames from (repeatable)",
+    )
+    parser.add_argument(
+        "--calibration-frames",
+        type=int,
+        default=200,
+        help="Total number of calibration frames",
+    )
+    parser.add_argument(
+        "--imgsz",
+        type=parse_input_shape,
+        default=(640, 640),
+        help="Model input size, square (640) or WxH (480x288)",
+    )
+    parser.add_argument(
+        "--phone-head",
+        action="store_true",
+        help="Also write a phone-only model with in-graph NMS",
+    )
+    parser.add_argument(
+        "--nms-conf",
+        type=float,
+        default=0.25,
+        help="Score threshold built into the phone-only model",
+    )
+    parser.add_argument(
+        "--nms-iou",
+        type=float,
+        default=0.5,
+        help="IoU threshold built into the phone-only model",
+    )
+    parser.add_argument(
+        "--max-detections",
+        type=int,
+        default=20,
+        help="Maximum boxes per image returned by the phone-only model",
+    )
+    parser.add_argument(
+        "--phone-gate",
+        action="store_true",
+        help="Also write a low-resolution phone-presence model for the gate",
+    )
+    parser.add_argument(
+        "--phone-gate-imgsz",
+        type=parse_input_shape,
+        default=(160, 160),
+        help="Input size of the phone-presence model, square or WxH",
+    )
+    return parser.parse_args()
+
+
+def export(weights: str, dynamic: bool, imgsz: tuple[int, int]) -> Path:
+    """
+    Export the model and return the path of the exported file.
+    """
+    from ultralytics import YOLO
+
+    # Load YOLO pre-trained model
+    model = YOLO(weights)
+
+    # Export to ONNX
+    exported_path_str = model.export(
+        format="onnx",
+        opset=12,
+        imgsz=[imgsz[1], imgsz[0]],  # (height, width)
+        dynamic=dynamic,  # fixed input shape unless batching is wanted
+    )
+
+    return Path(exported_path_str)  # convert to Path object
+
+
+def sample_calibration_frames(videos: list[str], total_frames: int):
+    """
+    Yield BGR frames sampled evenly across the given videos.
+    """
+    import cv2
+
+    per_video = max(1, total_frames // len(videos))
+
+    for video in videos:
+        cap = cv2.VideoCapture(video)
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open calibration video: {video}")
+
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        step = max(1, frame_count // per_video) if frame_count > 0 else 1
+
+        sampled = 0
+        index = 0
+        try:
+            while sampled < per_video:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index % step == 0:
+                    h, w = frame.shape[:2]
+                    if w > MAX_WIDTH:
+                        scale = MAX_WIDTH / w
+                        frame = cv2.resize(frame, (int(w * scale), int(h * scale)))
+                    sampled += 1
+                    yield frame
+                index += 1
+        finally:
+            cap.release()
+
+
+def quantize_int8(
+    fp32_path: Path, videos: list[str], total_frames: int, imgsz: tuple[int, int]
+) -> Path:
+    """
+    Statically quantize a model to INT8 and return the quantized model path.
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    from app.services.object_detector import YoloObjectDetector
+    from app.services.utils.image_utils import letterbox
+
+    if not videos:
+        raise SystemExit("--int8 requires at least one --calibration-video")
+
+    class CabinFrameReader(CalibrationDataReader):
+        """Feeds letterboxed cabin frames exactly as the detector sees them."""
+
+        def __init__(self, input_name: str):
+            self._input_name = input_name
+            self._frames = sample_calibration_frames(videos, total_frames)
+
+        def get_next(self):
+            frame = next(self._frames, None)
+            if frame is None:
+                return None
+            img_lb, _, _ = letterbox(frame, imgsz)
+            return {self._input_name: YoloObjectDetector._preprocess(img_lb)}
+
+    input_name = (
+        ort.InferenceSession(str(fp32_path), providers=["CPUExecutionProvider"])
+        .get_inputs()[0]
+        .name
+    )
+
+    prepared_path = fp32_path.with_name(fp32_path.stem + ".prep.onnx")
+    int8_path = fp32_path.with_name(fp32_path.stem + ".int8.onnx")
+
+    quant_pre_process(str(fp32_path), str(prepared_path))
+    try:
+        quantize_static(
+            str(prepared_path),
+            str(int8_path),
+            CabinFrameReader(input_name),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+        )
+    finally:
+        prepared_path.unlink(missing_ok=True)
+
+    return int8_path
+
+
+def prune_phone_head(
+    model_path: Path, conf: float, iou: float, max_detections: int
+) -> Path:
+    """
+    Rewrite a YOLOv8 model to output only NMS-filtered phone boxes.
+
+    The (batch, 4 + classes, anchors) head output is sliced down to the box
+    and phone-score rows and fed into a NonMaxSuppression node. The new
+    output holds one (batch_index, x0, y0, x1, y1, score) row per kept box,
+    in letterboxed input pixels.
+    """
+    import numpy as np
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    model = onnx.load(str(model_path))
+    graph = model.graph
+    head = graph.output[0].name
+
+    def const(name: str, values, dtype) -> str:
+        graph.initializer.append(
+            numpy_helper.from_array(np.array(values, dtype=dtype), name)
+        )
+        return name
+
+    def node(op: str, inputs: list[str], output: str, **attrs) -> str:
+        graph.node.append(helper.make_node(op, inputs, [output], **attrs))
+        return output
+
+    def slice_rows(name: str, data: str, start: int, end: int) -> str:
+        starts = const(f"{name}_start", [start], np.int64)
+        ends = const(f"{name}_end", [end], np.int64)
+        axes = const(f"{name}_axes", [1], np.int64)
+        return node("Slice", [data, starts, ends, axes], name)
+
+    boxes_xywh = slice_rows("ph_boxes_xywh", head, 0, 4)
+    scores = slice_rows(
+        "ph_scores", head, 4 + PHONE_CLASS_ID, 5 + PHONE_CLASS_ID
+    )  # (batch, 1, anchors)
+    boxes = node("Transpose", [boxes_xywh], "ph_boxes", perm=[0, 2, 1])
+
+    selected = node(
+        "NonMaxSuppression",
+        [
+            boxes,
+            scores,
+            const("ph_max_boxes", [max_detections], np.int64),
+            const("ph_iou", [iou], np.float32),
+            const("ph_conf", [conf], np.float32),
+        ],
+        "ph_selected",
+        center_point_box=1,
+    )  # (kept, 3) rows of (batch, class, anchor)
+
+    batch_anchor = node(
+        "Gather",
+        [selected, const("ph_batch_anchor_cols", [0, 2], np.int64)],
+        "ph_batch_anchor",
+        axis=1,
+    )
+    kept_xywh = node("GatherND", [boxes, batch_anchor], "ph_kept_xywh")
+    flat_scores = node(
+        "Reshape",
+        [scores, const("ph_flat_shape", [0, -1], np.int64)],
+        "ph_flat_scores",
+    )
+    kept_scores = node("GatherND", [flat_scores, batch_anchor], "ph_kept_scores")
+
+    # Center format -> corners
+    center = slice_rows("ph_center", kept_xywh, 0, 2)
+    size = slice_rows("ph_size", kept_xywh, 2, 4)
+    half = node("Mul", [size, const("ph_half", 0.5, np.float32)], "ph_half_size")
+    top_left = node("Sub", [center, half], "ph_top_left")
+    bottom_right = node("Add", [center, half], "ph_bottom_right")
+
+    batch_col = node(
+        "Gather",
+        [selected, const("ph_batch_col_idx", [0], np.int64)],
+        "ph_batch_col",
+        axis=1,
+    )
+    batch_index = node("Cast", [batch_col], "ph_batch_index", to=TensorProto.FLOAT)
+    score_col = node(
+        "Reshape",
+        [kept_scores, const("ph_col_shape", [-1, 1], np.int64)],
+        "ph_score_col",
+    )
+    node(
+        "Concat",
+        [batch_index, top_left, bottom_right, score_col],
+        "detections",
+        axis=1,
+    )
+
+    del graph.output[:]
+    graph.output.append(
+        helper.make_tensor_value_info("detections", TensorProto.FLOAT, ["kept", 6])
+    )
+    helper.set_model_props(model, {NMS_CLASS_ID_METADATA_KEY: str(PHONE_CLASS_ID)})
+
+    onnx.checker.check_model(model)
+
+    pruned_path = model_path.with_name(
+        f"{model_path.stem}.phone_nms{model_path.suffix}"
+    )
+    onnx.save(model, str(pruned_path))
+    return pruned_path
+
+
+def reduce_to_phone_score(model_path: Path, output_path: Path) -> Path:
+    """
+    Rewrite a YOLOv8 model to output only its highest phone score.
+
+    The phone-score row of the (batch, 4 + classes, anchors) head output is
+    reduced to its maximum over the anchors, giving one (batch, 1) phone
+    probability per image. The input stays an RGB image scaled to [0, 1].
+    """
+    import numpy as np
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    model = onnx.load(str(model_path))
+    graph = model.graph
+    head = graph.output[0].name
+
+    for name, value in (
+        ("pg_start", 4 + PHONE_CLASS_ID),
+        ("pg_end", 5 + PHONE_CLASS_ID),
+        ("pg_axes", 1),
+    ):
+        graph.initializer.append(
+            numpy_helper.from_array(np.array([value], dtype=np.int64), name)
+        )
+    graph.node.extend(
+        [
+            helper.make_node(
+                "Slice", [head, "pg_start", "pg_end", "pg_axes"], ["pg_scores"]
+            ),  # (batch, 1, anchors)
+            helper.make_node(
+                "ReduceMax", ["pg_scores"], ["phone_probability"], axes=[2], keepdims=0
+            ),
+        ]
+    )
+
+    del graph.output[:]
+    graph.output.append(
+        helper.make_tensor_value_info(
+            "phone_probability", TensorProto.FLOAT, ["batch", 1]
+        )
+    )
+
+    onnx.checker.check_model(model)
+    onnx.save(model, str(output_path))
+    return output_path
+
+
+def export_phone_gate(weights: str, imgsz: tuple[int, int]) -> Path:
+    """
+    Export a low-resolution copy of the model as the phone-presence gate.
+    """
+    exported_path = export(weights, dynamic=False, imgsz=imgsz)
+    try:
+        return reduce_to_phone_score(exported_path, OUTPUT_FOLDER / PHONE_GATE_FILENAME)
+    finally:
+        exported_path.unlink(missing_ok=True)
+
+
+def check_runs(model_path: Path) -> None:
+    """
+    Load a written model in ONNX Runtime and run it on a blank image, so
+    graph rewrites that ONNX Runtime rejects fail at export time.
+    """
+    import numpy as np
+    import onnxruntime as ort
+
+    try:
+        session = ort.InferenceSession(
+            str(model_path), providers=["CPUExecutionProvider"]
+        )
+        model_input = session.get_inputs()[0]
+        shape = [
+            dim if isinstance(dim, int) else (1 if i == 0 else 640)
+            for i, dim in enumerate(model_input.shape)
+        ]
+        session.run(None, {model_input.name: np.zeros(shape, dtype=np.float32)})
+    except Exception as e:
+        raise SystemExit(f"ONNX Runtime cannot run {model_path}: {e}") from e
+
+
+def main() -> None:
+    args = parse_args()
+
+    OUTPUT_FOLDER.mkdir(parents=True, exist_ok=True)
+
+    if args.skip_export:
+        if not args.output:
+            raise SystemExit("--skip-export requires --output")
+        destination = OUTPUT_FOLDER / args.output
+    else:
+        exported_path = export(args.weights, args.dynamic, args.imgsz)
+
+        # Move to desired folder
+        name = args.output or exported_path.name
+        if not args.output and args.imgsz != (640, 640):
+            width, height = args.imgsz
+            name = f"{exported_path.stem}_{width}x{height}{exported_path.suffix}"
+        destination = OUTPUT_FOLDER / name
+        shutil.move(str(exported_path), destination)
 
-# Load YOLO pre-trained model
-model = YOLO("yolov8s.pt")
+        print(f"ONNX model exported to: {destination}")
 
-# Export to ONNX
-exported_path_str = model.export(
-    format="onnx",
-    opset=12,
-    dynamic=False,  # fixed input shape
-)
+    if args.int8:
+        int8_path = quantize_int8(
+            destination,
+            args.calibration_video,
+            args.calibration_frames,
+            args.imgsz,
+        )
+        print(f"INT8 model written to: {int8_path}")
 
-exported_path = Path(exported_path_str)  # convert to Path object
+    if args.phone_head:
+        models = [destination] + ([int8_path] if args.int8 else [])
+        for model_path in models:
+            pruned_path = prune_phone_head(
+                model_path, args.nms_conf, args.nms_iou, args.max_detections
+            )
+            check_runs(pruned_path)
+            print(f"Phone-only model written to: {pruned_path}")
 
-# Move to desired folder
-output_folder = Path(__file__).resolve().parents[1] / "assets/models"
-output_folder.mkdir(parents=True, exist_ok=True)
+    if args.phone_gate:
+        gate_path = export_phone_gate(args.weights, args.phone_gate_imgsz)
+        check_runs(gate_path)
+        print(f"Phone-presence model written to: {gate_path}")
 
-shutil.move(str(exported_path), output_folder / exported_path.name)
 
-print(f"ONNX model exported to: {output_folder / exported_path.name}")
+if __name__ == "__main__":
+    main()
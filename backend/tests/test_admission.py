@@ -0,0 +1,39 @@
+import pytest
+
+from app.services import admission
+from app.services.admission import CapacityEstimator
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Drive the estimator's wall clock and CPU time by hand."""
+    now = {"wall": 0.0, "cpu": 0.0}
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now["wall"])
+    monkeypatch.setattr(admission, "cpu_seconds", lambda: now["cpu"])
+    return now
+
+
+def test_session_cost_counts_sessions_for_the_time_they_were_present(clock):
+    estimator = CapacityEstimator(cores=4, smoothing=1.0)
+
+    # One session for the whole window, a second one for its last half
+    estimator.set_sessions(1)
+    clock["wall"] = 5.0
+    estimator.set_sessions(2)
+    clock["wall"], clock["cpu"] = 10.0, 3.0
+    estimator.sample()
+
+    assert estimator.measured
+    assert estimator.session_cost == pytest.approx(3.0 / 15.0)
+
+
+def test_session_cost_ignores_windows_without_enough_session_time(clock):
+    estimator = CapacityEstimator(cores=4, initial_session_cost=0.5)
+
+    clock["wall"] = 9.0
+    estimator.set_sessions(1)
+    clock["wall"], clock["cpu"] = 10.0, 2.0
+    estimator.sample()
+
+    assert not estimator.measured
+    assert estimator.session_cost == 0.5
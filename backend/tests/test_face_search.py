@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.services.face_search import FaceSearch
+from app.services.pipeline_state import PipelineState
+from app.services.video_processor import process_video_frame
+
+
+class CountingLandmarker:
+    """Finds the same face on every frame and counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def detect(self, img, timestamp_ms=None):
+        self.calls += 1
+        return [(0.4 + 0.01 * (i % 10), 0.4 + 0.01 * (i // 10)) for i in range(478)]
+
+    def close(self):
+        pass
+
+
+class NoObjectDetector:
+    def detect(
+        self,
+        img,
+        normalize=True,
+        conf_threshold=0.4,
+        iou_threshold=0.5,
+        input_size=None,
+    ):
+        return []
+
+    def close(self):
+        pass
+
+
+def test_frame_with_found_face_runs_landmarker_once():
+    state = PipelineState(face_search=FaceSearch(interval=1))
+    state.face_search.update(face_missing=True)
+    landmarker = CountingLandmarker()
+
+    result = process_video_frame(
+        "2026-01-01T00:00:00+00:00",
+        np.zeros((360, 640, 3), dtype=np.uint8),
+        landmarker,
+        NoObjectDetector(),
+        state,
+        media_timestamp_ms=0,
+    )
+
+    assert landmarker.calls == 1
+    assert not state.face_search.active
+    assert not result.metrics["face_missing"]
@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+
+from app.services.landmark_propagator import FLOW_LANDMARKS, LandmarkPropagator
+
+NUM_LANDMARKS = 478
+WIDTH, HEIGHT = 320, 240
+
+
+def textured_frame(shift: tuple[int, int] = (0, 0)) -> np.ndarray:
+    """
+    Grayscale frame of smoothed noise, translated by shift pixels.
+    """
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (HEIGHT, WIDTH), dtype=np.uint8)
+    frame = cv2.GaussianBlur(noise, (5, 5), 1.5)
+    dx, dy = shift
+    matrix = np.float32([[1, 0, dx], [0, 1, dy]])
+    return cv2.warpAffine(frame, matrix, (WIDTH, HEIGHT), borderMode=cv2.BORDER_REFLECT)
+
+
+def face_landmarks() -> list[tuple[float, float]]:
+    """
+    Normalized landmarks spread over the middle of the frame.
+    """
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 2))
+    return [(float(x), float(y)) for x, y in points]
+
+
+def test_propagate_follows_frame_motion():
+    propagator = LandmarkPropagator(keyframe_interval=5)
+    keyframe = textured_frame()
+    landmarks = face_landmarks()
+    propagator.update(keyframe, landmarks)
+
+    shift = (3, 2)
+    propagated = propagator.propagate(textured_frame(shift))
+
+    assert propagated is not None
+    assert len(propagated) == NUM_LANDMARKS
+    moved = (np.asarray(propagated) - np.asarray(landmarks)) * (WIDTH, HEIGHT)
+    np.testing.assert_allclose(moved[FLOW_LANDMARKS].mean(axis=0), shift, atol=0.5)
+    assert propagator.propagated_frames == 1
+
+
+def test_propagate_over_several_frames():
+    propagator = LandmarkPropagator(keyframe_interval=5)
+    propagator.update(textured_frame(), face_landmarks())
+
+    # The keyframe and four propagated frames make up the interval
+    for step in range(1, 5):
+        assert not propagator.should_detect(textured_frame((step, 0)))
+        assert propagator.propagate(textured_frame((step, 0))) is not None
+
+    assert propagator.propagated_frames == 4
+    assert propagator.should_detect(textured_frame((5, 0)))
+
+
+def test_propagate_detects_drift_on_unrelated_frame():
+    propagator = LandmarkPropagator(keyframe_interval=5)
+    propagator.update(textured_frame(), face_landmarks())
+
+    rng = np.random.default_rng(2)
+    unrelated = rng.integers(0, 256, (HEIGHT, WIDTH), dtype=np.uint8)
+
+    assert propagator.propagate(unrelated) is None
+    assert propagator.drift_resets == 1
@@ -40,6 +40,7 @@ export default function MonitorScreen() {
     sessionState,
     inferenceData,
     clientId,
+    queueStatus,
     error,
     hasCamera,
     start,
@@ -157,7 +158,12 @@ export default function MonitorScreen() {
     <ScrollView className="flex-1 px-2 py-1">
       <Stack.Screen options={{ title: 'Monitor' }} />
 
-      <ConnectionStatus sessionState={sessionState} clientId={clientId} error={error} />
+      <ConnectionStatus
+        sessionState={sessionState}
+        clientId={clientId}
+        queueStatus={queueStatus}
+        error={error}
+      />
 
       <View className="relative mb-4 w-full">
         <MediaStreamView
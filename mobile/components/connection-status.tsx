@@ -2,14 +2,21 @@ import { useState } from 'react';
 import { TouchableOpacity, View } from 'react-native';
 import { Text } from '@/components/ui/text';
 import { SessionState } from '@/hooks/useMonitoringSession';
+import { QueueMessage } from '@/types/webrtc';
 
 interface ConnectionStatusProps {
   sessionState: SessionState;
   clientId: string | null;
+  queueStatus?: QueueMessage | null;
   error: string | null;
 }
 
-export const ConnectionStatus = ({ sessionState, clientId, error }: ConnectionStatusProps) => {
+export const ConnectionStatus = ({
+  sessionState,
+  clientId,
+  queueStatus,
+  error,
+}: ConnectionStatusProps) => {
   const [showFullId, setShowFullId] = useState(false);
 
   const statusColor = (() => {
@@ -21,6 +28,9 @@ export const ConnectionStatus = ({ sessionState, clientId, error }: ConnectionSt
 
   const statusLabel = (() => {
     if (sessionState === 'active') return 'ACTIVE';
+    if (sessionState === 'starting' && queueStatus) {
+      return `QUEUED #${queueStatus.position} (~${Math.ceil(queueStatus.eta_sec / 60)} MIN)`;
+    }
     if (sessionState === 'starting') return 'STARTING...';
     if (sessionState === 'stopping') return 'STOPPING...';
     return 'IDLE';
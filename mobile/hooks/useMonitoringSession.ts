@@ -3,6 +3,7 @@ import { DataChannelState, useWebRTC } from './useWebRTC';
 import { MediaStream } from 'react-native-webrtc';
 import { sessionLogger } from '@/services/logging/session-logger';
 import { InferenceData } from '@/types/inference';
+import { QueueMessage } from '@/types/webrtc';
 import { useSessionStore } from '@/stores/sessionStore';
 
 export type SessionState = 'idle' | 'starting' | 'active' | 'stopping';
@@ -20,6 +21,7 @@ interface UseMonitoringSessionReturn {
   // Latest data from the session
   inferenceData: InferenceData | null;
   clientId: string | null;
+  queueStatus: QueueMessage | null;
   sessionDurationMs: number;
   transportStatus: string;
   connectionStatus: string;
@@ -43,6 +45,7 @@ export const useMonitoringSession = ({
   // Low-level WebRTC management
   const {
     clientId,
+    queueStatus,
     startConnection,
     cleanup,
     transportStatus,
@@ -225,6 +228,7 @@ export const useMonitoringSession = ({
   return {
     sessionState,
     clientId,
+    queueStatus,
     transportStatus,
     connectionStatus,
     dataChannelState,
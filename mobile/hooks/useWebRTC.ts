@@ -1,6 +1,7 @@
 import {
   ICECandidateMessage,
   MessageType,
+  QueueMessage,
   SDPMessage,
   SignalingMessage,
   SignalingTransport,
@@ -33,6 +34,9 @@ interface UseWebRTCReturn {
   connectionStatus: RTCPeerConnectionState;
   dataChannelState: DataChannelState;
   clientId: string | null;
+
+  // Waiting room position while the server is at capacity
+  queueStatus: QueueMessage | null;
   error: string | null;
   errorDetails: string | null; // implement in return
 
@@ -58,6 +62,9 @@ export const useWebRTC = ({ url, stream }: UseWebRTCProps): UseWebRTCReturn => {
   // Assigned by signaling server on WELCOME
   const [clientId, setClientId] = useState<string | null>(null);
 
+  // Set by QUEUE messages until the server admits the client
+  const [queueStatus, setQueueStatus] = useState<QueueMessage | null>(null);
+
   // Mirrors RTCPeerConnection.connectionState
   const [connectionStatus, setConnectionStatus] = useState<RTCPeerConnectionState>('new');
 
@@ -112,7 +119,12 @@ export const useWebRTC = ({ url, stream }: UseWebRTCProps): UseWebRTCReturn => {
         if (msg.type === MessageType.WELCOME) {
           // Server-assigned client identifier
           setClientId(msg.client_id);
+          setQueueStatus(null);
           console.log('Received client ID:', msg.client_id);
+        } else if (msg.type === MessageType.QUEUE) {
+          // Server at capacity; the offer is handled once we are admitted
+          setQueueStatus(msg);
+          console.log(`Waiting for a free slot: position ${msg.position}, ~${msg.eta_sec}s`);
         } else if (msg.type === MessageType.ANSWER) {
           // Remote SDP answer completes offer/answer handshake
           const pc = pcRef.current;
@@ -434,6 +446,7 @@ export const useWebRTC = ({ url, stream }: UseWebRTCProps): UseWebRTCReturn => {
 
     setConnectionStatus('closed');
     setClientId(null);
+    setQueueStatus(null);
     setErrorState('');
     setDataChannelState('closed');
   }, [setErrorState]);
@@ -486,6 +499,7 @@ export const useWebRTC = ({ url, stream }: UseWebRTCProps): UseWebRTCReturn => {
     connectionStatus,
     dataChannelState,
     clientId,
+    queueStatus,
     error,
     errorDetails,
     startConnection,
@@ -5,6 +5,7 @@ export enum MessageType {
   ICE_CANDIDATE = 'ice-candidate',
   WELCOME = 'welcome',
   ERROR = 'error',
+  QUEUE = 'queue',
 }
 
 /** SDP offer/answer payload used during WebRTC negotiation. */
@@ -40,8 +41,20 @@ export interface ErrorMessage {
   message: string;
 }
 
+/** Waiting room update sent while the server is at capacity. */
+export interface QueueMessage {
+  type: MessageType.QUEUE;
+  position: number;
+  eta_sec: number;
+}
+
 // Union of all signaling message types
-export type SignalingMessage = SDPMessage | ICECandidateMessage | WelcomeMessage | ErrorMessage;
+export type SignalingMessage =
+  | SDPMessage
+  | ICECandidateMessage
+  | WelcomeMessage
+  | ErrorMessage
+  | QueueMessage;
 
 // Transport connection lifecycle states
 export type TransportStatus = 'connecting' | 'open' | 'closing' | 'closed';